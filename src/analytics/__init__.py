@@ -2,10 +2,17 @@
 Модуль аналитики и визуализации данных
 """
 
-from .chart_generator import ChartGenerator
 from .report_generator import ReportGenerator
 
 __all__ = [
     'ChartGenerator',
     'ReportGenerator'
 ]
+
+
+def __getattr__(name):
+    """Ленивый импорт ChartGenerator: matplotlib загружается только при построении графиков"""
+    if name == 'ChartGenerator':
+        from .chart_generator import ChartGenerator
+        return ChartGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
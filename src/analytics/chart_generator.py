@@ -2,19 +2,226 @@
 Генератор графиков и диаграмм
 """
 
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg', force=True)
+
 import matplotlib.dates as mdates
+from matplotlib import cm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
 import seaborn as sns
 import pandas as pd
+import numpy as np
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from contextlib import contextmanager
 from decimal import Decimal
+import io
 import os
+import threading
 from pathlib import Path
 
+from PIL import Image
+
 from ..core.models.transaction import Transaction, TransactionType
 from ..core.models.category import Category
 from ..core.calculators import StatisticsCalculator, BalanceCalculator
+from .process_pool import create_process_pool
+from .transaction_frame import build_transactions_frame, get_date_mask
+
+
+# Разрешение сохраняемых графиков (графики сохраняются в отчеты)
+CHART_DPI = 300
+
+# Размер одной панели комплексного отчета и его заголовка в дюймах
+PANEL_SIZE = (10, 16 / 3)
+TITLE_SIZE = (20, 0.8)
+
+# Максимальное количество подписей дат на панели комплексного отчета
+PANEL_MAX_DATE_TICKS = 10
+
+
+def _format_rub(value: float, position: int) -> str:
+    """Форматирует значение оси как сумму в рублях"""
+    return f'{value:,.0f} ₽'
+
+
+def _set_date_ticks(ax, dates, max_ticks: Optional[int] = None) -> None:
+    """
+    Размечает ось X датами с шагом в неделю готовыми строковыми подписями
+    
+    Подписи форматируются один раз, поэтому при отрисовке matplotlib не вызывает
+    форматтер дат для каждой метки.
+    
+    Args:
+        ax: Оси графика
+        dates: Отсортированные даты точек графика
+        max_ticks: Максимальное количество меток (шаг увеличивается кратно неделе)
+    """
+    first_day = np.datetime64(dates[0], 'D')
+    last_day = np.datetime64(dates[-1], 'D')
+    step_days = 7
+    if max_ticks is not None:
+        span_days = int((last_day - first_day) / np.timedelta64(1, 'D'))
+        step_days *= max(1, -(-span_days // (7 * max_ticks)))
+    
+    tick_days = np.arange(first_day, last_day + np.timedelta64(1, 'D'), step_days)
+    labels = [day.strftime('%d.%m') for day in tick_days.astype(object)]
+    ax.set_xticks(mdates.date2num(tick_days))
+    ax.set_xticklabels(labels, rotation=45)
+
+
+def _apply_chart_style() -> None:
+    """Применяет общий стиль графиков (нужен и в дочерних процессах)"""
+    matplotlib.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+    
+    # Настройка шрифтов для русского языка
+    matplotlib.rcParams['font.family'] = ['DejaVu Sans', 'Arial Unicode MS', 'sans-serif']
+    matplotlib.rcParams['axes.unicode_minus'] = False
+
+
+def _draw_title_panel(ax, data: Dict[str, Any]) -> None:
+    """Рисует заголовок комплексного отчета"""
+    ax.axis('off')
+    ax.text(0.5, 0.5, data['title'], transform=ax.transAxes, fontsize=18,
+            fontweight='bold', ha='center', va='center')
+
+
+def _draw_balance_panel(ax, data: Dict[str, Any]) -> None:
+    """Рисует панель истории баланса"""
+    if not len(data['balances']):
+        return
+    ax.plot(data['dates'], data['balances'], linewidth=2, marker='o', markersize=4)
+    ax.set_title('История баланса', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Баланс (₽)')
+    ax.grid(True, alpha=0.3)
+    _set_date_ticks(ax, data['dates'], max_ticks=PANEL_MAX_DATE_TICKS)
+
+
+def _draw_income_expense_panel(ax, data: Dict[str, Any]) -> None:
+    """Рисует панель доходов и расходов по месяцам"""
+    if not data['labels']:
+        return
+    x_pos = range(len(data['labels']))
+    width = 0.35
+    ax.bar([x - width/2 for x in x_pos], data['incomes'], width, label='Доходы', color='green', alpha=0.7)
+    ax.bar([x + width/2 for x in x_pos], data['expenses'], width, label='Расходы', color='red', alpha=0.7)
+    ax.set_title('Доходы и расходы по месяцам', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Сумма (₽)')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    ax.set_xticks(x_pos)
+    ax.set_xticklabels(data['labels'], rotation=45)
+
+
+def _draw_categories_panel(ax, data: Dict[str, Any]) -> None:
+    """Рисует панель расходов по категориям"""
+    if not data['sizes']:
+        return
+    ax.pie(data['sizes'], labels=data['labels'], autopct='%1.1f%%', startangle=90)
+    ax.set_title('Расходы по категориям', fontsize=14, fontweight='bold')
+
+
+def _draw_budgets_panel(ax, data: Dict[str, Any]) -> None:
+    """Рисует панель использования бюджетов"""
+    if not data['names']:
+        return
+    usage_percentages = data['usage_percentages']
+    colors = ['red' if p > 100 else 'orange' if p > 80 else 'green' for p in usage_percentages]
+    ax.bar(range(len(data['names'])), usage_percentages, color=colors, alpha=0.7)
+    
+    ax.set_title('Использование бюджетов', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Процент (%)')
+    ax.set_xticks(range(len(data['names'])))
+    ax.set_xticklabels(data['names'], rotation=45, ha='right')
+    ax.grid(True, alpha=0.3)
+    ax.axhline(y=100, color='red', linestyle='--', alpha=0.7)
+    ax.axhline(y=80, color='orange', linestyle='--', alpha=0.7)
+
+
+def _draw_trends_panel(ax, data: Dict[str, Any]) -> None:
+    """Рисует панель трендов"""
+    if len(data['labels']) < 2:
+        return
+    incomes, expenses = data['incomes'], data['expenses']
+    net_incomes = [income - expense for income, expense in zip(incomes, expenses)]
+    
+    x_pos = range(len(data['labels']))
+    ax.plot(x_pos, incomes, marker='o', linewidth=2, label='Доходы', color='green')
+    ax.plot(x_pos, expenses, marker='s', linewidth=2, label='Расходы', color='red')
+    ax.plot(x_pos, net_incomes, marker='^', linewidth=2, label='Чистый доход', color='blue')
+    
+    ax.set_title('Тренды', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Сумма (₽)')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    ax.set_xticks(x_pos)
+    ax.set_xticklabels(data['labels'], rotation=45)
+
+
+def _draw_summary_panel(ax, data: Dict[str, Any]) -> None:
+    """Рисует панель сводной информации"""
+    ax.axis('off')
+    net_income = data['total_income'] - data['total_expenses']
+    
+    summary_text = f"""
+СВОДНАЯ ИНФОРМАЦИЯ
+Период: {data['start_date'].strftime('%d.%m.%Y')} - {data['end_date'].strftime('%d.%m.%Y')}
+
+💰 Общие доходы: {data['total_income']:,.2f} ₽
+💸 Общие расходы: {data['total_expenses']:,.2f} ₽
+📈 Чистый доход: {net_income:,.2f} ₽
+💳 Текущий баланс: {data['current_balance']:,.2f} ₽
+
+📊 Количество транзакций: {data['transaction_count']}
+📋 Активных бюджетов: {data['budget_count']}
+
+📅 Отчет создан: {data['created_at'].strftime('%d.%m.%Y %H:%M')}
+    """
+    
+    ax.text(0.1, 0.9, summary_text, transform=ax.transAxes, fontsize=12,
+            verticalalignment='top', fontfamily='monospace',
+            bbox=dict(boxstyle='round,pad=1', facecolor='lightgray', alpha=0.8))
+
+
+_PANEL_RENDERERS = {
+    'title': _draw_title_panel,
+    'balance': _draw_balance_panel,
+    'income_expense': _draw_income_expense_panel,
+    'categories': _draw_categories_panel,
+    'budgets': _draw_budgets_panel,
+    'trends': _draw_trends_panel,
+    'summary': _draw_summary_panel
+}
+
+
+def _render_panel(panel: Tuple[str, Dict[str, Any]]) -> bytes:
+    """
+    Отрисовывает одну панель комплексного отчета в PNG
+    
+    Функция модульного уровня, чтобы ее можно было передать в ProcessPoolExecutor.
+    
+    Args:
+        panel: Кортеж (тип панели, данные панели)
+    
+    Returns:
+        PNG-изображение панели
+    """
+    kind, data = panel
+    _apply_chart_style()
+    
+    fig = Figure(figsize=TITLE_SIZE if kind == 'title' else PANEL_SIZE)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    _PANEL_RENDERERS[kind](ax, data)
+    if kind != 'title':
+        fig.tight_layout()
+    
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=CHART_DPI)
+    return buffer.getvalue()
 
 
 class ChartGenerator:
@@ -33,12 +240,216 @@ class ChartGenerator:
         self.output_dir.mkdir(exist_ok=True)
         
         # Настройка стиля matplotlib
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
+        _apply_chart_style()
+        
+        # Кэш DataFrame транзакций: (список транзакций, его длина, DataFrame);
+        # длина нужна, чтобы заметить транзакции, добавленные в тот же список
+        self._frame_cache: Optional[Tuple[List[Transaction], int, pd.DataFrame]] = None
+        # Кэш сумм по месяцам и типам: (список транзакций, его длина, DataFrame)
+        self._monthly_cache: Optional[Tuple[List[Transaction], int, pd.DataFrame]] = None
+        
+        # Общая метка времени для имен всех файлов, созданных этим генератором
+        self._run_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        # Переиспользуемые фигуры по размеру, отдельные для каждого потока
+        self._figures = threading.local()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Состояние для передачи генератора в другой процесс
+        
+        Кэши и фигуры не переносятся: они привязаны к процессу и
+        строятся заново по мере необходимости.
+        """
+        state = self.__dict__.copy()
+        state['_frame_cache'] = None
+        state['_monthly_cache'] = None
+        del state['_figures']
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Восстанавливает генератор в другом процессе
+        
+        Стиль matplotlib хранится в rcParams процесса, поэтому в рабочем
+        процессе пула он применяется заново, как в __init__.
+        """
+        self.__dict__.update(state)
+        _apply_chart_style()
+        self._figures = threading.local()
+    
+    def _get_transactions_frame(self, transactions: List[Transaction]) -> pd.DataFrame:
+        """
+        Возвращает DataFrame транзакций (см. build_transactions_frame)
+        
+        DataFrame кэшируется для последнего переданного списка транзакций
+        и его длины, поэтому соседние графики по тем же данным не строят его
+        повторно, а добавление транзакций в список сбрасывает кэш.
+        
+        Args:
+            transactions: Список транзакций
+        
+        Returns:
+            DataFrame транзакций
+        """
+        cache = self._frame_cache
+        if cache is not None and cache[0] is transactions and cache[1] == len(transactions):
+            return cache[2]
+        
+        df = build_transactions_frame(transactions)
+        self._frame_cache = (transactions, len(transactions), df)
+        return df
+    
+    def _get_category_totals(self, transactions: List[Transaction],
+                             start_date: date, end_date: date,
+                             transaction_type: TransactionType) -> pd.Series:
+        """
+        Суммирует транзакции за период по категориям
+        
+        Args:
+            transactions: Список транзакций
+            start_date: Начальная дата
+            end_date: Конечная дата
+            transaction_type: Тип транзакций
+        
+        Returns:
+            Суммы по category_id в порядке первого появления категории
+        """
+        df = self._get_transactions_frame(transactions)
+        mask = self._get_date_mask(df, start_date, end_date) & (df['type'] == transaction_type.value)
+        # Деление на целое 100 сохраняет точность и для копеек в Decimal
+        totals = df.loc[mask].groupby('category_id', sort=False)['amount_cents'].sum() / 100
+        return totals.astype(np.float64)
+    
+    def _create_figure(self, figsize: Tuple[int, int]) -> Figure:
+        """
+        Возвращает очищенную фигуру с Agg-холстом без глобального состояния pyplot
+        
+        Фигуры переиспользуются между вызовами: для каждого размера в каждом
+        потоке создается одна фигура, которая очищается перед отрисовкой.
+        
+        Args:
+            figsize: Размер фигуры в дюймах
+        
+        Returns:
+            Пустая фигура
+        """
+        figures = getattr(self._figures, 'by_size', None)
+        if figures is None:
+            figures = self._figures.by_size = {}
+        
+        fig = figures.get(figsize)
+        if fig is None:
+            fig = Figure(figsize=figsize)
+            FigureCanvasAgg(fig)
+            figures[figsize] = fig
+        else:
+            fig.clear()
+        return fig
+    
+    def _save_figure(self, fig: Figure, filename: str) -> str:
+        """
+        Сохраняет фигуру в директорию графиков
+        
+        Args:
+            fig: Фигура для сохранения
+            filename: Имя файла
+        
+        Returns:
+            Путь к сохраненному файлу
+        """
+        with self._atomic_output(filename) as tmp_path:
+            fig.savefig(tmp_path, format='png', dpi=CHART_DPI, bbox_inches='tight')
+        return str(self.output_dir / filename)
+    
+    @contextmanager
+    def _atomic_output(self, filename: str) -> Iterator[Path]:
+        """
+        Дает временный путь для записи файла и атомарно заменяет им итоговый файл
+        
+        Параллельный читатель никогда не увидит наполовину записанный PNG.
         
-        # Настройка шрифтов для русского языка
-        plt.rcParams['font.family'] = ['DejaVu Sans', 'Arial Unicode MS', 'sans-serif']
-        plt.rcParams['axes.unicode_minus'] = False
+        Args:
+            filename: Имя итогового файла в директории графиков
+        
+        Yields:
+            Временный путь для записи
+        """
+        tmp_path = self.output_dir / f".{filename}.tmp"
+        try:
+            yield tmp_path
+            os.replace(tmp_path, self.output_dir / filename)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    
+    def _get_date_mask(self, df: pd.DataFrame, start_date: date, end_date: date) -> pd.Series:
+        """Маска строк DataFrame, попадающих в период (включительно)"""
+        return get_date_mask(df, start_date, end_date)
+    
+    def _get_balance_series(self, transactions: List[Transaction],
+                            start_date: date, end_date: date) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Рассчитывает дневную историю баланса за период
+        
+        Изменения баланса суммируются по дням, дополняются нулями для дней без
+        транзакций и накапливаются через cumsum. Баланс считается от нуля на
+        начало периода.
+        
+        Args:
+            transactions: Список транзакций
+            start_date: Начальная дата
+            end_date: Конечная дата
+        
+        Returns:
+            Кортеж (дни периода, баланс на конец каждого дня); пустые массивы,
+            если за период нет транзакций
+        """
+        df = self._get_transactions_frame(transactions)
+        period_df = df.loc[self._get_date_mask(df, start_date, end_date)]
+        if period_df.empty:
+            return np.array([], dtype='datetime64[D]'), np.array([], dtype=np.float64)
+        
+        days = pd.date_range(start_date, end_date, freq='D')
+        daily_cents = period_df.groupby('date')['signed_cents'].sum().reindex(days, fill_value=0)
+        return days.to_numpy(), (daily_cents.cumsum() / 100).to_numpy(dtype=np.float64)
+    
+    def _get_monthly_totals(self, transactions: List[Transaction],
+                            start_date: date, end_date: date) -> pd.DataFrame:
+        """
+        Суммирует доходы и расходы по календарным месяцам периода
+        
+        Месяцы учитываются целиком, включая дни за пределами периода.
+        
+        Args:
+            transactions: Список транзакций
+            start_date: Начальная дата
+            end_date: Конечная дата
+        
+        Returns:
+            DataFrame с колонками income и expense, индексированный началом месяца
+        """
+        months = pd.date_range(start=start_date.replace(day=1), end=end_date, freq='MS')
+        
+        # Группировка по месяцам не зависит от периода и кэшируется вместе с DataFrame
+        cache = self._monthly_cache
+        if cache is not None and cache[0] is transactions and cache[1] == len(transactions):
+            monthly_df = cache[2]
+        else:
+            df = self._get_transactions_frame(transactions)
+            monthly_df = (
+                df.groupby([pd.Grouper(key='date', freq='MS'), 'type'])['amount_cents']
+                .sum()
+                .unstack(fill_value=0)
+                / 100
+            ).astype(np.float64)
+            self._monthly_cache = (transactions, len(transactions), monthly_df)
+        
+        return monthly_df.reindex(
+            index=months,
+            columns=[TransactionType.INCOME.value, TransactionType.EXPENSE.value],
+            fill_value=0.0
+        )
     
     def generate_balance_chart(self, transactions: List[Transaction], 
                              start_date: date, end_date: date,
@@ -56,19 +467,28 @@ class ChartGenerator:
             Путь к сохраненному файлу
         """
         # Рассчитываем историю баланса
-        balance_calculator = BalanceCalculator()
-        balance_calculator.add_transactions(transactions)
-        balance_history = balance_calculator.get_balance_history(start_date, end_date)
+        dates, balances = self._get_balance_series(transactions, start_date, end_date)
+        return self._plot_balance_chart(dates, balances, title)
+    
+    def _plot_balance_chart(self, dates: np.ndarray, balances: np.ndarray,
+                            title: str = "История баланса") -> str:
+        """
+        Рисует график истории баланса по готовому ряду баланса
         
-        if not balance_history:
-            raise ValueError("Нет данных для построения графика баланса")
+        Args:
+            dates: Дни периода
+            balances: Баланс на конец каждого дня
+            title: Заголовок графика
         
-        # Подготавливаем данные
-        dates = [item['date'] for item in balance_history]
-        balances = [item['balance'] for item in balance_history]
+        Returns:
+            Путь к сохраненному файлу
+        """
+        if not len(balances):
+            raise ValueError("Нет данных для построения графика баланса")
         
         # Создаем график
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig = self._create_figure((12, 6))
+        ax = fig.subplots()
         ax.plot(dates, balances, linewidth=2, marker='o', markersize=4)
         ax.set_title(title, fontsize=16, fontweight='bold')
         ax.set_xlabel('Дата', fontsize=12)
@@ -76,12 +496,10 @@ class ChartGenerator:
         ax.grid(True, alpha=0.3)
         
         # Форматируем ось X
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%d.%m'))
-        ax.xaxis.set_major_locator(mdates.DayLocator(interval=7))
-        plt.xticks(rotation=45)
+        _set_date_ticks(ax, dates)
         
         # Форматируем ось Y
-        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:,.0f} ₽'))
+        ax.yaxis.set_major_formatter(FuncFormatter(_format_rub))
         
         # Добавляем аннотацию с текущим балансом
         current_balance = balances[-1]
@@ -91,15 +509,11 @@ class ChartGenerator:
                    bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.7),
                    arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Сохраняем график
-        filename = f"balance_chart_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = self.output_dir / filename
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return str(filepath)
+        filename = f"balance_chart_{self._run_timestamp}.png"
+        return self._save_figure(fig, filename)
     
     def generate_income_expense_chart(self, transactions: List[Transaction],
                                     start_date: date, end_date: date,
@@ -116,46 +530,38 @@ class ChartGenerator:
         Returns:
             Путь к сохраненному файлу
         """
-        # Рассчитываем статистику
-        statistics_calculator = StatisticsCalculator()
-        statistics_calculator.add_transactions(transactions)
-        
         # Получаем данные по месяцам
-        monthly_data = []
-        current_date = start_date.replace(day=1)
-        
-        while current_date <= end_date:
-            month_summary = statistics_calculator.get_monthly_summary(
-                current_date.year, current_date.month
-            )
-            monthly_data.append({
-                'date': current_date,
-                'income': month_summary['total_income'],
-                'expenses': month_summary['total_expenses'],
-                'net': month_summary['net_income']
-            })
-            
-            # Переходим к следующему месяцу
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
-        
-        if not monthly_data:
+        monthly_df = self._get_monthly_totals(transactions, start_date, end_date)
+        return self._plot_income_expense_chart(monthly_df, title)
+    
+    def _plot_income_expense_chart(self, monthly_df: pd.DataFrame,
+                                   title: str = "Доходы и расходы") -> str:
+        """
+        Рисует график доходов и расходов по готовым суммам за месяцы
+        
+        Args:
+            monthly_df: Суммы из _get_monthly_totals
+            title: Заголовок графика
+        
+        Returns:
+            Путь к сохраненному файлу
+        """
+        if monthly_df.empty:
             raise ValueError("Нет данных для построения графика")
         
         # Подготавливаем данные
-        dates = [item['date'] for item in monthly_data]
-        incomes = [item['income'] for item in monthly_data]
-        expenses = [item['expenses'] for item in monthly_data]
-        net_incomes = [item['net'] for item in monthly_data]
+        month_labels = [d.strftime('%m.%Y') for d in monthly_df.index]
+        incomes = monthly_df['income'].tolist()
+        expenses = monthly_df['expense'].tolist()
+        net_incomes = (monthly_df['income'] - monthly_df['expense']).tolist()
         
         # Создаем график
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+        fig = self._create_figure((12, 10))
+        ax1, ax2 = fig.subplots(2, 1)
         
         # График доходов и расходов
         width = 0.35
-        x_pos = range(len(dates))
+        x_pos = range(len(month_labels))
         
         ax1.bar([x - width/2 for x in x_pos], incomes, width, 
                label='Доходы', color='green', alpha=0.7)
@@ -169,10 +575,10 @@ class ChartGenerator:
         
         # Форматируем ось X
         ax1.set_xticks(x_pos)
-        ax1.set_xticklabels([d.strftime('%m.%Y') for d in dates], rotation=45)
+        ax1.set_xticklabels(month_labels, rotation=45)
         
         # Форматируем ось Y
-        ax1.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:,.0f} ₽'))
+        ax1.yaxis.set_major_formatter(FuncFormatter(_format_rub))
         
         # График чистого дохода
         colors = ['green' if x >= 0 else 'red' for x in net_incomes]
@@ -185,20 +591,16 @@ class ChartGenerator:
         
         # Форматируем ось X
         ax2.set_xticks(x_pos)
-        ax2.set_xticklabels([d.strftime('%m.%Y') for d in dates], rotation=45)
+        ax2.set_xticklabels(month_labels, rotation=45)
         
         # Форматируем ось Y
-        ax2.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:,.0f} ₽'))
+        ax2.yaxis.set_major_formatter(FuncFormatter(_format_rub))
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Сохраняем график
-        filename = f"income_expense_chart_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = self.output_dir / filename
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return str(filepath)
+        filename = f"income_expense_chart_{self._run_timestamp}.png"
+        return self._save_figure(fig, filename)
     
     def generate_category_pie_chart(self, transactions: List[Transaction],
                                   start_date: date, end_date: date,
@@ -217,34 +619,41 @@ class ChartGenerator:
         Returns:
             Путь к сохраненному файлу
         """
-        # Фильтруем транзакции
-        filtered_transactions = [
-            t for t in transactions
-            if (start_date <= t.date.date() <= end_date and 
-                t.transaction_type == transaction_type)
-        ]
+        # Группируем по категориям
+        category_totals = self._get_category_totals(
+            transactions, start_date, end_date, transaction_type
+        )
+        return self._plot_category_pie_chart(category_totals, transaction_type, title)
+    
+    def _plot_category_pie_chart(self, category_totals: pd.Series,
+                                 transaction_type: TransactionType = TransactionType.EXPENSE,
+                                 title: str = "Расходы по категориям") -> str:
+        """
+        Рисует круговую диаграмму по готовым суммам категорий
         
-        if not filtered_transactions:
-            raise ValueError(f"Нет {transaction_type.value} транзакций для построения графика")
+        Args:
+            category_totals: Суммы из _get_category_totals
+            transaction_type: Тип транзакций
+            title: Заголовок графика
         
-        # Группируем по категориям
-        category_totals = {}
-        for transaction in filtered_transactions:
-            category_name = f"Категория {transaction.category_id}" if transaction.category_id else "Без категории"
-            if category_name not in category_totals:
-                category_totals[category_name] = Decimal('0.00')
-            category_totals[category_name] += transaction.amount
+        Returns:
+            Путь к сохраненному файлу
+        """
+        if category_totals.empty:
+            raise ValueError(f"Нет {transaction_type.value} транзакций для построения графика")
         
         # Подготавливаем данные
-        labels = list(category_totals.keys())
-        sizes = [float(amount) for amount in category_totals.values()]
+        labels = [f"Категория {category_id}" if category_id else "Без категории"
+                  for category_id in category_totals.index]
+        sizes = category_totals.tolist()
         
         # Создаем график
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig = self._create_figure((10, 8))
+        ax = fig.subplots()
         
         # Создаем круговую диаграмму
         wedges, texts, autotexts = ax.pie(sizes, labels=labels, autopct='%1.1f%%',
-                                         startangle=90, colors=plt.cm.Set3.colors)
+                                         startangle=90, colors=cm.Set3.colors)
         
         ax.set_title(title, fontsize=16, fontweight='bold')
         
@@ -257,15 +666,11 @@ class ChartGenerator:
         legend_labels = [f"{label}: {sizes[i]:,.2f} ₽" for i, label in enumerate(labels)]
         ax.legend(wedges, legend_labels, title="Категории", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Сохраняем график
-        filename = f"category_pie_{transaction_type.value}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = self.output_dir / filename
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return str(filepath)
+        filename = f"category_pie_{transaction_type.value}_{self._run_timestamp}.png"
+        return self._save_figure(fig, filename)
     
     def generate_trend_analysis_chart(self, transactions: List[Transaction],
                                     months: int = 12,
@@ -285,7 +690,20 @@ class ChartGenerator:
         statistics_calculator = StatisticsCalculator()
         statistics_calculator.add_transactions(transactions)
         trend_data = statistics_calculator.get_trend_analysis(months)
+        return self._plot_trend_analysis_chart(trend_data, title)
+    
+    def _plot_trend_analysis_chart(self, trend_data: Dict[str, Any],
+                                   title: str = "Анализ трендов") -> str:
+        """
+        Рисует график анализа трендов по готовому результату анализа
         
+        Args:
+            trend_data: Результат StatisticsCalculator.get_trend_analysis
+            title: Заголовок графика
+        
+        Returns:
+            Путь к сохраненному файлу
+        """
         if not trend_data['monthly_data']:
             raise ValueError("Нет данных для анализа трендов")
         
@@ -297,7 +715,8 @@ class ChartGenerator:
         net_incomes = [item['net_income'] for item in monthly_data]
         
         # Создаем график
-        fig, ax = plt.subplots(figsize=(14, 8))
+        fig = self._create_figure((14, 8))
+        ax = fig.subplots()
         
         # Строим линии трендов
         x_pos = range(len(dates))
@@ -316,7 +735,7 @@ class ChartGenerator:
         ax.set_xticklabels(dates, rotation=45)
         
         # Форматируем ось Y
-        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:,.0f} ₽'))
+        ax.yaxis.set_major_formatter(FuncFormatter(_format_rub))
         
         # Добавляем информацию о трендах
         trends = trend_data['trends']
@@ -328,15 +747,11 @@ class ChartGenerator:
         ax.text(0.02, 0.98, trend_text, transform=ax.transAxes, fontsize=10,
                verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Сохраняем график
-        filename = f"trend_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = self.output_dir / filename
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return str(filepath)
+        filename = f"trend_analysis_{self._run_timestamp}.png"
+        return self._save_figure(fig, filename)
     
     def generate_budget_status_chart(self, budget_statuses: List[Dict[str, Any]],
                                    title: str = "Статус бюджетов") -> str:
@@ -360,7 +775,8 @@ class ChartGenerator:
         usage_percentages = [status['usage_percentage'] for status in budget_statuses]
         
         # Создаем график
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+        fig = self._create_figure((16, 8))
+        ax1, ax2 = fig.subplots(1, 2)
         
         # График бюджетов vs потрачено
         x_pos = range(len(budget_names))
@@ -379,7 +795,7 @@ class ChartGenerator:
         ax1.grid(True, alpha=0.3)
         
         # Форматируем ось Y
-        ax1.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:,.0f} ₽'))
+        ax1.yaxis.set_major_formatter(FuncFormatter(_format_rub))
         
         # График процента использования
         colors = ['red' if p > 100 else 'orange' if p > 80 else 'green' for p in usage_percentages]
@@ -402,15 +818,11 @@ class ChartGenerator:
             ax2.text(bar.get_x() + bar.get_width()/2., height + 1,
                     f'{percentage:.1f}%', ha='center', va='bottom')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Сохраняем график
-        filename = f"budget_status_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = self.output_dir / filename
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return str(filepath)
+        filename = f"budget_status_{self._run_timestamp}.png"
+        return self._save_figure(fig, filename)
     
     def generate_comprehensive_report(self, transactions: List[Transaction],
                                     budget_statuses: List[Dict[str, Any]],
@@ -427,155 +839,102 @@ class ChartGenerator:
         Returns:
             Путь к сохраненному файлу
         """
-        # Создаем комплексный график
-        fig = plt.figure(figsize=(20, 16))
-        
-        # График 1: История баланса
-        ax1 = plt.subplot(3, 2, 1)
-        balance_calculator = BalanceCalculator()
-        balance_calculator.add_transactions(transactions)
-        balance_history = balance_calculator.get_balance_history(start_date, end_date)
-        
-        if balance_history:
-            dates = [item['date'] for item in balance_history]
-            balances = [item['balance'] for item in balance_history]
-            ax1.plot(dates, balances, linewidth=2, marker='o', markersize=4)
-            ax1.set_title('История баланса', fontsize=14, fontweight='bold')
-            ax1.set_ylabel('Баланс (₽)')
-            ax1.grid(True, alpha=0.3)
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter('%d.%m'))
-            plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
-        
-        # График 2: Доходы и расходы
-        ax2 = plt.subplot(3, 2, 2)
-        statistics_calculator = StatisticsCalculator()
-        statistics_calculator.add_transactions(transactions)
+        panels = self._get_comprehensive_panels(transactions, budget_statuses, start_date, end_date)
         
-        # Получаем данные по месяцам
-        monthly_data = []
-        current_date = start_date.replace(day=1)
-        while current_date <= end_date:
-            month_summary = statistics_calculator.get_monthly_summary(
-                current_date.year, current_date.month
-            )
-            monthly_data.append({
-                'date': current_date,
-                'income': month_summary['total_income'],
-                'expenses': month_summary['total_expenses']
+        # Панели отрисовываются независимо друг от друга в пуле процессов
+        max_workers = min(len(panels), os.cpu_count() or 1)
+        with create_process_pool(max_workers) as executor:
+            panel_images = list(executor.map(_render_panel, panels))
+        
+        return self._save_comprehensive_report(panel_images)
+    
+    def _get_comprehensive_panels(self, transactions: List[Transaction],
+                                  budget_statuses: List[Dict[str, Any]],
+                                  start_date: date, end_date: date) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Готовит данные панелей комплексного отчета для _render_panel
+        
+        Панели содержат только агрегаты, поэтому их дешево передавать в
+        другие процессы.
+        
+        Args:
+            transactions: Список транзакций
+            budget_statuses: Список статусов бюджетов
+            start_date: Начальная дата
+            end_date: Конечная дата
+        
+        Returns:
+            Список панелей (тип панели, данные панели); первая - заголовок
+        """
+        # Агрегаты считаются один раз и используются всеми панелями
+        balance_dates, balances = self._get_balance_series(transactions, start_date, end_date)
+        monthly_df = self._get_monthly_totals(transactions, start_date, end_date)
+        category_totals = self._get_category_totals(
+            transactions, start_date, end_date, TransactionType.EXPENSE
+        )
+        
+        monthly_data = {
+            'labels': [d.strftime('%m.%Y') for d in monthly_df.index],
+            'incomes': monthly_df['income'].tolist(),
+            'expenses': monthly_df['expense'].tolist()
+        }
+        total_income = float(monthly_df['income'].sum())
+        total_expenses = float(monthly_df['expense'].sum())
+        
+        return [
+            ('title', {'title': 'Комплексный финансовый отчет'}),
+            ('balance', {'dates': balance_dates, 'balances': balances}),
+            ('income_expense', monthly_data),
+            ('categories', {
+                'labels': [f"Кат. {category_id}" if category_id else "Без категории"
+                           for category_id in category_totals.index],
+                'sizes': category_totals.tolist()
+            }),
+            ('budgets', {
+                'names': [status['budget_name'] for status in budget_statuses],
+                'usage_percentages': [status['usage_percentage'] for status in budget_statuses]
+            }),
+            ('trends', monthly_data),
+            ('summary', {
+                'start_date': start_date,
+                'end_date': end_date,
+                'total_income': total_income,
+                'total_expenses': total_expenses,
+                'current_balance': float(balances[-1]) if len(balances) else 0,
+                'transaction_count': len(transactions),
+                'budget_count': len(budget_statuses),
+                'created_at': datetime.now()
             })
-            
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
-        
-        if monthly_data:
-            dates = [item['date'] for item in monthly_data]
-            incomes = [item['income'] for item in monthly_data]
-            expenses = [item['expenses'] for item in monthly_data]
-            
-            x_pos = range(len(dates))
-            width = 0.35
-            ax2.bar([x - width/2 for x in x_pos], incomes, width, label='Доходы', color='green', alpha=0.7)
-            ax2.bar([x + width/2 for x in x_pos], expenses, width, label='Расходы', color='red', alpha=0.7)
-            ax2.set_title('Доходы и расходы по месяцам', fontsize=14, fontweight='bold')
-            ax2.set_ylabel('Сумма (₽)')
-            ax2.legend()
-            ax2.grid(True, alpha=0.3)
-            ax2.set_xticks(x_pos)
-            ax2.set_xticklabels([d.strftime('%m.%Y') for d in dates], rotation=45)
-        
-        # График 3: Расходы по категориям
-        ax3 = plt.subplot(3, 2, 3)
-        expense_transactions = [t for t in transactions if t.transaction_type == TransactionType.EXPENSE]
-        if expense_transactions:
-            category_totals = {}
-            for transaction in expense_transactions:
-                if start_date <= transaction.date.date() <= end_date:
-                    category_name = f"Кат. {transaction.category_id}" if transaction.category_id else "Без категории"
-                    if category_name not in category_totals:
-                        category_totals[category_name] = Decimal('0.00')
-                    category_totals[category_name] += transaction.amount
-            
-            if category_totals:
-                labels = list(category_totals.keys())
-                sizes = [float(amount) for amount in category_totals.values()]
-                ax3.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
-                ax3.set_title('Расходы по категориям', fontsize=14, fontweight='bold')
-        
-        # График 4: Статус бюджетов
-        ax4 = plt.subplot(3, 2, 4)
-        if budget_statuses:
-            budget_names = [status['budget_name'] for status in budget_statuses]
-            usage_percentages = [status['usage_percentage'] for status in budget_statuses]
-            
-            colors = ['red' if p > 100 else 'orange' if p > 80 else 'green' for p in usage_percentages]
-            bars = ax4.bar(range(len(budget_names)), usage_percentages, color=colors, alpha=0.7)
-            
-            ax4.set_title('Использование бюджетов', fontsize=14, fontweight='bold')
-            ax4.set_ylabel('Процент (%)')
-            ax4.set_xticks(range(len(budget_names)))
-            ax4.set_xticklabels(budget_names, rotation=45, ha='right')
-            ax4.grid(True, alpha=0.3)
-            ax4.axhline(y=100, color='red', linestyle='--', alpha=0.7)
-            ax4.axhline(y=80, color='orange', linestyle='--', alpha=0.7)
-        
-        # График 5: Тренды
-        ax5 = plt.subplot(3, 2, 5)
-        if len(monthly_data) > 1:
-            dates = [item['date'] for item in monthly_data]
-            incomes = [item['income'] for item in monthly_data]
-            expenses = [item['expenses'] for item in monthly_data]
-            net_incomes = [incomes[i] - expenses[i] for i in range(len(incomes))]
-            
-            x_pos = range(len(dates))
-            ax5.plot(x_pos, incomes, marker='o', linewidth=2, label='Доходы', color='green')
-            ax5.plot(x_pos, expenses, marker='s', linewidth=2, label='Расходы', color='red')
-            ax5.plot(x_pos, net_incomes, marker='^', linewidth=2, label='Чистый доход', color='blue')
-            
-            ax5.set_title('Тренды', fontsize=14, fontweight='bold')
-            ax5.set_ylabel('Сумма (₽)')
-            ax5.legend()
-            ax5.grid(True, alpha=0.3)
-            ax5.set_xticks(x_pos)
-            ax5.set_xticklabels([d.strftime('%m.%Y') for d in dates], rotation=45)
-        
-        # График 6: Сводная информация
-        ax6 = plt.subplot(3, 2, 6)
-        ax6.axis('off')
-        
-        # Рассчитываем сводную статистику
-        total_income = sum(item['income'] for item in monthly_data) if monthly_data else 0
-        total_expenses = sum(item['expenses'] for item in monthly_data) if monthly_data else 0
-        net_income = total_income - total_expenses
-        current_balance = balances[-1] if balance_history else 0
-        
-        summary_text = f"""
-СВОДНАЯ ИНФОРМАЦИЯ
-Период: {start_date.strftime('%d.%m.%Y')} - {end_date.strftime('%d.%m.%Y')}
-
-💰 Общие доходы: {total_income:,.2f} ₽
-💸 Общие расходы: {total_expenses:,.2f} ₽
-📈 Чистый доход: {net_income:,.2f} ₽
-💳 Текущий баланс: {current_balance:,.2f} ₽
-
-📊 Количество транзакций: {len(transactions)}
-📋 Активных бюджетов: {len(budget_statuses)}
-
-📅 Отчет создан: {datetime.now().strftime('%d.%m.%Y %H:%M')}
+        ]
+    
+    def _save_comprehensive_report(self, panel_images: List[bytes]) -> str:
         """
+        Собирает отрисованные панели комплексного отчета в одно изображение
         
-        ax6.text(0.1, 0.9, summary_text, transform=ax6.transAxes, fontsize=12,
-                verticalalignment='top', fontfamily='monospace',
-                bbox=dict(boxstyle='round,pad=1', facecolor='lightgray', alpha=0.8))
+        Args:
+            panel_images: PNG-изображения панелей из _render_panel в порядке
+                _get_comprehensive_panels
         
-        plt.suptitle('Комплексный финансовый отчет', fontsize=18, fontweight='bold')
-        plt.tight_layout()
+        Returns:
+            Путь к сохраненному файлу
+        """
+        images = [Image.open(io.BytesIO(png)) for png in panel_images]
+        
+        # Собираем панели в сетку 3x2 под заголовком
+        title_image, panel_images = images[0], images[1:]
+        panel_width, panel_height = panel_images[0].size
+        report_image = Image.new(
+            'RGB', (2 * panel_width, title_image.height + 3 * panel_height), 'white'
+        )
+        report_image.paste(title_image, ((2 * panel_width - title_image.width) // 2, 0))
+        for index, panel_image in enumerate(panel_images):
+            report_image.paste(panel_image, (
+                (index % 2) * panel_width,
+                title_image.height + (index // 2) * panel_height
+            ))
         
         # Сохраняем график
-        filename = f"comprehensive_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        filepath = self.output_dir / filename
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return str(filepath)
+        filename = f"comprehensive_report_{self._run_timestamp}.png"
+        with self._atomic_output(filename) as tmp_path:
+            report_image.save(tmp_path, format='PNG')
+        return str(self.output_dir / filename)
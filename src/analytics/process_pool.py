@@ -0,0 +1,36 @@
+"""
+Пул процессов для отрисовки графиков
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Модули, которые сервер forkserver импортирует заранее: рабочие процессы
+# получают matplotlib уже загруженным
+FORKSERVER_PRELOAD = (f'{__package__}.chart_generator',)
+
+
+def create_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Создает пул процессов, который безопасно запускать из процесса с потоками
+    
+    В Linux по умолчанию процессы создаются через fork. Если в этот момент
+    другой поток держит блокировку (например, пишет отчет через pandas или
+    файловый ввод-вывод), дочерний процесс может зависнуть навсегда.
+    Поэтому процессы порождаются однопоточным сервером forkserver, а где
+    его нет - через spawn.
+    
+    Args:
+        max_workers: Максимальное количество процессов
+    
+    Returns:
+        Пул процессов
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(list(FORKSERVER_PRELOAD))
+    else:
+        context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+    
\ No newline at end of file
@@ -2,17 +2,59 @@
 Генератор отчетов
 """
 
+import calendar
+import csv
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
-from typing import List, Dict, Any, Optional
-from decimal import Decimal
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
+from functools import cached_property
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from ..core.models.transaction import Transaction, TransactionType
 from ..core.models.category import Category
 from ..core.calculators import StatisticsCalculator, BalanceCalculator
-from .chart_generator import ChartGenerator
+from .process_pool import create_process_pool
+from .transaction_frame import build_transactions_frame, get_date_mask
+
+if TYPE_CHECKING:
+    from .chart_generator import ChartGenerator
+
+
+# Размер буфера записи файлов отчетов
+REPORT_WRITE_BUFFER_SIZE = 1 << 20
+
+# Заголовки CSV отчета по транзакциям
+CSV_REPORT_HEADERS = (
+    'ID', 'Дата', 'Время', 'Тип', 'Сумма', 'Категория_ID',
+    'Описание', 'Теги', 'Создано', 'Обновлено'
+)
+
+# Блок детального отчета по одной категории
+CATEGORY_REPORT_TEMPLATE = """
+Категория: {name}
+  💰 Доходы: {income:,.2f} ₽
+  💸 Расходы: {expense:,.2f} ₽
+  📈 Чистый результат: {net:,.2f} ₽
+  📊 Количество транзакций: {transaction_count}
+"""
+
+
+def _format_date(value: date) -> str:
+    """Форматирует дату как dd.mm.YYYY без strftime"""
+    return f"{value.day:02d}.{value.month:02d}.{value.year}"
+
+
+def _format_time(value: datetime) -> str:
+    """Форматирует время как HH:MM без strftime"""
+    return f"{value.hour:02d}:{value.minute:02d}"
+
+
+def _format_datetime(value: datetime) -> str:
+    """Форматирует дату и время как dd.mm.YYYY HH:MM без strftime"""
+    return f"{value.day:02d}.{value.month:02d}.{value.year} {value.hour:02d}:{value.minute:02d}"
 
 
 class ReportGenerator:
@@ -20,17 +62,67 @@ class ReportGenerator:
     Генератор различных типов отчетов
     """
     
-    def __init__(self, output_dir: str = "reports"):
+    def __init__(self, output_dir: str = "reports", sorted_by_date: bool = False):
         """
         Инициализация генератора отчетов
         
         Args:
             output_dir: Директория для сохранения отчетов
+            sorted_by_date: Передаваемые списки транзакций уже отсортированы по дате
+                (по возрастанию или убыванию), период выбирается бинарным поиском
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
-        self.chart_generator = ChartGenerator(str(self.output_dir / "charts"))
+        self.sorted_by_date = sorted_by_date
+        
+        # Кэш DataFrame транзакций: (список транзакций, его длина, DataFrame);
+        # длина нужна, чтобы заметить транзакции, добавленные в тот же список
+        self._frame_cache: Optional[Tuple[List[Transaction], int, pd.DataFrame]] = None
+        
+        # Статистика считается калькуляторами ядра; их кэши действуют, пока
+        # передается тот же список транзакций
+        self._statistics_calculator = StatisticsCalculator()
+        self._balance_calculator = BalanceCalculator()
+    
+    @cached_property
+    def chart_generator(self) -> 'ChartGenerator':
+        """
+        Генератор графиков, создаваемый при первом обращении
+        
+        Импорт matplotlib откладывается до первого графика, поэтому
+        текстовые и CSV отчеты его не загружают.
+        """
+        from .chart_generator import ChartGenerator
+        
+        return ChartGenerator(str(self.output_dir / "charts"))
+    
+    def _get_transactions_frame(self, transactions: List[Transaction]) -> pd.DataFrame:
+        """
+        Возвращает DataFrame транзакций с суммами в копейках
+        
+        DataFrame кэшируется для последнего переданного списка транзакций
+        и его длины, поэтому все отчеты по одному списку собирают его один раз,
+        а добавление транзакций в список сбрасывает кэш.
+        
+        Args:
+            transactions: Список транзакций
+        
+        Returns:
+            DataFrame транзакций
+        """
+        cache = self._frame_cache
+        if cache is not None and cache[0] is transactions and cache[1] == len(transactions):
+            return cache[2]
+        
+        df = build_transactions_frame(transactions)
+        self._frame_cache = (transactions, len(transactions), df)
+        return df
+    
+    def _get_statistics_calculator(self, transactions: List[Transaction]) -> StatisticsCalculator:
+        """Калькулятор статистики по списку транзакций (см. _statistics_calculator)"""
+        self._statistics_calculator.transactions = transactions
+        return self._statistics_calculator
     
     def generate_csv_report(self, transactions: List[Transaction],
                           start_date: date, end_date: date,
@@ -47,45 +139,92 @@ class ReportGenerator:
         Returns:
             Путь к сохраненному файлу
         """
-        # Фильтруем транзакции по дате
-        filtered_transactions = [
-            t for t in transactions
-            if start_date <= t.date.date() <= end_date
-        ]
-        
-        # Подготавливаем данные для DataFrame
-        data = []
-        for transaction in filtered_transactions:
-            data.append({
-                'ID': transaction.id,
-                'Дата': transaction.date.strftime('%d.%m.%Y'),
-                'Время': transaction.date.strftime('%H:%M'),
-                'Тип': transaction.transaction_type.value,
-                'Сумма': float(transaction.amount),
-                'Категория_ID': transaction.category_id,
-                'Описание': transaction.description,
-                'Теги': ', '.join(transaction.tags) if transaction.tags else '',
-                'Создано': transaction.created_at.strftime('%d.%m.%Y %H:%M'),
-                'Обновлено': transaction.updated_at.strftime('%d.%m.%Y %H:%M')
-            })
-        
-        # Создаем DataFrame
-        df = pd.DataFrame(data)
-        
-        # Сортируем по дате
-        df = df.sort_values('Дата', ascending=False)
-        
         # Генерируем имя файла
         if not filename:
             filename = f"transactions_report_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.csv"
         
         filepath = self.output_dir / filename
-        
-        # Сохраняем в CSV
-        df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        self._write_csv_report(
+            transactions, self._get_period_positions(transactions, start_date, end_date), filepath
+        )
         
         return str(filepath)
     
+    def _get_period_positions(self, transactions: List[Transaction],
+                              start_date: date, end_date: date) -> np.ndarray:
+        """
+        Позиции транзакций за период (включительно) в списке, от новых к старым
+        
+        При равных датах сохраняется исходный порядок списка.
+        
+        Args:
+            transactions: Список транзакций
+            start_date: Начальная дата
+            end_date: Конечная дата
+        
+        Returns:
+            Массив позиций в transactions
+        """
+        df = self._get_transactions_frame(transactions)
+        
+        if self.sorted_by_date:
+            # Границы периода ищутся бинарным поиском по колонке дат
+            dates = df['date'].to_numpy()
+            count = len(dates)
+            descending = count > 1 and dates[0] > dates[-1]
+            ascending_dates = dates[::-1] if descending else dates
+            low = np.searchsorted(ascending_dates, np.datetime64(start_date), side='left')
+            high = np.searchsorted(ascending_dates, np.datetime64(end_date), side='right')
+            positions = np.arange(count - high, count - low) if descending else np.arange(low, high)
+        else:
+            positions = np.flatnonzero(get_date_mask(df, start_date, end_date))
+        
+        timestamps = df['timestamp'].to_numpy()[positions].astype(np.int64)
+        return positions[np.argsort(-timestamps, kind='stable')]
+    
+    def _write_csv_report(self, transactions: List[Transaction], positions: np.ndarray,
+                          filepath: Path) -> None:
+        """
+        Записывает CSV отчет по выбранным транзакциям
+        
+        Суммы берутся из колонки копеек DataFrame транзакций, а не через
+        float(Decimal) для каждой строки.
+        
+        Args:
+            transactions: Список транзакций
+            positions: Позиции выводимых транзакций в порядке вывода
+            filepath: Путь к файлу отчета
+        """
+        # Для пустого периода создается пустой файл
+        if len(positions) == 0:
+            open(filepath, 'w').close()
+            return
+        
+        df = self._get_transactions_frame(transactions)
+        amounts = (df['amount_cents'].to_numpy()[positions] / 100).astype(np.float64).tolist()
+        
+        # Пишем строки по одной, не собирая промежуточную таблицу
+        rows = (
+            (
+                transaction.id,
+                _format_date(transaction.date),
+                _format_time(transaction.date),
+                transaction.transaction_type.value,
+                amount,
+                transaction.category_id,
+                transaction.description,
+                ', '.join(transaction.tags) if transaction.tags else '',
+                _format_datetime(transaction.created_at),
+                _format_datetime(transaction.updated_at)
+            )
+            for transaction, amount in zip(map(transactions.__getitem__, positions.tolist()), amounts)
+        )
+        
+        with open(filepath, 'w', encoding='utf-8-sig', newline='', buffering=REPORT_WRITE_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_REPORT_HEADERS)
+            writer.writerows(rows)
+    
     def generate_summary_report(self, transactions: List[Transaction],
                               start_date: date, end_date: date,
                               filename: Optional[str] = None) -> str:
@@ -101,21 +240,94 @@ class ReportGenerator:
         Returns:
             Путь к сохраненному файлу
         """
-        # Рассчитываем статистику
-        statistics_calculator = StatisticsCalculator()
-        statistics_calculator.add_transactions(transactions)
+        statistics = self._get_report_statistics(transactions, start_date, end_date)
+        
+        # Генерируем имя файла
+        if not filename:
+            filename = f"summary_report_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.txt"
+        
+        filepath = self.output_dir / filename
+        self._write_summary_report(statistics, start_date, end_date, filepath)
+        
+        return str(filepath)
+    
+    def _get_report_statistics(self, transactions: List[Transaction],
+                               start_date: date, end_date: date) -> Dict[str, Any]:
+        """
+        Рассчитывает всю статистику для текстовых отчетов за один проход
+        
+        Результат общий для сводного и детального отчетов, поэтому
+        комплексный отчет считает его один раз.
+        
+        Args:
+            transactions: Список транзакций
+            start_date: Начальная дата
+            end_date: Конечная дата
+        
+        Returns:
+            Словарь со сводкой, балансом, анализом категорий, трендов и трат;
+            для пустого периода только со сводкой
+        """
+        statistics_calculator = self._get_statistics_calculator(transactions)
         summary = statistics_calculator._get_period_summary(start_date, end_date)
         
-        # Рассчитываем баланс
-        balance_calculator = BalanceCalculator()
-        balance_calculator.add_transactions(transactions)
-        current_balance = balance_calculator.calculate_balance()
+        # Для пустого периода остальная статистика не нужна
+        if summary['transaction_count'] == 0:
+            return {'summary': summary}
+        
+        self._balance_calculator.transactions = transactions
+        return {
+            'summary': summary,
+            'current_balance': self._balance_calculator.calculate_balance(),
+            'category_analysis': statistics_calculator.get_category_analysis(start_date, end_date),
+            # Последние 6 месяцев
+            'trend_data': statistics_calculator.get_trend_analysis(6) if transactions else None,
+            'spending_patterns': statistics_calculator.get_spending_patterns(30)
+        }
+    
+    def _write_empty_period_report(self, statistics: Dict[str, Any],
+                                   start_date: date, end_date: date, filepath: Path) -> bool:
+        """
+        Записывает однострочный отчет, если за период нет транзакций
+        
+        Args:
+            statistics: Статистика из _get_report_statistics
+            start_date: Начальная дата
+            end_date: Конечная дата
+            filepath: Путь к файлу отчета
+        
+        Returns:
+            True, если период пустой и отчет уже записан
+        """
+        if statistics['summary']['transaction_count'] > 0:
+            return False
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(f"Нет транзакций за период {_format_date(start_date)} - {_format_date(end_date)}\n")
+        return True
+    
+    def _write_summary_report(self, statistics: Dict[str, Any],
+                              start_date: date, end_date: date, filepath: Path) -> None:
+        """
+        Записывает сводный отчет
         
-        # Анализ по категориям
-        category_analysis = statistics_calculator.get_category_analysis(start_date, end_date)
+        Args:
+            statistics: Статистика из _get_report_statistics
+            start_date: Начальная дата
+            end_date: Конечная дата
+            filepath: Путь к файлу отчета
+        """
+        if self._write_empty_period_report(statistics, start_date, end_date, filepath):
+            return
         
-        # Создаем отчет
-        report_content = f"""
+        summary = statistics['summary']
+        current_balance = statistics['current_balance']
+        category_analysis = statistics['category_analysis']
+        trend_data = statistics['trend_data']
+        
+        # Пишем отчет прямо в файл, без накопления строки в памяти
+        with open(filepath, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER_SIZE) as f:
+            f.write(f"""
 ФИНАНСОВЫЙ ОТЧЕТ
 ================
 
@@ -133,20 +345,20 @@ class ReportGenerator:
 
 АНАЛИЗ ПО КАТЕГОРИЯМ
 --------------------
-"""
-        
-        # Добавляем топ-5 категорий расходов
-        if category_analysis['top_expense_categories']:
-            report_content += "\nТоп-5 категорий расходов:\n"
-            for i, category in enumerate(category_analysis['top_expense_categories'][:5], 1):
-                report_content += f"{i}. {category['category_id']}: {category['expense']:,.2f} ₽\n"
-        
-        # Анализ трендов
-        if len(transactions) > 0:
-            trend_data = statistics_calculator.get_trend_analysis(6)  # Последние 6 месяцев
-            if trend_data['trends']:
+""")
+            
+            # Добавляем топ-5 категорий расходов
+            if category_analysis['top_expense_categories']:
+                f.write("\nТоп-5 категорий расходов:\n")
+                f.write("".join(
+                    f"{i}. {category['category_id']}: {category['expense']:,.2f} ₽\n"
+                    for i, category in enumerate(category_analysis['top_expense_categories'][:5], 1)
+                ))
+            
+            # Анализ трендов
+            if trend_data and trend_data['trends']:
                 trends = trend_data['trends']
-                report_content += f"""
+                f.write(f"""
 АНАЛИЗ ТРЕНДОВ (последние 6 месяцев)
 ------------------------------------
 📈 Доходы: {trends['income']['direction']} ({trends['income']['percentage']:+.1f}%)
@@ -158,19 +370,7 @@ class ReportGenerator:
 💰 Средний доход: {trend_data['average_monthly']['income']:,.2f} ₽
 💸 Средние расходы: {trend_data['average_monthly']['expenses']:,.2f} ₽
 📈 Средний чистый доход: {trend_data['average_monthly']['net_income']:,.2f} ₽
-"""
-        
-        # Генерируем имя файла
-        if not filename:
-            filename = f"summary_report_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.txt"
-        
-        filepath = self.output_dir / filename
-        
-        # Сохраняем отчет
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(report_content)
-        
-        return str(filepath)
+""")
     
     def generate_detailed_report(self, transactions: List[Transaction],
                                categories: List[Category],
@@ -189,19 +389,42 @@ class ReportGenerator:
         Returns:
             Путь к сохраненному файлу
         """
-        # Создаем словарь категорий для быстрого поиска
-        category_dict = {cat.id: cat for cat in categories}
+        statistics = self._get_report_statistics(transactions, start_date, end_date)
         
-        # Рассчитываем статистику
-        statistics_calculator = StatisticsCalculator()
-        statistics_calculator.add_transactions(transactions)
-        summary = statistics_calculator._get_period_summary(start_date, end_date)
+        # Генерируем имя файла
+        if not filename:
+            filename = f"detailed_report_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.txt"
+        
+        filepath = self.output_dir / filename
+        self._write_detailed_report(statistics, categories, start_date, end_date, filepath)
+        
+        return str(filepath)
+    
+    def _write_detailed_report(self, statistics: Dict[str, Any], categories: List[Category],
+                               start_date: date, end_date: date, filepath: Path) -> None:
+        """
+        Записывает детальный отчет
+        
+        Args:
+            statistics: Статистика из _get_report_statistics
+            categories: Список категорий
+            start_date: Начальная дата
+            end_date: Конечная дата
+            filepath: Путь к файлу отчета
+        """
+        if self._write_empty_period_report(statistics, start_date, end_date, filepath):
+            return
         
-        # Анализ по категориям
-        category_analysis = statistics_calculator.get_category_analysis(start_date, end_date)
+        # Создаем словарь названий категорий для быстрого поиска
+        category_name_by_id = {cat.id: cat.name for cat in categories}
         
-        # Создаем детальный отчет
-        report_content = f"""
+        summary = statistics['summary']
+        category_analysis = statistics['category_analysis']
+        spending_patterns = statistics['spending_patterns']
+        
+        # Пишем отчет прямо в файл, без накопления строки в памяти
+        with open(filepath, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER_SIZE) as f:
+            f.write(f"""
 ДЕТАЛЬНЫЙ ФИНАНСОВЫЙ ОТЧЕТ
 ==========================
 
@@ -218,52 +441,35 @@ class ReportGenerator:
 
 ДЕТАЛЬНЫЙ АНАЛИЗ ПО КАТЕГОРИЯМ
 ------------------------------
-"""
-        
-        # Добавляем детальную информацию по категориям
-        for category in category_analysis['categories']:
-            category_id = category['category_id']
-            category_name = category_dict.get(category_id, {}).name if category_id != 'Без категории' else 'Без категории'
+""")
             
-            report_content += f"""
-Категория: {category_name}
-  💰 Доходы: {category['income']:,.2f} ₽
-  💸 Расходы: {category['expense']:,.2f} ₽
-  📈 Чистый результат: {category['net']:,.2f} ₽
-  📊 Количество транзакций: {category['transaction_count']}
-"""
-        
-        # Анализ паттернов трат
-        spending_patterns = statistics_calculator.get_spending_patterns(30)
-        if spending_patterns:
-            report_content += f"""
+            # Добавляем детальную информацию по категориям
+            f.write("".join(
+                CATEGORY_REPORT_TEMPLATE.format(
+                    name=category_name_by_id.get(category['category_id'], 'Без категории'),
+                    **category
+                )
+                for category in category_analysis['categories']
+            ))
+            
+            # Анализ паттернов трат
+            if spending_patterns:
+                f.write("""
 АНАЛИЗ ПАТТЕРНОВ ТРАТ (последние 30 дней)
 -----------------------------------------
 
 Анализ по дням недели:
-"""
-            for weekday, stats in spending_patterns['weekday_analysis'].items():
-                report_content += f"  {weekday}: {stats['amount']:,.2f} ₽ ({stats['count']} транзакций, среднее: {stats['average']:,.2f} ₽)\n"
-            
-            report_content += "\nАнализ по времени дня:\n"
-            for time_period, stats in spending_patterns['time_analysis'].items():
-                report_content += f"  {time_period}: {stats['amount']:,.2f} ₽ ({stats['count']} транзакций, среднее: {stats['average']:,.2f} ₽)\n"
-            
-            report_content += "\nАнализ по размерам транзакций:\n"
-            for range_name, stats in spending_patterns['amount_analysis'].items():
-                report_content += f"  {range_name}: {stats['amount']:,.2f} ₽ ({stats['count']} транзакций, {stats['percentage']:.1f}% от общих расходов)\n"
-        
-        # Генерируем имя файла
-        if not filename:
-            filename = f"detailed_report_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.txt"
-        
-        filepath = self.output_dir / filename
-        
-        # Сохраняем отчет
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(report_content)
-        
-        return str(filepath)
+""")
+                for weekday, stats in spending_patterns['weekday_analysis'].items():
+                    f.write(f"  {weekday}: {stats['amount']:,.2f} ₽ ({stats['count']} транзакций, среднее: {stats['average']:,.2f} ₽)\n")
+                
+                f.write("\nАнализ по времени дня:\n")
+                for time_period, stats in spending_patterns['time_analysis'].items():
+                    f.write(f"  {time_period}: {stats['amount']:,.2f} ₽ ({stats['count']} транзакций, среднее: {stats['average']:,.2f} ₽)\n")
+                
+                f.write("\nАнализ по размерам транзакций:\n")
+                for range_name, stats in spending_patterns['amount_analysis'].items():
+                    f.write(f"  {range_name}: {stats['amount']:,.2f} ₽ ({stats['count']} транзакций, {stats['percentage']:.1f}% от общих расходов)\n")
     
     def generate_comprehensive_report(self, transactions: List[Transaction],
                                     categories: List[Category],
@@ -284,72 +490,105 @@ class ReportGenerator:
         """
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
+        # Фильтрация и статистика считаются один раз для всех текстовых отчетов
+        period_positions = self._get_period_positions(transactions, start_date, end_date)
+        statistics = self._get_report_statistics(transactions, start_date, end_date)
+        
         # Генерируем различные типы отчетов
         files = {}
         
+        # Текстовые отчеты пишутся в потоках параллельно с отрисовкой графиков
+        text_executor = ThreadPoolExecutor(max_workers=3)
+        
         # 1. CSV отчет
-        csv_file = self.generate_csv_report(
-            transactions, start_date, end_date,
-            f"transactions_{timestamp}.csv"
-        )
-        files['csv'] = csv_file
+        csv_file = self.output_dir / f"transactions_{timestamp}.csv"
+        csv_future = text_executor.submit(self._write_csv_report, transactions, period_positions, csv_file)
+        files['csv'] = str(csv_file)
         
         # 2. Сводный отчет
-        summary_file = self.generate_summary_report(
-            transactions, start_date, end_date,
-            f"summary_{timestamp}.txt"
+        summary_file = self.output_dir / f"summary_{timestamp}.txt"
+        summary_future = text_executor.submit(
+            self._write_summary_report, statistics, start_date, end_date, summary_file
         )
-        files['summary'] = summary_file
+        files['summary'] = str(summary_file)
         
         # 3. Детальный отчет
-        detailed_file = self.generate_detailed_report(
-            transactions, categories, start_date, end_date,
-            f"detailed_{timestamp}.txt"
+        detailed_file = self.output_dir / f"detailed_{timestamp}.txt"
+        detailed_future = text_executor.submit(
+            self._write_detailed_report, statistics, categories, start_date, end_date, detailed_file
         )
-        files['detailed'] = detailed_file
+        files['detailed'] = str(detailed_file)
         
-        # 4. Графики
-        try:
+        # 4. Графики. Агрегаты для них считаются здесь по общему DataFrame, а в
+        # пул процессов передаются только они, без списка транзакций
+        from .chart_generator import _render_panel
+        
+        chart_generator = self.chart_generator
+        chart_jobs = [
             # История баланса
-            balance_chart = self.chart_generator.generate_balance_chart(
-                transactions, start_date, end_date
-            )
-            files['balance_chart'] = balance_chart
-            
+            ('balance_chart', chart_generator._plot_balance_chart,
+             lambda: chart_generator._get_balance_series(transactions, start_date, end_date)),
             # Доходы и расходы
-            income_expense_chart = self.chart_generator.generate_income_expense_chart(
-                transactions, start_date, end_date
-            )
-            files['income_expense_chart'] = income_expense_chart
-            
+            ('income_expense_chart', chart_generator._plot_income_expense_chart,
+             lambda: (chart_generator._get_monthly_totals(transactions, start_date, end_date),)),
             # Расходы по категориям
-            category_pie_chart = self.chart_generator.generate_category_pie_chart(
-                transactions, start_date, end_date
-            )
-            files['category_pie_chart'] = category_pie_chart
-            
+            ('category_pie_chart', chart_generator._plot_category_pie_chart,
+             lambda: (chart_generator._get_category_totals(transactions, start_date, end_date,
+                                                           TransactionType.EXPENSE),)),
             # Анализ трендов
-            trend_chart = self.chart_generator.generate_trend_analysis_chart(
-                transactions, 12
-            )
-            files['trend_chart'] = trend_chart
-            
-            # Статус бюджетов
-            if budget_statuses:
-                budget_chart = self.chart_generator.generate_budget_status_chart(
-                    budget_statuses
-                )
-                files['budget_chart'] = budget_chart
-            
-            # Комплексный график
-            comprehensive_chart = self.chart_generator.generate_comprehensive_report(
-                transactions, budget_statuses, start_date, end_date
-            )
-            files['comprehensive_chart'] = comprehensive_chart
+            ('trend_chart', chart_generator._plot_trend_analysis_chart,
+             lambda: (self._get_statistics_calculator(transactions).get_trend_analysis(12),))
+        ]
+        
+        # Статус бюджетов
+        if budget_statuses:
+            chart_jobs.append(('budget_chart', chart_generator.generate_budget_status_chart,
+                               lambda: (budget_statuses,)))
+        
+        try:
+            max_workers = os.cpu_count() or 1
+            with create_process_pool(max_workers) as executor:
+                # Ошибка одного графика не отменяет остальные
+                futures = []
+                for key, method, get_args in chart_jobs:
+                    try:
+                        futures.append((key, executor.submit(method, *get_args())))
+                    except Exception as e:
+                        print(f"Ошибка при создании графика {key}: {e}")
+                
+                # Панели комплексного графика рисуются в том же пуле, а не во вложенном
+                try:
+                    panels = chart_generator._get_comprehensive_panels(
+                        transactions, budget_statuses, start_date, end_date
+                    )
+                    panel_futures = [executor.submit(_render_panel, panel) for panel in panels]
+                except Exception as e:
+                    print(f"Ошибка при создании графика comprehensive_chart: {e}")
+                    panel_futures = None
+                
+                for key, future in futures:
+                    try:
+                        files[key] = future.result()
+                    except Exception as e:
+                        print(f"Ошибка при создании графика {key}: {e}")
+                
+                # Комплексный график
+                if panel_futures is not None:
+                    try:
+                        files['comprehensive_chart'] = chart_generator._save_comprehensive_report(
+                            [future.result() for future in panel_futures]
+                        )
+                    except Exception as e:
+                        print(f"Ошибка при создании графика comprehensive_chart: {e}")
             
         except Exception as e:
             print(f"Ошибка при создании графиков: {e}")
         
+        # Дожидаемся текстовых отчетов; их ошибки пробрасываются как раньше
+        with text_executor:
+            for future in (csv_future, summary_future, detailed_future):
+                future.result()
+        
         return files
     
     def generate_monthly_report(self, transactions: List[Transaction],
@@ -369,10 +608,7 @@ class ReportGenerator:
         """
         # Определяем период
         start_date = date(year, month, 1)
-        if month == 12:
-            end_date = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = date(year, month + 1, 1) - timedelta(days=1)
+        end_date = date(year, month, calendar.monthrange(year, month)[1])
         
         # Генерируем комплексный отчет
         return self.generate_comprehensive_report(
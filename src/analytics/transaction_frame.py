@@ -0,0 +1,52 @@
+"""
+Табличное представление транзакций для аналитики
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import date
+from typing import List
+
+from ..core.models.transaction import Transaction, TransactionType
+from ..core.calculators.transaction_columns import build_transaction_columns
+
+
+def build_transactions_frame(transactions: List[Transaction]) -> pd.DataFrame:
+    """
+    Строит DataFrame транзакций с колонками category_id, amount_cents, timestamp,
+    date, type и signed_cents
+    
+    Суммы хранятся в целых копейках (int64): агрегация по ним точная и
+    векторизуется без Decimal. Если хотя бы одна сумма не выражается точно в
+    копейках, колонки сумм содержат точные Decimal копеек, как и у калькуляторов
+    (см. build_transaction_columns), а не округленные значения. В рубли они
+    переводятся только на выходе делением на 100.
+    Транзакции без категории получают category_id = 0.
+    
+    Args:
+        transactions: Список транзакций
+    
+    Returns:
+        DataFrame транзакций
+    """
+    columns = build_transaction_columns(transactions)
+    amount_cents = columns['amount'] if columns['in_cents'] else columns['amount'] * 100
+    df = pd.DataFrame({
+        'category_id': columns['category_id'],
+        'amount_cents': amount_cents,
+        'timestamp': columns['timestamp'],
+        'date': columns['day'],
+        'type': [t.transaction_type.value for t in transactions]
+    })
+    # Знаковая сумма: доходы увеличивают баланс, расходы уменьшают, переводы не влияют
+    df['signed_cents'] = np.select(
+        [df['type'] == TransactionType.INCOME.value, df['type'] == TransactionType.EXPENSE.value],
+        [df['amount_cents'], -df['amount_cents']],
+        default=0
+    )
+    return df
+
+
+def get_date_mask(df: pd.DataFrame, start_date: date, end_date: date) -> pd.Series:
+    """Маска строк DataFrame транзакций, попадающих в период (включительно)"""
+    return (df['date'] >= np.datetime64(start_date)) & (df['date'] <= np.datetime64(end_date))
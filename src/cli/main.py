@@ -2,83 +2,150 @@
 Главный CLI модуль для финансового калькулятора
 """
 
+import calendar
 import click
+import csv
+import functools
 import os
+from itertools import chain
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
 from rich import box
 from datetime import datetime, date, timedelta
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Tuple
 
 from ..data.database.initializer import DatabaseInitializer
 from ..services import TransactionService, CategoryService, BudgetService, UserService
 from ..core.models.transaction import Transaction, TransactionType
 from ..core.models.category import Category, CategoryType
 from ..core.models.budget import Budget, BudgetPeriod
-from ..core.calculators import BalanceCalculator, StatisticsCalculator
-from ..analytics import ChartGenerator, ReportGenerator
-from ..data.import_export import DataExporter, DataImporter
+from ..core.calculators import BalanceCalculator
 
 console = Console()
 
+# Заголовки CSV при выводе транзакций не в терминал
+TRANSACTIONS_CSV_HEADERS = ['ID', 'Дата', 'Тип', 'Сумма', 'Категория', 'Описание']
+
 # Глобальные переменные для сервисов
-_services = {}
+_services = None
+
+
+class DecimalParamType(click.ParamType):
+    """Тип параметра click, разбирающий сумму из строки сразу в Decimal"""
+    
+    name = "decimal"
+    
+    def convert(self, value, param, ctx):
+        if isinstance(value, Decimal):
+            return value
+        try:
+            return Decimal(value)
+        except (InvalidOperation, TypeError):
+            self.fail(f"'{value}' не является числом", param, ctx)
+
+
+class _ServicesProxy:
+    """Лениво создает сервисы поверх общего DatabaseInitializer"""
+    
+    def __init__(self, db_initializer: DatabaseInitializer):
+        self.db_initializer = db_initializer
+    
+    def __getattr__(self, name: str):
+        # Вызывается только при первом обращении: сервис создается
+        # инициализатором и запоминается как атрибут прокси
+        service = getattr(self.db_initializer, name)
+        setattr(self, name, service)
+        return service
 
 
-def get_services():
+def get_services() -> _ServicesProxy:
     """Получает инициализированные сервисы"""
     global _services
-    if not _services:
-        # Инициализируем базу данных и сервисы
+    if _services is None:
+        # Инициализируем базу данных; сервисы создаются по мере обращения к ним
         db_initializer = DatabaseInitializer()
         db_initializer.initialize_database()
         
-        _services = {
-            'db_initializer': db_initializer,
-            'transaction_service': db_initializer.transaction_service,
-            'category_service': db_initializer.category_service,
-            'budget_service': db_initializer.budget_service,
-            'user_service': db_initializer.user_service
-        }
+        _services = _ServicesProxy(db_initializer)
     return _services
 
 
-@click.group()
+@functools.lru_cache(maxsize=64)
+def period_bounds(period: str, year: Optional[int], month: Optional[int],
+                  ref: date) -> Tuple[date, date]:
+    """
+    Вычисляет границы периода отчета
+    
+    Args:
+        period: Период ('day', 'week', 'month' или 'year')
+        year: Год (для месяца учитывается только вместе с month)
+        month: Месяц (1-12)
+        ref: Опорная дата, обычно сегодняшняя
+    
+    Returns:
+        Кортеж (начальная дата, конечная дата) включительно
+    """
+    if period == 'day':
+        return ref, ref
+    if period == 'week':
+        # Неделя с понедельника по воскресенье
+        week_start = ref - timedelta(days=ref.weekday())
+        return week_start, week_start + timedelta(days=6)
+    if period == 'month':
+        if not (year and month):
+            year, month = ref.year, ref.month
+        return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+    if period == 'year':
+        year = year or ref.year
+        return date(year, 1, 1), date(year, 12, 31)
+    raise ValueError(f"Неизвестный период: {period}")
+
+
+@click.group(chain=True, invoke_without_command=True)
 @click.version_option(version="0.1.0", prog_name="AI Finance")
-def main():
+@click.pass_context
+def main(ctx):
     """
     🏦 AI Finance - Личный финансовый калькулятор
     
     Управляйте своими финансами с помощью этого мощного инструмента.
-    """
-    # Красивый заголовок
-    title = Text("🏦 AI Finance", style="bold blue")
-    subtitle = Text("Личный финансовый калькулятор", style="italic")
     
-    panel = Panel.fit(
-        f"{title}\n{subtitle}",
-        border_style="blue",
-        padding=(1, 2)
-    )
-    console.print(panel)
+    Несколько команд можно выполнить за один запуск, например:
+    ai-finance balance report --period month transactions -l 20
+    """
+    # Заголовок показывается только при запуске без команды,
+    # чтобы не замедлять скриптовые вызовы подкоманд
+    if ctx.invoked_subcommand is None:
+        title = Text("🏦 AI Finance", style="bold blue")
+        subtitle = Text("Личный финансовый калькулятор", style="italic")
+        
+        panel = Panel.fit(
+            f"{title}\n{subtitle}",
+            border_style="blue",
+            padding=(1, 2)
+        )
+        console.print(panel)
+        click.echo(ctx.get_help())
+        return
     
     # Инициализируем сервисы
     get_services()
 
 
 @main.command()
-@click.option('--amount', '-a', type=float, required=True, help='Сумма транзакции')
+@click.option('--amount', '-a', type=DecimalParamType(), required=True, help='Сумма транзакции')
 @click.option('--category', '-c', type=str, required=True, help='Категория транзакции')
 @click.option('--description', '-d', type=str, help='Описание транзакции')
 @click.option('--type', '-t', type=click.Choice(['income', 'expense']), required=True, help='Тип транзакции')
-@click.option('--date', type=str, help='Дата транзакции (YYYY-MM-DD), по умолчанию сегодня')
+@click.option('--date', type=click.DateTime(), help='Дата транзакции (YYYY-MM-DD), по умолчанию сегодня')
 def add_transaction(amount, category, description, type, date):
     """Добавить новую транзакцию"""
     services = get_services()
-    transaction_service = services['transaction_service']
-    category_service = services['category_service']
+    transaction_service = services.transaction_service
+    category_service = services.category_service
     
     try:
         # Находим категорию по имени
@@ -89,15 +156,12 @@ def add_transaction(amount, category, description, type, date):
         
         category_obj = categories[0]  # Берем первую найденную
         
-        # Парсим дату
-        if date:
-            transaction_date = datetime.fromisoformat(date)
-        else:
-            transaction_date = datetime.now()
+        # Дата уже разобрана click; по умолчанию - текущий момент
+        transaction_date = date or datetime.now()
         
         # Создаем транзакцию
         transaction = Transaction(
-            amount=Decimal(str(amount)),
+            amount=amount,
             transaction_type=TransactionType(type),
             category_id=category_obj.id,
             description=description or '',
@@ -125,44 +189,14 @@ def add_transaction(amount, category, description, type, date):
 def report(period, year, month):
     """Показать финансовый отчет"""
     services = get_services()
-    transaction_service = services['transaction_service']
-    statistics_calculator = StatisticsCalculator()
+    transaction_service = services.transaction_service
     
     try:
         # Определяем период
-        today = date.today()
-        if period == 'day':
-            start_date = end_date = today
-        elif period == 'week':
-            start_date = today.replace(day=today.day - today.weekday())
-            end_date = start_date.replace(day=start_date.day + 6)
-        elif period == 'month':
-            if year and month:
-                start_date = date(year, month, 1)
-                if month == 12:
-                    end_date = date(year + 1, 1, 1) - timedelta(days=1)
-                else:
-                    end_date = date(year, month + 1, 1) - timedelta(days=1)
-            else:
-                start_date = today.replace(day=1)
-                if today.month == 12:
-                    end_date = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
-                else:
-                    end_date = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
-        elif period == 'year':
-            if year:
-                start_date = date(year, 1, 1)
-                end_date = date(year, 12, 31)
-            else:
-                start_date = today.replace(month=1, day=1)
-                end_date = today.replace(month=12, day=31)
-        
-        # Получаем транзакции за период
-        transactions = transaction_service.get_transactions(start_date=start_date, end_date=end_date)
-        statistics_calculator.add_transactions(transactions)
+        start_date, end_date = period_bounds(period, year, month, date.today())
         
-        # Рассчитываем статистику
-        summary = statistics_calculator._get_period_summary(start_date, end_date)
+        # Рассчитываем статистику агрегатом в базе, без загрузки транзакций
+        summary = transaction_service.get_period_summary(start_date, end_date)
         
         # Создаем таблицу отчета
         table = Table(title=f"📊 Финансовый отчет за {period}", box=box.ROUNDED)
@@ -189,23 +223,26 @@ def report(period, year, month):
 def balance():
     """Показать текущий баланс"""
     services = get_services()
-    transaction_service = services['transaction_service']
+    transaction_service = services.transaction_service
     balance_calculator = BalanceCalculator()
     
     try:
-        # Получаем все транзакции
-        transactions = transaction_service.get_transactions()
-        balance_calculator.add_transactions(transactions)
-        
-        # Рассчитываем текущий баланс
-        current_balance = balance_calculator.calculate_balance()
+        # Текущий баланс считается агрегатом в базе, без загрузки всей истории
+        current_balance = transaction_service.sum_signed()
         
-        # Рассчитываем доходы и расходы за текущий месяц
+        # Для месячной разбивки загружаем только транзакции текущего месяца
+        # (калькулятор сам отбрасывает транзакции после сегодняшнего дня)
         today = date.today()
         month_start = today.replace(day=1)
-        month_income = balance_calculator.calculate_income(month_start, today)
-        month_expenses = balance_calculator.calculate_expenses(month_start, today)
-        month_net = balance_calculator.calculate_net_income(month_start, today)
+        balance_calculator.add_transactions(
+            transaction_service.get_transactions(start_date=month_start)
+        )
+        
+        # Рассчитываем доходы и расходы за текущий месяц за один проход
+        month_snapshot = balance_calculator.snapshot(month_start, today)
+        month_income = month_snapshot['income']
+        month_expenses = month_snapshot['expenses']
+        month_net = month_snapshot['net_income']
         
         # Создаем таблицу баланса
         table = Table(title="💰 Текущий баланс", box=box.ROUNDED)
@@ -232,11 +269,11 @@ def balance():
 def budget():
     """Показать статус бюджетов"""
     services = get_services()
-    budget_service = services['budget_service']
+    budget_service = services.budget_service
     
     try:
-        # Получаем статус всех активных бюджетов
-        budgets_status = budget_service.get_all_budgets_status()
+        # Получаем статус всех активных бюджетов и предупреждения за один расчет
+        budgets_status, alerts = budget_service.get_budgets_status_with_alerts()
         
         if not budgets_status:
             console.print("📋 Нет активных бюджетов")
@@ -272,7 +309,6 @@ def budget():
         console.print(table)
         
         # Показываем предупреждения
-        alerts = budget_service.get_budget_alerts()
         if alerts:
             console.print("\n⚠️  Предупреждения:")
             for alert in alerts:
@@ -286,7 +322,7 @@ def budget():
 def categories():
     """Показать список категорий"""
     services = get_services()
-    category_service = services['category_service']
+    category_service = services.category_service
     
     try:
         # Получаем все категории
@@ -327,17 +363,44 @@ def categories():
 def transactions(limit):
     """Показать последние транзакции"""
     services = get_services()
-    transaction_service = services['transaction_service']
-    category_service = services['category_service']
+    transaction_service = services.transaction_service
+    category_service = services.category_service
     
     try:
-        # Получаем последние транзакции
-        transactions = transaction_service.get_transactions(limit=limit)
+        # Получаем последние транзакции потоком, не загружая их все в память
+        transactions = transaction_service.iter_transactions(limit=limit)
+        first_transaction = next(transactions, None)
         
-        if not transactions:
+        if first_transaction is None:
             console.print("💳 Нет транзакций")
             return
         
+        transactions = chain([first_transaction], transactions)
+        
+        # Загружаем все категории одним запросом вместо запроса на каждую строку
+        category_dict = {cat.id: cat for cat in category_service.get_categories()}
+        
+        def get_category_name(transaction: Transaction) -> str:
+            category = category_dict.get(transaction.category_id) if transaction.category_id else None
+            return category.name if category else "Без категории"
+        
+        # Вне терминала (перенаправление в файл или конвейер) строки пишутся
+        # сразу в CSV без раскладки таблицы Rich и без накопления в памяти
+        if not console.is_terminal:
+            writer = csv.writer(console.file)
+            writer.writerow(TRANSACTIONS_CSV_HEADERS)
+            for transaction in transactions:
+                amount = -transaction.amount if transaction.is_expense else transaction.amount
+                writer.writerow([
+                    transaction.id,
+                    transaction.date.strftime('%d.%m.%Y'),
+                    transaction.transaction_type.value,
+                    f"{amount:.2f}",
+                    get_category_name(transaction),
+                    transaction.description
+                ])
+            return
+        
         # Создаем таблицу транзакций
         table = Table(title=f"💳 Последние {limit} транзакций", box=box.ROUNDED)
         table.add_column("ID", style="cyan", justify="right")
@@ -348,13 +411,6 @@ def transactions(limit):
         table.add_column("Описание", style="white")
         
         for transaction in transactions:
-            # Получаем категорию
-            category_name = "Без категории"
-            if transaction.category_id:
-                category = category_service.get_category(transaction.category_id)
-                if category:
-                    category_name = category.name
-            
             # Определяем иконку типа
             type_icon = "💰" if transaction.is_income else "💸"
             
@@ -368,7 +424,7 @@ def transactions(limit):
                 transaction.date.strftime('%d.%m.%Y'),
                 type_icon,
                 amount_str,
-                category_name,
+                get_category_name(transaction),
                 transaction.description[:30] + "..." if len(transaction.description) > 30 else transaction.description
             )
         
@@ -379,43 +435,40 @@ def transactions(limit):
 
 
 @main.command()
-@click.option('--start-date', type=str, help='Начальная дата (YYYY-MM-DD)')
-@click.option('--end-date', type=str, help='Конечная дата (YYYY-MM-DD)')
+@click.option('--start-date', type=click.DateTime(formats=['%Y-%m-%d']), help='Начальная дата (YYYY-MM-DD)')
+@click.option('--end-date', type=click.DateTime(formats=['%Y-%m-%d']), help='Конечная дата (YYYY-MM-DD)')
 @click.option('--output-dir', type=str, default='reports', help='Директория для сохранения отчетов')
 def generate_report(start_date, end_date, output_dir):
     """Генерировать комплексный финансовый отчет с графиками"""
     services = get_services()
-    transaction_service = services['transaction_service']
-    category_service = services['category_service']
-    budget_service = services['budget_service']
+    transaction_service = services.transaction_service
+    category_service = services.category_service
+    budget_service = services.budget_service
     
     try:
         # Определяем период
         if start_date and end_date:
-            start = datetime.fromisoformat(start_date).date()
-            end = datetime.fromisoformat(end_date).date()
+            start = start_date.date()
+            end = end_date.date()
         else:
             # По умолчанию - текущий месяц
-            today = date.today()
-            start = today.replace(day=1)
-            if today.month == 12:
-                end = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
-            else:
-                end = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
+            start, end = period_bounds('month', None, None, date.today())
         
         console.print(f"📊 Генерация отчета за период: {start.strftime('%d.%m.%Y')} - {end.strftime('%d.%m.%Y')}")
         
         # Получаем данные
         transactions = transaction_service.get_transactions(start_date=start, end_date=end)
-        categories = category_service.get_categories()
+        categories = category_service.get_categories_for_transactions(transactions)
         budget_statuses = budget_service.get_all_budgets_status()
         
         if not transactions:
             console.print("❌ Нет транзакций за указанный период")
             return
         
-        # Создаем генератор отчетов
-        report_generator = ReportGenerator(output_dir)
+        # Создаем генератор отчетов (pandas импортируется только здесь;
+        # сервис возвращает транзакции, отсортированные по дате)
+        from ..analytics import ReportGenerator
+        report_generator = ReportGenerator(output_dir, sorted_by_date=True)
         
         # Генерируем комплексный отчет
         files = report_generator.generate_comprehensive_report(
@@ -447,8 +500,8 @@ def generate_report(start_date, end_date, output_dir):
 def monthly_report(year, month, output_dir):
     """Генерировать месячный отчет"""
     services = get_services()
-    transaction_service = services['transaction_service']
-    category_service = services['category_service']
+    transaction_service = services.transaction_service
+    category_service = services.category_service
     
     try:
         # Определяем год и месяц
@@ -461,14 +514,16 @@ def monthly_report(year, month, output_dir):
         
         # Получаем данные
         transactions = transaction_service.get_transactions()
-        categories = category_service.get_categories()
+        categories = category_service.get_categories_for_transactions(transactions)
         
         if not transactions:
             console.print("❌ Нет транзакций")
             return
         
-        # Создаем генератор отчетов
-        report_generator = ReportGenerator(output_dir)
+        # Создаем генератор отчетов (pandas импортируется только здесь;
+        # сервис возвращает транзакции, отсортированные по дате)
+        from ..analytics import ReportGenerator
+        report_generator = ReportGenerator(output_dir, sorted_by_date=True)
         
         # Генерируем месячный отчет
         files = report_generator.generate_monthly_report(
@@ -496,20 +551,20 @@ def monthly_report(year, month, output_dir):
 @main.command()
 @click.option('--chart-type', type=click.Choice(['balance', 'income-expense', 'category-pie', 'trends', 'budget']), 
               required=True, help='Тип графика')
-@click.option('--start-date', type=str, help='Начальная дата (YYYY-MM-DD)')
-@click.option('--end-date', type=str, help='Конечная дата (YYYY-MM-DD)')
+@click.option('--start-date', type=click.DateTime(formats=['%Y-%m-%d']), help='Начальная дата (YYYY-MM-DD)')
+@click.option('--end-date', type=click.DateTime(formats=['%Y-%m-%d']), help='Конечная дата (YYYY-MM-DD)')
 @click.option('--output-dir', type=str, default='charts', help='Директория для сохранения графиков')
 def generate_chart(chart_type, start_date, end_date, output_dir):
     """Генерировать график"""
     services = get_services()
-    transaction_service = services['transaction_service']
-    budget_service = services['budget_service']
+    transaction_service = services.transaction_service
+    budget_service = services.budget_service
     
     try:
         # Определяем период
         if start_date and end_date:
-            start = datetime.fromisoformat(start_date).date()
-            end = datetime.fromisoformat(end_date).date()
+            start = start_date.date()
+            end = end_date.date()
         else:
             # По умолчанию - последние 30 дней
             end = date.today()
@@ -525,7 +580,8 @@ def generate_chart(chart_type, start_date, end_date, output_dir):
             console.print("❌ Нет транзакций за указанный период")
             return
         
-        # Создаем генератор графиков
+        # Создаем генератор графиков (matplotlib импортируется только здесь)
+        from ..analytics import ChartGenerator
         chart_generator = ChartGenerator(output_dir)
         
         # Генерируем график в зависимости от типа
@@ -558,9 +614,9 @@ def generate_chart(chart_type, start_date, end_date, output_dir):
 def export_data(export_format, output_dir):
     """Экспортировать данные в различных форматах"""
     services = get_services()
-    transaction_service = services['transaction_service']
-    category_service = services['category_service']
-    budget_service = services['budget_service']
+    transaction_service = services.transaction_service
+    category_service = services.category_service
+    budget_service = services.budget_service
     
     try:
         console.print(f"📤 Экспорт данных в формате: {export_format}")
@@ -574,7 +630,8 @@ def export_data(export_format, output_dir):
             console.print("❌ Нет транзакций для экспорта")
             return
         
-        # Создаем экспортер
+        # Создаем экспортер (pandas и reportlab импортируются только здесь)
+        from ..data.import_export import DataExporter
         exporter = DataExporter(output_dir)
         
         # Экспортируем в зависимости от формата
@@ -618,14 +675,15 @@ def export_data(export_format, output_dir):
 def import_data(file_path, import_format, date_format, skip_duplicates, validate_only):
     """Импортировать данные из файла"""
     services = get_services()
-    transaction_service = services['transaction_service']
-    category_service = services['category_service']
+    transaction_service = services.transaction_service
+    category_service = services.category_service
     
     try:
         console.print(f"📥 Импорт данных из файла: {os.path.basename(file_path)}")
         console.print(f"📋 Формат: {import_format}")
         
-        # Создаем импортер
+        # Создаем импортер (pandas импортируется только здесь)
+        from ..data.import_export import DataImporter
         importer = DataImporter()
         
         if validate_only:
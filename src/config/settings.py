@@ -2,15 +2,23 @@
 Настройки приложения
 """
 
+import atexit
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Optional
 import yaml
 from dotenv import load_dotenv
 
 # Загружаем переменные окружения
 load_dotenv()
 
+# YAML-загрузчик и сериализатор на libyaml (C), если он доступен
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 # Базовые пути
 BASE_DIR = Path(__file__).parent.parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -79,8 +87,8 @@ BACKUP_CONFIG = {
     "backup_dir": str(DATA_DIR / "backups"),
 }
 
-# Категории по умолчанию
-DEFAULT_CATEGORIES = [
+# Категории по умолчанию (неизменяемый кортеж, доступ как к словарям)
+DEFAULT_CATEGORIES = tuple(MappingProxyType(category) for category in [
     # Доходы
     {"name": "Зарплата", "type": "income", "icon": "💰", "color": "#2ecc71"},
     {"name": "Фриланс", "type": "income", "icon": "💻", "color": "#2ecc71"},
@@ -96,35 +104,89 @@ DEFAULT_CATEGORIES = [
     {"name": "Коммунальные", "type": "expense", "icon": "🏠", "color": "#e74c3c"},
     {"name": "Одежда", "type": "expense", "icon": "👕", "color": "#e74c3c"},
     {"name": "Прочее", "type": "expense", "icon": "📦", "color": "#e74c3c"},
-]
+])
 
-# Загружаем пользовательские настройки если есть
+# Файл пользовательских настроек (загружается при первом обращении)
 USER_CONFIG_FILE = CONFIG_DIR / "user_config.yaml"
-if USER_CONFIG_FILE.exists():
-    with open(USER_CONFIG_FILE, 'r', encoding='utf-8') as f:
-        USER_CONFIG = yaml.safe_load(f)
-else:
-    USER_CONFIG = {}
 
+# Маркер отсутствующей настройки в кэше путей
+_MISSING = object()
 
-def get_setting(key: str, default: Any = None) -> Any:
-    """Получить настройку по ключу"""
-    keys = key.split('.')
-    value = USER_CONFIG
+# Загруженные пользовательские настройки и время изменения файла при загрузке
+_user_config: Optional[Dict[str, Any]] = None
+_user_config_mtime: Optional[int] = None
+
+# Есть ли изменения настроек, еще не записанные в файл
+_dirty = False
+
+
+def _get_user_config_mtime() -> Optional[int]:
+    """Время изменения файла пользовательских настроек (None, если файла нет)"""
+    try:
+        return USER_CONFIG_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _load_user_config() -> Dict[str, Any]:
+    """
+    Получить пользовательские настройки
+    
+    Файл читается при первом обращении и перечитывается, только если он
+    изменился на диске. Пока есть незаписанные изменения, используются
+    настройки из памяти.
+    """
+    global _user_config, _user_config_mtime
+    
+    if _dirty and _user_config is not None:
+        return _user_config
+    
+    mtime = _get_user_config_mtime()
+    if _user_config is None or mtime != _user_config_mtime:
+        if mtime is None:
+            _user_config = {}
+        else:
+            with open(USER_CONFIG_FILE, 'r', encoding='utf-8') as f:
+                _user_config = yaml.load(f, Loader=YAML_LOADER) or {}
+        _user_config_mtime = mtime
+        _resolve.cache_clear()
     
-    for k in keys:
+    return _user_config
+
+
+@lru_cache(maxsize=512)
+def _resolve(key: str) -> Any:
+    """Найти значение по пути через точку (кэшируется до изменения настроек)"""
+    value = _user_config
+    
+    for k in key.split('.'):
         if isinstance(value, dict) and k in value:
             value = value[k]
         else:
-            return default
+            return _MISSING
     
     return value
 
 
+def get_setting(key: str, default: Any = None) -> Any:
+    """Получить настройку по ключу"""
+    _load_user_config()
+    value = _resolve(key)
+    return default if value is _MISSING else value
+
+
 def update_setting(key: str, value: Any) -> None:
-    """Обновить настройку"""
+    """
+    Обновить настройку
+    
+    Изменение сразу видно через get_setting, а в файл записывается
+    отложенно: вызовом flush_settings() или при завершении процесса,
+    так что серия обновлений дает одну запись на диск.
+    """
+    global _dirty
+    
     keys = key.split('.')
-    config = USER_CONFIG
+    config = _load_user_config()
     
     for k in keys[:-1]:
         if k not in config:
@@ -132,10 +194,26 @@ def update_setting(key: str, value: Any) -> None:
         config = config[k]
     
     config[keys[-1]] = value
+    _dirty = True
+    _resolve.cache_clear()
+
+
+@atexit.register
+def flush_settings() -> None:
+    """Записать несохраненные настройки в файл (атомарно через временный файл)"""
+    global _dirty, _user_config_mtime
+    
+    if not _dirty:
+        return
     
-    # Сохраняем в файл
-    with open(USER_CONFIG_FILE, 'w', encoding='utf-8') as f:
-        yaml.dump(USER_CONFIG, f, default_flow_style=False, allow_unicode=True)
+    tmp_file = USER_CONFIG_FILE.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        yaml.dump(_user_config, f, Dumper=YAML_DUMPER, default_flow_style=False, allow_unicode=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, USER_CONFIG_FILE)
+    _user_config_mtime = _get_user_config_mtime()
+    _dirty = False
 
 
 def get_database_url() -> str:
@@ -148,17 +226,25 @@ def get_database_url() -> str:
         raise ValueError(f"Неподдерживаемый тип базы данных: {DATABASE_CONFIG['type']}")
 
 
+@dataclass(frozen=True)
 class Settings:
-    """Класс настроек приложения"""
+    """Класс настроек приложения (неизменяемый)"""
+    __slots__ = ('database_path', 'debug', 'language', 'currency', 'timezone')
     
-    def __init__(self):
-        self.database_path = DATABASE_CONFIG["path"]
-        self.debug = APP_CONFIG["debug"]
-        self.language = APP_CONFIG["language"]
-        self.currency = APP_CONFIG["currency"]
-        self.timezone = APP_CONFIG["timezone"]
+    database_path: str
+    debug: bool
+    language: str
+    currency: str
+    timezone: str
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Получить объект настроек"""
-    return Settings()
+    """Получить объект настроек (один на процесс)"""
+    return Settings(
+        database_path=DATABASE_CONFIG["path"],
+        debug=APP_CONFIG["debug"],
+        language=APP_CONFIG["language"],
+        currency=APP_CONFIG["currency"],
+        timezone=APP_CONFIG["timezone"]
+    )
@@ -4,8 +4,9 @@
 
 from decimal import Decimal
 from datetime import datetime, date
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from ..models.transaction import Transaction, TransactionType
+from .transaction_columns import build_transaction_columns, columns_to_decimal
 
 
 class BalanceCalculator:
@@ -13,12 +14,108 @@ class BalanceCalculator:
     Калькулятор для расчета баланса и финансовых показателей
     """
     
+    __slots__ = ('transactions', '_columns', '_columns_key', '_balance_prefixes')
+    
     def __init__(self):
         self.transactions: List[Transaction] = []
+        # Колоночное представление транзакций и (список, длина), по которым оно
+        # построено; ссылка на список, а не id(), не дает спутать его с новым
+        self._columns: Optional[Dict[str, Any]] = None
+        self._columns_key: Optional[Tuple[List[Transaction], int]] = None
+        # Префиксные суммы баланса по счетам (ключ None - все счета)
+        self._balance_prefixes: Dict[Optional[int], Dict[str, Any]] = {}
     
     def add_transactions(self, transactions: List[Transaction]) -> None:
         """Добавляет транзакции для расчета"""
         self.transactions.extend(transactions)
+        self._columns = None
+    
+    def _get_columns(self) -> Dict[str, Any]:
+        """
+        Строит (один раз) колоночное представление транзакций в массивах NumPy
+        
+        Returns:
+            Словарь массивов из build_transaction_columns
+        """
+        key = self._columns_key
+        if (self._columns is not None and key[0] is self.transactions
+                and key[1] == len(self.transactions)):
+            return self._columns
+        
+        self._columns = build_transaction_columns(self.transactions)
+        self._columns_key = (self.transactions, len(self.transactions))
+        self._balance_prefixes = {}
+        return self._columns
+    
+    def _get_balance_prefix(self, account_id: Optional[int]) -> Dict[str, Any]:
+        """
+        Строит (один раз на счет) префиксные суммы баланса
+        
+        Транзакции счета упорядочиваются по дате и времени (устойчиво, как
+        sorted по date), и для них накапливается знаковая сумма. Баланс на
+        любую дату тогда находится бинарным поиском за O(log N).
+        
+        Args:
+            account_id: ID счета (если None, то по всем счетам)
+        
+        Returns:
+            Словарь массивов positions (индексы транзакций в self.transactions),
+            timestamp (отсортированные даты) и cum (накопленный баланс)
+        """
+        import numpy as np
+        
+        columns = self._get_columns()
+        prefix = self._balance_prefixes.get(account_id)
+        if prefix is not None:
+            return prefix
+        
+        positions = np.arange(len(columns['amount']))
+        if account_id is not None:
+            positions = positions[columns['account_id'] == account_id]
+        positions = positions[np.argsort(columns['timestamp'][positions], kind='stable')]
+        
+        signed = columns['amount'][positions] * columns['sign'][positions]
+        prefix = {
+            'positions': positions,
+            'timestamp': columns['timestamp'][positions],
+            'cum': np.cumsum(signed)
+        }
+        self._balance_prefixes[account_id] = prefix
+        return prefix
+    
+    @staticmethod
+    def _to_decimal(columns: Dict[str, Any], total) -> Decimal:
+        """Переводит сумму из колоночного представления в Decimal"""
+        return columns_to_decimal(columns, total)
+    
+    @staticmethod
+    def _to_floats(columns: Dict[str, Any], amounts):
+        """Переводит массив сумм из колоночного представления в массив float64 без Decimal"""
+        import numpy as np
+        
+        if columns['in_cents']:
+            return amounts / 100
+        return np.array([float(amount) for amount in amounts], dtype=np.float64)
+    
+    @classmethod
+    def _sum_amounts(cls, columns: Dict[str, Any], amounts) -> Decimal:
+        """Точно суммирует выбранные суммы и возвращает Decimal"""
+        return cls._to_decimal(columns, amounts.sum())
+    
+    @staticmethod
+    def _next_day_start(value: date):
+        """Начало следующего дня: граница для включительного сравнения по дате"""
+        import numpy as np
+        
+        return (np.datetime64(value, 'D') + 1).astype('datetime64[us]')
+    
+    @staticmethod
+    def _get_period_mask(columns: Dict[str, Any], start_date: date, end_date: date):
+        """Маска транзакций, попадающих в период (включительно)"""
+        import numpy as np
+        
+        day = columns['day']
+        return (day >= np.datetime64(start_date, 'D')) & (day <= np.datetime64(end_date, 'D'))
     
     def calculate_balance(self, account_id: Optional[int] = None, 
                          end_date: Optional[date] = None) -> Decimal:
@@ -32,28 +129,18 @@ class BalanceCalculator:
         Returns:
             Текущий баланс
         """
+        import numpy as np
+        
         if end_date is None:
             end_date = date.today()
         
-        balance = Decimal('0.00')
+        # Баланс - накопленная сумма последней транзакции не позже end_date;
+        # переводы имеют нулевой знак и не влияют на общий баланс
+        prefix = self._get_balance_prefix(account_id)
+        count = np.searchsorted(prefix['timestamp'], self._next_day_start(end_date), side='left')
         
-        for transaction in self.transactions:
-            # Фильтрация по дате
-            if transaction.date.date() > end_date:
-                continue
-            
-            # Фильтрация по счету
-            if account_id is not None and transaction.account_id != account_id:
-                continue
-            
-            # Расчет баланса
-            if transaction.is_income:
-                balance += transaction.amount
-            elif transaction.is_expense:
-                balance -= transaction.amount
-            # Переводы не влияют на общий баланс
-        
-        return balance
+        columns = self._get_columns()
+        return self._to_decimal(columns, prefix['cum'][count - 1] if count else 0)
     
     def calculate_income(self, start_date: date, end_date: date, 
                         category_id: Optional[int] = None) -> Decimal:
@@ -68,21 +155,13 @@ class BalanceCalculator:
         Returns:
             Сумма доходов
         """
-        total_income = Decimal('0.00')
+        columns = self._get_columns()
         
-        for transaction in self.transactions:
-            if not transaction.is_income:
-                continue
-            
-            if not (start_date <= transaction.date.date() <= end_date):
-                continue
-            
-            if category_id is not None and transaction.category_id != category_id:
-                continue
-            
-            total_income += transaction.amount
+        mask = self._get_period_mask(columns, start_date, end_date) & (columns['sign'] > 0)
+        if category_id is not None:
+            mask &= columns['category_id'] == category_id
         
-        return total_income
+        return self._sum_amounts(columns, columns['amount'][mask])
     
     def calculate_expenses(self, start_date: date, end_date: date,
                           category_id: Optional[int] = None) -> Decimal:
@@ -97,21 +176,13 @@ class BalanceCalculator:
         Returns:
             Сумма расходов
         """
-        total_expenses = Decimal('0.00')
+        columns = self._get_columns()
         
-        for transaction in self.transactions:
-            if not transaction.is_expense:
-                continue
-            
-            if not (start_date <= transaction.date.date() <= end_date):
-                continue
-            
-            if category_id is not None and transaction.category_id != category_id:
-                continue
-            
-            total_expenses += transaction.amount
+        mask = self._get_period_mask(columns, start_date, end_date) & (columns['sign'] < 0)
+        if category_id is not None:
+            mask &= columns['category_id'] == category_id
         
-        return total_expenses
+        return self._sum_amounts(columns, columns['amount'][mask])
     
     def calculate_net_income(self, start_date: date, end_date: date) -> Decimal:
         """
@@ -124,10 +195,51 @@ class BalanceCalculator:
         Returns:
             Чистый доход
         """
-        income = self.calculate_income(start_date, end_date)
-        expenses = self.calculate_expenses(start_date, end_date)
+        income, expenses = self._sum_income_expense(start_date, end_date)
         return income - expenses
     
+    def _sum_income_expense(self, start_date: date, end_date: date) -> Tuple[Decimal, Decimal]:
+        """
+        Рассчитывает доходы и расходы за период по одной маске периода
+        
+        Args:
+            start_date: Начальная дата
+            end_date: Конечная дата
+        
+        Returns:
+            Кортеж (доходы, расходы)
+        """
+        columns = self._get_columns()
+        
+        mask = self._get_period_mask(columns, start_date, end_date)
+        amounts = columns['amount'][mask]
+        signs = columns['sign'][mask]
+        return (self._sum_amounts(columns, amounts[signs > 0]),
+                self._sum_amounts(columns, amounts[signs < 0]))
+    
+    def snapshot(self, start_date: date, end_date: date) -> Dict[str, Decimal]:
+        """
+        Рассчитывает баланс и показатели за период по общим колонкам транзакций
+        
+        Результат совпадает с отдельными вызовами calculate_balance(end_date=end_date),
+        calculate_income, calculate_expenses и calculate_net_income.
+        
+        Args:
+            start_date: Начальная дата периода
+            end_date: Конечная дата периода и дата расчета баланса
+        
+        Returns:
+            Словарь с ключами balance, income, expenses и net_income
+        """
+        income, expenses = self._sum_income_expense(start_date, end_date)
+        
+        return {
+            'balance': self.calculate_balance(end_date=end_date),
+            'income': income,
+            'expenses': expenses,
+            'net_income': income - expenses
+        }
+    
     def get_balance_history(self, start_date: date, end_date: date,
                            account_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -141,32 +253,66 @@ class BalanceCalculator:
         Returns:
             Список словарей с датой и балансом
         """
-        # Сортируем транзакции по дате
-        sorted_transactions = sorted(
-            [t for t in self.transactions 
-             if start_date <= t.date.date() <= end_date and
-             (account_id is None or t.account_id == account_id)],
-            key=lambda x: x.date
-        )
-        
-        balance_history = []
-        current_balance = Decimal('0.00')
-        
-        for transaction in sorted_transactions:
-            if transaction.is_income:
-                current_balance += transaction.amount
-            elif transaction.is_expense:
-                current_balance -= transaction.amount
-            
-            balance_history.append({
-                'date': transaction.date.date(),
-                'balance': float(current_balance),
-                'transaction_id': transaction.id,
-                'amount': float(transaction.amount),
-                'type': transaction.transaction_type.value
-            })
+        history = self.get_balance_history_columns(start_date, end_date, account_id)
         
-        return balance_history
+        return [
+            {
+                'date': transaction_date,
+                'balance': balance,
+                'transaction_id': transaction_id,
+                'amount': amount,
+                'type': transaction_type
+            }
+            for transaction_date, balance, transaction_id, amount, transaction_type in zip(
+                history['date'].tolist(),
+                history['balance'].tolist(),
+                history['transaction_id'],
+                history['amount'].tolist(),
+                history['type']
+            )
+        ]
+    
+    def get_balance_history_columns(self, start_date: date, end_date: date,
+                                    account_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Получает историю изменения баланса в виде колонок
+        
+        Те же данные, что и get_balance_history, но без построения словаря на
+        каждую транзакцию: даты и суммы возвращаются массивами NumPy, готовыми
+        для графиков и pandas.
+        
+        Args:
+            start_date: Начальная дата
+            end_date: Конечная дата
+            account_id: ID счета
+        
+        Returns:
+            Словарь с ключами date (datetime64[D]), balance и amount (float64),
+            transaction_id и type (списки)
+        """
+        import numpy as np
+        
+        # Транзакции периода - непрерывный отрезок отсортированных префиксных сумм
+        prefix = self._get_balance_prefix(account_id)
+        timestamps = prefix['timestamp']
+        first = np.searchsorted(timestamps, np.datetime64(start_date, 'D').astype('datetime64[us]'), side='left')
+        last = np.searchsorted(timestamps, self._next_day_start(end_date), side='left')
+        
+        # История начинается с нулевого баланса в начале периода
+        columns = self._get_columns()
+        cum = prefix['cum']
+        base = cum[first - 1] if first else 0
+        
+        positions = prefix['positions'][first:last]
+        transactions = [self.transactions[position] for position in positions]
+        
+        return {
+            'date': columns['day'][positions],
+            'balance': self._to_floats(columns, cum[first:last] - base),
+            'transaction_id': [transaction.id for transaction in transactions],
+            'amount': self._to_floats(columns, columns['amount'][positions]),
+            'type': [transaction.transaction_type.value for transaction in transactions]
+        }
     
     def get_category_summary(self, start_date: date, end_date: date) -> Dict[str, Any]:
         """
@@ -179,32 +325,29 @@ class BalanceCalculator:
         Returns:
             Словарь с суммами по категориям
         """
-        category_summary = {
-            'income': {},
-            'expense': {}
-        }
+        import numpy as np
         
-        for transaction in self.transactions:
-            if not (start_date <= transaction.date.date() <= end_date):
-                continue
-            
-            category_id = transaction.category_id or 'Без категории'
+        columns = self._get_columns()
+        period_mask = self._get_period_mask(columns, start_date, end_date)
+        
+        category_summary = {}
+        for category_type, type_mask in (('income', columns['sign'] > 0),
+                                         ('expense', columns['sign'] < 0)):
+            mask = period_mask & type_mask
+            category_ids = columns['category_id'][mask]
+            amounts = columns['amount'][mask]
             
-            if transaction.is_income:
-                if category_id not in category_summary['income']:
-                    category_summary['income'][category_id] = Decimal('0.00')
-                category_summary['income'][category_id] += transaction.amount
+            # Группируем по категории; категории идут в порядке первой транзакции
+            unique_ids, first_positions, inverse = np.unique(
+                category_ids, return_index=True, return_inverse=True
+            )
+            totals = np.zeros(len(unique_ids), dtype=amounts.dtype)
+            np.add.at(totals, inverse, amounts)
             
-            elif transaction.is_expense:
-                if category_id not in category_summary['expense']:
-                    category_summary['expense'][category_id] = Decimal('0.00')
-                category_summary['expense'][category_id] += transaction.amount
-        
-        # Конвертируем Decimal в float для JSON сериализации
-        for category_type in category_summary:
-            for category_id in category_summary[category_type]:
-                category_summary[category_type][category_id] = float(
-                    category_summary[category_type][category_id]
-                )
+            # Конвертируем Decimal в float для JSON сериализации
+            category_summary[category_type] = {
+                int(unique_ids[i]) or 'Без категории': float(self._sum_amounts(columns, totals[i:i + 1]))
+                for i in np.argsort(first_positions, kind='stable')
+            }
         
         return category_summary
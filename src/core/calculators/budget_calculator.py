@@ -2,29 +2,118 @@
 Калькулятор бюджета
 """
 
+import calendar
+from bisect import bisect_left, bisect_right
 from decimal import Decimal
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from ..models.transaction import Transaction, TransactionType
 from ..models.budget import Budget, BudgetPeriod
 
 
+# Ключ индекса расходов по всем категориям (None - расходы без категории)
+ALL_CATEGORIES = object()
+
+
 class BudgetCalculator:
     """
     Калькулятор для работы с бюджетами
     """
     
+    __slots__ = ('budgets', 'transactions', '_expense_index', '_expense_index_key', '_usage_cache')
+    
     def __init__(self):
         self.budgets: List[Budget] = []
         self.transactions: List[Transaction] = []
+        # Индекс расходов по категориям: отсортированные даты, транзакции
+        # и префиксные суммы в копейках (строится один раз)
+        self._expense_index: Dict[Any, Dict[str, Any]] = {}
+        # (список, длина), по которым построен индекс
+        self._expense_index_key: Optional[Tuple[List[Transaction], int]] = None
+        # Кэш использования бюджетов по (параметры бюджета, дата расчета);
+        # сбрасывается вместе с индексом расходов
+        self._usage_cache: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
     
     def add_budgets(self, budgets: List[Budget]) -> None:
         """Добавляет бюджеты для расчета"""
         self.budgets.extend(budgets)
+        self._usage_cache.clear()
     
     def add_transactions(self, transactions: List[Transaction]) -> None:
         """Добавляет транзакции для расчета"""
         self.transactions.extend(transactions)
+        self._expense_index_key = None
+    
+    def _get_expense_index(self) -> Dict[Any, Dict[str, Any]]:
+        """
+        Возвращает индекс расходов по категориям
+        
+        Для каждой категории (и для ALL_CATEGORIES) хранятся транзакции,
+        упорядоченные по дате, их даты без времени и префиксные суммы в
+        копейках (None, если сумма не выражается точно в копейках). Дата и
+        тип транзакции вычисляются один раз; индекс перестраивается при
+        изменении списка транзакций.
+        """
+        key = self._expense_index_key
+        if key is not None and key[0] is self.transactions and key[1] == len(self.transactions):
+            return self._expense_index
+        
+        # Закэшированное использование бюджетов больше не соответствует транзакциям
+        self._usage_cache.clear()
+        
+        rows = sorted(
+            ((transaction.date.date(), transaction) for transaction in self.transactions
+             if transaction.is_expense),
+            key=lambda row: row[0]
+        )
+        
+        grouped: Dict[Any, List[Tuple[date, Transaction]]] = {ALL_CATEGORIES: rows}
+        for row in rows:
+            grouped.setdefault(row[1].category_id, []).append(row)
+        
+        self._expense_index = {}
+        for category_id, category_rows in grouped.items():
+            cents = [transaction.amount_cents for _, transaction in category_rows]
+            prefix = None
+            if None not in cents:
+                prefix = [0]
+                for value in cents:
+                    prefix.append(prefix[-1] + value)
+            
+            self._expense_index[category_id] = {
+                'dates': [transaction_date for transaction_date, _ in category_rows],
+                'transactions': [transaction for _, transaction in category_rows],
+                'prefix': prefix
+            }
+        
+        self._expense_index_key = (self.transactions, len(self.transactions))
+        return self._expense_index
+    
+    def _sum_expenses(self, category_key: Any, start_date: date, end_date: date) -> Decimal:
+        """
+        Суммирует расходы категории за период бинарным поиском по индексу
+        
+        Args:
+            category_key: ID категории или ALL_CATEGORIES
+            start_date: Начальная дата (включительно)
+            end_date: Конечная дата (включительно)
+        
+        Returns:
+            Сумма расходов
+        """
+        entry = self._get_expense_index().get(category_key)
+        if entry is None:
+            return Decimal('0.00')
+        
+        first = bisect_left(entry['dates'], start_date)
+        last = bisect_right(entry['dates'], end_date)
+        if first >= last:
+            return Decimal('0.00')
+        
+        if entry['prefix'] is not None:
+            total = entry['prefix'][last] - entry['prefix'][first]
+            return Decimal('0.00') + Decimal(total).scaleb(-2)
+        return self._sum_amounts(entry['transactions'][first:last])
     
     def calculate_budget_usage(self, budget: Budget, 
                               end_date: Optional[date] = None) -> Dict[str, Any]:
@@ -41,6 +130,15 @@ class BudgetCalculator:
         if end_date is None:
             end_date = date.today()
         
+        # Индекс проверяется до кэша: при смене транзакций он сбрасывает кэш
+        self._get_expense_index()
+        
+        # В ключ входят все поля бюджета, от которых зависит результат
+        cache_key = (budget.id, budget.name, budget.amount, budget.period,
+                     budget.category_id, budget.alert_threshold, end_date)
+        if cache_key in self._usage_cache:
+            return dict(self._usage_cache[cache_key])
+        
         # Определяем период для расчета
         period_start, period_end = self._get_budget_period(budget, end_date)
         
@@ -50,12 +148,12 @@ class BudgetCalculator:
         )
         
         # Рассчитываем процент использования
-        usage_percentage = (spent_amount / budget.amount * 100) if budget.amount > 0 else 0
+        usage_percentage = self._get_usage_percentage(budget, spent_amount)
         
         # Определяем статус бюджета
         status = self._get_budget_status(budget, spent_amount, usage_percentage)
         
-        return {
+        usage = {
             'budget_id': budget.id,
             'budget_name': budget.name,
             'budget_amount': float(budget.amount),
@@ -68,6 +166,8 @@ class BudgetCalculator:
             'is_over_budget': spent_amount > budget.amount,
             'is_near_limit': usage_percentage >= (budget.alert_threshold * 100)
         }
+        self._usage_cache[cache_key] = usage
+        return dict(usage)
     
     def get_all_budgets_status(self, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
         """
@@ -89,11 +189,40 @@ class BudgetCalculator:
         Args:
             end_date: Дата окончания расчета
         
+        Returns:
+            Список предупреждений
+        """
+        if end_date is None:
+            end_date = date.today()
+        
+        # Полный статус строится только для бюджетов, по которым будет предупреждение
+        alerting_status = []
+        for budget in self.budgets:
+            if not budget.is_active:
+                continue
+            
+            period_start, period_end = self._get_budget_period(budget, end_date)
+            spent_amount = self._calculate_spent_amount(budget, period_start, period_end)
+            usage_percentage = self._get_usage_percentage(budget, spent_amount)
+            if spent_amount <= budget.amount and usage_percentage < budget.alert_threshold * 100:
+                continue
+            
+            alerting_status.append(self.calculate_budget_usage(budget, end_date))
+        
+        return self.get_alerts_from_status(alerting_status)
+    
+    @staticmethod
+    def get_alerts_from_status(budgets_status: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Формирует предупреждения по уже рассчитанным статусам бюджетов
+        
+        Args:
+            budgets_status: Статусы бюджетов из get_all_budgets_status
+        
         Returns:
             Список предупреждений
         """
         alerts = []
-        budgets_status = self.get_all_budgets_status(end_date)
         
         for status in budgets_status:
             if status['is_over_budget']:
@@ -147,14 +276,20 @@ class BudgetCalculator:
             
             # Переходим к следующему периоду
             if period == BudgetPeriod.MONTHLY:
-                current_date = current_date.replace(day=1) + timedelta(days=32)
-                current_date = current_date.replace(day=1)
+                # Первое число следующего месяца
+                next_year, next_month = divmod(current_date.year * 12 + current_date.month, 12)
+                current_date = date(next_year, next_month + 1, 1)
             elif period == BudgetPeriod.WEEKLY:
                 current_date += timedelta(weeks=1)
             elif period == BudgetPeriod.DAILY:
                 current_date += timedelta(days=1)
             elif period == BudgetPeriod.YEARLY:
-                current_date = current_date.replace(year=current_date.year + 1)
+                # 29 февраля переходит в 28 февраля невисокосного года
+                next_year = current_date.year + 1
+                current_date = current_date.replace(
+                    year=next_year,
+                    day=min(current_date.day, calendar.monthrange(next_year, current_date.month)[1])
+                )
         
         # Рассчитываем среднее значение с небольшим запасом (10%)
         if period_count > 0:
@@ -168,10 +303,7 @@ class BudgetCalculator:
         """Определяет период бюджета"""
         if budget.period == BudgetPeriod.MONTHLY:
             period_start = end_date.replace(day=1)
-            if end_date.month == 12:
-                period_end = end_date.replace(year=end_date.year + 1, month=1, day=1) - timedelta(days=1)
-            else:
-                period_end = end_date.replace(month=end_date.month + 1, day=1) - timedelta(days=1)
+            period_end = end_date.replace(day=calendar.monthrange(end_date.year, end_date.month)[1])
         
         elif budget.period == BudgetPeriod.WEEKLY:
             # Находим начало недели (понедельник)
@@ -193,10 +325,7 @@ class BudgetCalculator:
         """Получает даты периода для заданной даты"""
         if period == BudgetPeriod.MONTHLY:
             period_start = reference_date.replace(day=1)
-            if reference_date.month == 12:
-                period_end = reference_date.replace(year=reference_date.year + 1, month=1, day=1) - timedelta(days=1)
-            else:
-                period_end = reference_date.replace(month=reference_date.month + 1, day=1) - timedelta(days=1)
+            period_end = reference_date.replace(day=calendar.monthrange(reference_date.year, reference_date.month)[1])
         
         elif period == BudgetPeriod.WEEKLY:
             days_since_monday = reference_date.weekday()
@@ -213,43 +342,38 @@ class BudgetCalculator:
         
         return period_start, period_end
     
-    def _calculate_spent_amount(self, budget: Budget, start_date: date, end_date: date) -> Decimal:
-        """Рассчитывает потраченную сумму по бюджету"""
-        spent_amount = Decimal('0.00')
+    @staticmethod
+    def _sum_amounts(transactions: List[Transaction]) -> Decimal:
+        """
+        Суммирует транзакции в целых копейках и переводит итог в Decimal
         
-        for transaction in self.transactions:
-            if not transaction.is_expense:
-                continue
-            
-            if not (start_date <= transaction.date.date() <= end_date):
-                continue
-            
-            # Если бюджет привязан к категории, учитываем только транзакции этой категории
-            if budget.category_id is not None and transaction.category_id != budget.category_id:
-                continue
-            
-            spent_amount += transaction.amount
+        Если сумма какой-либо транзакции не выражается точно в копейках,
+        используется сложение Decimal.
+        """
+        total = 0
+        for transaction in transactions:
+            cents = transaction.amount_cents
+            if cents is None:
+                return sum((t.amount for t in transactions), Decimal('0.00'))
+            total += cents
         
-        return spent_amount
+        return Decimal('0.00') + Decimal(total).scaleb(-2)
+    
+    def _calculate_spent_amount(self, budget: Budget, start_date: date, end_date: date) -> Decimal:
+        """Рассчитывает потраченную сумму по бюджету"""
+        # Если бюджет привязан к категории, учитываем только транзакции этой категории
+        category_key = ALL_CATEGORIES if budget.category_id is None else budget.category_id
+        return self._sum_expenses(category_key, start_date, end_date)
     
     def _calculate_spent_amount_by_category(self, category_id: int, 
                                           start_date: date, end_date: date) -> Decimal:
         """Рассчитывает потраченную сумму по категории за период"""
-        spent_amount = Decimal('0.00')
-        
-        for transaction in self.transactions:
-            if not transaction.is_expense:
-                continue
-            
-            if transaction.category_id != category_id:
-                continue
-            
-            if not (start_date <= transaction.date.date() <= end_date):
-                continue
-            
-            spent_amount += transaction.amount
-        
-        return spent_amount
+        return self._sum_expenses(category_id, start_date, end_date)
+    
+    @staticmethod
+    def _get_usage_percentage(budget: Budget, spent_amount: Decimal) -> Decimal:
+        """Рассчитывает процент использования бюджета"""
+        return (spent_amount / budget.amount * 100) if budget.amount > 0 else 0
     
     def _get_budget_status(self, budget: Budget, spent_amount: Decimal, 
                           usage_percentage: float) -> str:
@@ -2,11 +2,29 @@
 Калькулятор статистики
 """
 
+import calendar
+import copy
+from collections import OrderedDict
 from decimal import Decimal
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional, Tuple
-from collections import defaultdict
 from ..models.transaction import Transaction, TransactionType
+from .transaction_columns import build_transaction_columns, columns_to_decimal
+
+
+# Максимальное количество закэшированных результатов (старые вытесняются)
+RESULT_CACHE_SIZE = 512
+
+# Периоды дня для анализа трат: (название, начальный час включительно)
+TIME_PERIODS = (('night', 0), ('morning', 6), ('afternoon', 12), ('evening', 18), ('night', 22))
+
+# Диапазоны сумм транзакций для анализа трат
+AMOUNT_RANGES = {
+    'small': (0, 1000),
+    'medium': (1000, 5000),
+    'large': (5000, 20000),
+    'very_large': (20000, float('inf'))
+}
 
 
 class StatisticsCalculator:
@@ -16,10 +34,145 @@ class StatisticsCalculator:
     
     def __init__(self):
         self.transactions: List[Transaction] = []
+        # Кэш результатов по (метод, начальная дата, конечная дата)
+        self._cache: 'OrderedDict[Tuple[str, date, date], Dict[str, Any]]' = OrderedDict()
+        # Колоночное представление транзакций, индекс по дате и (список, длина),
+        # по которым они построены
+        self._columns: Optional[Dict[str, Any]] = None
+        self._columns_key: Optional[Tuple[List[Transaction], int]] = None
     
     def add_transactions(self, transactions: List[Transaction]) -> None:
         """Добавляет транзакции для расчета"""
         self.transactions.extend(transactions)
+        # Закэшированные результаты больше не соответствуют набору транзакций
+        self._cache.clear()
+        self._columns = None
+    
+    def _get_columns(self) -> Dict[str, Any]:
+        """
+        Строит (один раз) колоночное представление транзакций и индекс по дате
+        
+        К колонкам build_transaction_columns добавляются день недели
+        (weekday, понедельник = 0) и час (hour), позиции транзакций,
+        упорядоченные по дню (date_order), и сами отсортированные дни
+        (sorted_day) для бинарного поиска периода.
+        
+        Returns:
+            Словарь массивов NumPy
+        """
+        import numpy as np
+        
+        key = self._columns_key
+        if (self._columns is not None and key[0] is self.transactions
+                and key[1] == len(self.transactions)):
+            return self._columns
+        
+        columns = build_transaction_columns(self.transactions)
+        # 1970-01-01 - четверг
+        columns['weekday'] = ((columns['day'].astype(np.int64) + 3) % 7).astype(np.int8)
+        # Плотные коды категорий (номер ID в отсортированном списке ID)
+        columns['category_values'], columns['category_code'] = np.unique(
+            columns['category_id'], return_inverse=True
+        )
+        columns['hour'] = ((columns['timestamp'] - columns['day'].astype('datetime64[us]'))
+                           // np.timedelta64(1, 'h')).astype(np.int8)
+        columns['date_order'] = np.argsort(columns['day'], kind='stable')
+        columns['sorted_day'] = columns['day'][columns['date_order']]
+        
+        self._columns = columns
+        self._columns_key = (self.transactions, len(self.transactions))
+        # Результаты для прежнего набора транзакций недействительны
+        self._cache.clear()
+        return columns
+    
+    def _get_cached(self, cache_key: Tuple[str, date, date]) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает копию закэшированного результата и отмечает его как недавно
+        использованный
+        
+        Копия глубокая: вызывающий код (отчеты, интерфейс) может дополнять
+        результат, не меняя то, что получат следующие вызовы.
+        """
+        # Проверка колонок сбрасывает кэш, если список транзакций был заменен
+        self._get_columns()
+        result = self._cache.get(cache_key)
+        if result is None:
+            return None
+        self._cache.move_to_end(cache_key)
+        return copy.deepcopy(result)
+    
+    def _put_cached(self, cache_key: Tuple[str, date, date], result: Dict[str, Any]) -> None:
+        """Кэширует копию результата, вытесняя давно не использованные"""
+        self._cache[cache_key] = copy.deepcopy(result)
+        self._cache.move_to_end(cache_key)
+        if len(self._cache) > RESULT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
+    def _get_period_positions(self, columns: Dict[str, Any], start_date: date, end_date: date):
+        """
+        Возвращает позиции транзакций за период (включительно) без полного прохода
+        
+        Период находится бинарным поиском по отсортированным дням. Позиции
+        возвращаются в исходном порядке списка, поэтому порядок групп в
+        результатах расчетов не меняется.
+        
+        Args:
+            columns: Колонки из _get_columns
+            start_date: Начальная дата
+            end_date: Конечная дата
+        
+        Returns:
+            Массив позиций транзакций
+        """
+        import numpy as np
+        
+        sorted_day = columns['sorted_day']
+        first = np.searchsorted(sorted_day, np.datetime64(start_date, 'D'), side='left')
+        last = np.searchsorted(sorted_day, np.datetime64(end_date, 'D'), side='right')
+        return np.sort(columns['date_order'][first:last])
+    
+    @staticmethod
+    def _group_by_first_occurrence(keys):
+        """
+        Группирует значения в порядке их первого появления
+        
+        Args:
+            keys: Массив ключей
+        
+        Returns:
+            Кортеж (ключи групп, номер группы для каждого элемента)
+        """
+        import numpy as np
+        
+        # Небольшие неотрицательные ключи сортируются поразрядно (устойчивая
+        # сортировка 16-битных целых в NumPy - radix sort, O(N))
+        if keys.size and keys.min() >= 0 and keys.max() <= np.iinfo(np.uint16).max:
+            keys = keys.astype(np.uint16)
+        
+        # Устойчивая сортировка: первый элемент каждой серии - первое появление ключа
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        is_start = np.ones(len(keys), dtype=bool)
+        is_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        starts = np.flatnonzero(is_start)
+        
+        # Номер группы - по порядку первого появления
+        first_order = np.argsort(order[starts])
+        rank = np.empty_like(first_order)
+        rank[first_order] = np.arange(len(first_order))
+        
+        groups = np.empty(len(keys), dtype=np.int64)
+        groups[order] = np.repeat(rank, np.diff(np.append(starts, len(keys))))
+        return sorted_keys[starts][first_order], groups
+    
+    @staticmethod
+    def _sum_by_group(amounts, groups, group_count: int):
+        """Суммирует суммы по группам (точно: копейки int64 или Decimal)"""
+        import numpy as np
+        
+        totals = np.zeros(group_count, dtype=amounts.dtype)
+        np.add.at(totals, groups, amounts)
+        return totals
     
     def get_monthly_summary(self, year: int, month: int) -> Dict[str, Any]:
         """
@@ -33,10 +186,7 @@ class StatisticsCalculator:
             Словарь с месячной статистикой
         """
         start_date = date(year, month, 1)
-        if month == 12:
-            end_date = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = date(year, month + 1, 1) - timedelta(days=1)
+        end_date = date(year, month, calendar.monthrange(year, month)[1])
         
         return self._get_period_summary(start_date, end_date)
     
@@ -65,27 +215,49 @@ class StatisticsCalculator:
         Returns:
             Словарь с анализом трендов
         """
+        import numpy as np
+        
+        # Месяцы анализа: последние months календарных месяцев, включая
+        # текущий, каждый целиком
         end_date = date.today()
-        start_date = end_date - timedelta(days=months * 30)
+        month_count = max(months, 1)
+        first_month = np.datetime64(end_date, 'M') - (month_count - 1)
+        start_date = first_month.astype('datetime64[D]').item()
+        last_day = (first_month + month_count).astype('datetime64[D]') - 1
+        
+        # Доходы и расходы по месяцам за один проход: транзакции окна уже
+        # упорядочены по дню, границы месяцев находятся бинарным поиском, а
+        # суммы месяцев - разностями накопленных сумм
+        columns = self._get_columns()
+        sorted_day = columns['sorted_day']
+        first = np.searchsorted(sorted_day, np.datetime64(start_date, 'D'), side='left')
+        last = np.searchsorted(sorted_day, last_day, side='right')
+        order = columns['date_order'][first:last]
+        amounts = columns['amount'][order]
+        signs = columns['sign'][order]
+        
+        month_starts = (first_month + np.arange(month_count + 1)).astype('datetime64[D]')
+        bounds = np.searchsorted(sorted_day[first:last], month_starts, side='left')
+        
+        def sum_by_month(values):
+            cumulative = np.concatenate((np.zeros(1, dtype=values.dtype), np.cumsum(values)))
+            return cumulative[bounds[1:]] - cumulative[bounds[:-1]]
+        
+        income = sum_by_month(np.where(signs > 0, amounts, 0))
+        expenses = sum_by_month(np.where(signs < 0, amounts, 0))
         
         monthly_data = []
-        current_date = start_date.replace(day=1)
-        
-        while current_date <= end_date:
-            month_summary = self.get_monthly_summary(current_date.year, current_date.month)
+        for index in range(month_count):
+            month = (first_month + index).item()
+            month_income = columns_to_decimal(columns, income[index])
+            month_expenses = columns_to_decimal(columns, expenses[index])
             monthly_data.append({
-                'year': current_date.year,
-                'month': current_date.month,
-                'income': month_summary['total_income'],
-                'expenses': month_summary['total_expenses'],
-                'net_income': month_summary['net_income']
+                'year': month.year,
+                'month': month.month,
+                'income': float(month_income),
+                'expenses': float(month_expenses),
+                'net_income': float(month_income - month_expenses)
             })
-            
-            # Переходим к следующему месяцу
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
         
         # Рассчитываем тренды
         income_trend = self._calculate_trend([m['income'] for m in monthly_data])
@@ -118,35 +290,41 @@ class StatisticsCalculator:
         Returns:
             Словарь с анализом по категориям
         """
-        category_stats = defaultdict(lambda: {'income': Decimal('0.00'), 'expense': Decimal('0.00'), 'count': 0})
-        
-        for transaction in self.transactions:
-            if not (start_date <= transaction.date.date() <= end_date):
-                continue
-            
-            category_id = transaction.category_id or 'Без категории'
-            
-            if transaction.is_income:
-                category_stats[category_id]['income'] += transaction.amount
-            elif transaction.is_expense:
-                category_stats[category_id]['expense'] += transaction.amount
-            
-            category_stats[category_id]['count'] += 1
+        cache_key = ('category_analysis', start_date, end_date)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        import numpy as np
+        
+        columns = self._get_columns()
+        positions = self._get_period_positions(columns, start_date, end_date)
+        amounts = columns['amount'][positions]
+        signs = columns['sign'][positions]
+        
+        # Группировка по плотным кодам категорий; категория 0 - транзакции без категории
+        category_codes, groups = self._group_by_first_occurrence(columns['category_code'][positions])
+        category_ids = columns['category_values'][category_codes]
+        income = self._sum_by_group(amounts[signs > 0], groups[signs > 0], len(category_ids))
+        expense = self._sum_by_group(amounts[signs < 0], groups[signs < 0], len(category_ids))
+        counts = np.bincount(groups, minlength=len(category_ids))
         
         # Преобразуем в список и сортируем по расходам
         categories_list = []
-        for category_id, stats in category_stats.items():
+        for index, category_id in enumerate(category_ids.tolist()):
+            category_income = columns_to_decimal(columns, income[index])
+            category_expense = columns_to_decimal(columns, expense[index])
             categories_list.append({
-                'category_id': category_id,
-                'income': float(stats['income']),
-                'expense': float(stats['expense']),
-                'net': float(stats['income'] - stats['expense']),
-                'transaction_count': stats['count']
+                'category_id': category_id or 'Без категории',
+                'income': float(category_income),
+                'expense': float(category_expense),
+                'net': float(category_income - category_expense),
+                'transaction_count': int(counts[index])
             })
         
         categories_list.sort(key=lambda x: x['expense'], reverse=True)
         
-        return {
+        result = {
             'period': {
                 'start_date': start_date.isoformat(),
                 'end_date': end_date.isoformat()
@@ -155,6 +333,8 @@ class StatisticsCalculator:
             'top_expense_categories': categories_list[:5],
             'total_categories': len(categories_list)
         }
+        self._put_cached(cache_key, result)
+        return result
     
     def get_spending_patterns(self, days: int = 30) -> Dict[str, Any]:
         """
@@ -166,108 +346,126 @@ class StatisticsCalculator:
         Returns:
             Словарь с анализом паттернов
         """
+        import numpy as np
+        
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
         
-        # Анализ по дням недели
-        weekday_stats = defaultdict(lambda: {'amount': Decimal('0.00'), 'count': 0})
+        columns = self._get_columns()
+        positions = self._get_period_positions(columns, start_date, end_date)
+        positions = positions[columns['sign'][positions] < 0]
+        amounts = columns['amount'][positions]
+        
+        # Анализ по дням недели (название - только для встретившихся дней;
+        # calendar.day_name дает названия текущей локали, как strftime('%A'))
+        weekday_stats = self._get_group_stats(
+            columns, amounts, columns['weekday'][positions],
+            lambda weekday: calendar.day_name[weekday]
+        )
         
         # Анализ по времени дня
-        time_stats = defaultdict(lambda: {'amount': Decimal('0.00'), 'count': 0})
-        
-        # Анализ по размерам транзакций
-        amount_ranges = {
-            'small': (0, 1000),
-            'medium': (1000, 5000),
-            'large': (5000, 20000),
-            'very_large': (20000, float('inf'))
+        period_index = np.searchsorted([start for _, start in TIME_PERIODS], columns['hour'][positions],
+                                        side='right') - 1
+        time_stats = self._get_group_stats(
+            columns, amounts, period_index,
+            lambda index: TIME_PERIODS[index][0]
+        )
+        
+        # Анализ по размерам транзакций (отрицательные суммы не попадают ни в один диапазон)
+        if columns['in_cents']:
+            values = amounts / 100
+        else:
+            values = amounts.astype(np.float64)
+        bounds = [min_val for min_val, _ in AMOUNT_RANGES.values()]
+        range_index = np.searchsorted(bounds, values, side='right') - 1
+        in_range = range_index >= 0
+        range_totals = self._sum_by_group(amounts[in_range], range_index[in_range], len(AMOUNT_RANGES))
+        range_counts = np.bincount(range_index[in_range], minlength=len(AMOUNT_RANGES))
+        amount_stats = {
+            range_name: {
+                'amount': columns_to_decimal(columns, range_totals[index]),
+                'count': int(range_counts[index])
+            }
+            for index, range_name in enumerate(AMOUNT_RANGES)
         }
-        amount_stats = {range_name: {'amount': Decimal('0.00'), 'count': 0} 
-                       for range_name in amount_ranges}
-        
-        for transaction in self.transactions:
-            if not (start_date <= transaction.date.date() <= end_date):
-                continue
-            
-            if not transaction.is_expense:
-                continue
-            
-            # Анализ по дням недели
-            weekday = transaction.date.strftime('%A')
-            weekday_stats[weekday]['amount'] += transaction.amount
-            weekday_stats[weekday]['count'] += 1
-            
-            # Анализ по времени дня
-            hour = transaction.date.hour
-            if 6 <= hour < 12:
-                time_period = 'morning'
-            elif 12 <= hour < 18:
-                time_period = 'afternoon'
-            elif 18 <= hour < 22:
-                time_period = 'evening'
-            else:
-                time_period = 'night'
-            
-            time_stats[time_period]['amount'] += transaction.amount
-            time_stats[time_period]['count'] += 1
-            
-            # Анализ по размерам транзакций
-            amount = float(transaction.amount)
-            for range_name, (min_val, max_val) in amount_ranges.items():
-                if min_val <= amount < max_val:
-                    amount_stats[range_name]['amount'] += transaction.amount
-                    amount_stats[range_name]['count'] += 1
-                    break
+        amount_total = sum(stats['amount'] for stats in amount_stats.values())
         
         return {
             'period_days': days,
-            'weekday_analysis': {
-                weekday: {
-                    'amount': float(stats['amount']),
-                    'count': stats['count'],
-                    'average': float(stats['amount'] / stats['count']) if stats['count'] > 0 else 0
-                }
-                for weekday, stats in weekday_stats.items()
-            },
-            'time_analysis': {
-                time_period: {
-                    'amount': float(stats['amount']),
-                    'count': stats['count'],
-                    'average': float(stats['amount'] / stats['count']) if stats['count'] > 0 else 0
-                }
-                for time_period, stats in time_stats.items()
-            },
+            'weekday_analysis': self._format_group_stats(weekday_stats),
+            'time_analysis': self._format_group_stats(time_stats),
             'amount_analysis': {
                 range_name: {
                     'amount': float(stats['amount']),
                     'count': stats['count'],
-                    'percentage': float(stats['amount'] / sum(s['amount'] for s in amount_stats.values()) * 100) 
-                                 if sum(s['amount'] for s in amount_stats.values()) > 0 else 0
+                    'percentage': float(stats['amount'] / amount_total * 100) if amount_total > 0 else 0
                 }
                 for range_name, stats in amount_stats.items()
             }
         }
     
+    @staticmethod
+    def _format_group_stats(group_stats: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Формирует сумму, количество и среднее по группам для результата"""
+        return {
+            name: {
+                'amount': float(stats['amount']),
+                'count': stats['count'],
+                'average': float(stats['amount'] / stats['count']) if stats['count'] > 0 else 0
+            }
+            for name, stats in group_stats.items()
+        }
+    
+    def _get_group_stats(self, columns: Dict[str, Any], amounts, keys,
+                         get_name) -> Dict[str, Dict[str, Any]]:
+        """
+        Суммирует суммы и количество транзакций по группам
+        
+        Группы с одинаковым названием объединяются; порядок групп - порядок
+        первого появления.
+        
+        Args:
+            columns: Колонки из _get_columns
+            amounts: Суммы транзакций
+            keys: Ключ группы для каждой транзакции
+            get_name: Функция, возвращающая название группы по ключу
+        
+        Returns:
+            Словарь {название: {'amount': Decimal, 'count': int}}
+        """
+        import numpy as np
+        
+        group_keys, groups = self._group_by_first_occurrence(keys)
+        totals = self._sum_by_group(amounts, groups, len(group_keys))
+        counts = np.bincount(groups, minlength=len(group_keys))
+        
+        stats = {}
+        for index, key in enumerate(group_keys.tolist()):
+            name = get_name(key)
+            group = stats.setdefault(name, {'amount': Decimal('0.00'), 'count': 0})
+            group['amount'] += columns_to_decimal(columns, totals[index])
+            group['count'] += int(counts[index])
+        return stats
+    
     def _get_period_summary(self, start_date: date, end_date: date) -> Dict[str, Any]:
         """Получает сводку за период"""
-        total_income = Decimal('0.00')
-        total_expenses = Decimal('0.00')
-        transaction_count = 0
-        
-        for transaction in self.transactions:
-            if not (start_date <= transaction.date.date() <= end_date):
-                continue
-            
-            if transaction.is_income:
-                total_income += transaction.amount
-            elif transaction.is_expense:
-                total_expenses += transaction.amount
-            
-            transaction_count += 1
+        cache_key = ('period_summary', start_date, end_date)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        columns = self._get_columns()
+        positions = self._get_period_positions(columns, start_date, end_date)
+        amounts = columns['amount'][positions]
+        signs = columns['sign'][positions]
+        
+        total_income = columns_to_decimal(columns, amounts[signs > 0].sum())
+        total_expenses = columns_to_decimal(columns, amounts[signs < 0].sum())
+        transaction_count = len(positions)
         
         net_income = total_income - total_expenses
         
-        return {
+        result = {
             'period': {
                 'start_date': start_date.isoformat(),
                 'end_date': end_date.isoformat()
@@ -278,21 +476,23 @@ class StatisticsCalculator:
             'transaction_count': transaction_count,
             'average_transaction': float((total_income + total_expenses) / transaction_count) if transaction_count > 0 else 0
         }
+        self._put_cached(cache_key, result)
+        return result
     
-    def _calculate_trend(self, values: List[float]) -> Dict[str, Any]:
+    @staticmethod
+    def _calculate_trend(values: List[float]) -> Dict[str, Any]:
         """Рассчитывает тренд для списка значений"""
         if len(values) < 2:
             return {'direction': 'stable', 'percentage': 0.0, 'slope': 0.0}
         
-        # Простой линейный тренд
+        # Простой линейный тренд по точкам x = 0..n-1
         n = len(values)
-        x = list(range(n))
         
-        # Рассчитываем наклон
-        sum_x = sum(x)
+        # Рассчитываем наклон; суммы по x известны в замкнутом виде
+        sum_x = n * (n - 1) // 2
         sum_y = sum(values)
-        sum_xy = sum(x[i] * values[i] for i in range(n))
-        sum_x2 = sum(xi * xi for xi in x)
+        sum_xy = sum(i * value for i, value in enumerate(values))
+        sum_x2 = (n - 1) * n * (2 * n - 1) // 6
         
         if n * sum_x2 - sum_x * sum_x == 0:
             slope = 0
@@ -0,0 +1,61 @@
+"""
+Колоночное представление транзакций для калькуляторов
+"""
+
+from decimal import Decimal
+from typing import List, Dict, Any
+from ..models.transaction import Transaction, TransactionType
+
+
+def build_transaction_columns(transactions: List[Transaction]) -> Dict[str, Any]:
+    """
+    Строит колоночное представление транзакций в массивах NumPy
+    
+    Суммы хранятся в целых копейках (int64), если все они точно выражаются
+    в копейках, иначе - массивом Decimal. В обоих случаях суммирование
+    точное и совпадает с поэлементным сложением Decimal.
+    
+    Args:
+        transactions: Список транзакций
+    
+    Returns:
+        Словарь массивов amount, timestamp, day, sign, account_id,
+        category_id и флаг in_cents
+    """
+    # NumPy импортируется только при первом расчете, а не при импорте модуля
+    import numpy as np
+    
+    count = len(transactions)
+    
+    cents = [t.amount_cents for t in transactions]
+    in_cents = None not in cents
+    if in_cents:
+        amount = np.fromiter(cents, dtype=np.int64, count=count)
+    else:
+        amount = np.empty(count, dtype=object)
+        amount[:] = [t.amount for t in transactions]
+    
+    # Знак: доходы увеличивают баланс, расходы уменьшают, переводы не влияют
+    sign_by_type = {TransactionType.INCOME: 1, TransactionType.EXPENSE: -1}
+    timestamps = np.array([t.date for t in transactions], dtype='datetime64[us]')
+    
+    return {
+        'amount': amount,
+        'in_cents': in_cents,
+        'timestamp': timestamps,
+        'day': timestamps.astype('datetime64[D]'),
+        'sign': np.fromiter((sign_by_type.get(t.transaction_type, 0) for t in transactions),
+                            dtype=np.int8, count=count),
+        # Отсутствующие счет и категория кодируются как -1 и 0
+        'account_id': np.fromiter((-1 if t.account_id is None else t.account_id
+                                   for t in transactions), dtype=np.int64, count=count),
+        'category_id': np.fromiter((t.category_id or 0 for t in transactions),
+                                   dtype=np.int64, count=count)
+    }
+
+
+def columns_to_decimal(columns: Dict[str, Any], total) -> Decimal:
+    """Переводит сумму из колоночного представления в Decimal"""
+    if columns['in_cents']:
+        total = Decimal(int(total)).scaleb(-2)
+    return Decimal('0.00') + total
@@ -0,0 +1,9 @@
+"""
+Общие параметры моделей данных
+"""
+
+import sys
+
+# Параметры @dataclass для моделей: без __dict__ у экземпляров там, где
+# dataclass поддерживает slots (Python 3.10+)
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
@@ -7,6 +7,7 @@ from decimal import Decimal
 from typing import Optional
 from dataclasses import dataclass
 from enum import Enum
+from .base import DATACLASS_OPTIONS
 
 
 class BudgetPeriod(Enum):
@@ -17,7 +18,7 @@ class BudgetPeriod(Enum):
     YEARLY = "yearly"
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Budget:
     """
     Модель бюджета
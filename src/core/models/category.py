@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Optional, List
 from dataclasses import dataclass
 from enum import Enum
+from .base import DATACLASS_OPTIONS
 
 
 class CategoryType(Enum):
@@ -15,7 +16,7 @@ class CategoryType(Enum):
     BOTH = "both"
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Category:
     """
     Модель категории для транзакций
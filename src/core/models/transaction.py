@@ -4,9 +4,10 @@
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
-from dataclasses import dataclass
+from typing import Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
+from .base import DATACLASS_OPTIONS
 
 
 class TransactionType(Enum):
@@ -16,7 +17,7 @@ class TransactionType(Enum):
     TRANSFER = "transfer"
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Transaction:
     """
     Модель финансовой транзакции
@@ -31,6 +32,10 @@ class Transaction:
     tags: list = None
     created_at: datetime = None
     updated_at: datetime = None
+    # Кэш amount_cents: (сумма, для которой он вычислен, копейки)
+    _amount_cents: Optional[Tuple[Decimal, Optional[int]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     def __post_init__(self):
         if self.date is None:
@@ -57,6 +62,26 @@ class Transaction:
         """Проверяет, является ли транзакция переводом"""
         return self.transaction_type == TransactionType.TRANSFER
     
+    @property
+    def amount_cents(self) -> Optional[int]:
+        """
+        Сумма транзакции в целых копейках
+        
+        Значение кэшируется до изменения amount, поэтому повторные агрегации
+        складывают int, а не Decimal.
+        
+        Returns:
+            Сумма в копейках или None, если сумма не выражается точно в копейках
+        """
+        cached = self._amount_cents
+        if cached is not None and cached[0] is self.amount:
+            return cached[1]
+        
+        cents = Decimal(self.amount).scaleb(2)
+        value = int(cents) if cents == cents.to_integral_value() else None
+        self._amount_cents = (self.amount, value)
+        return value
+    
     def to_dict(self) -> dict:
         """Преобразует транзакцию в словарь"""
         return {
@@ -5,9 +5,10 @@
 from datetime import datetime
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
+from .base import DATACLASS_OPTIONS
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class User:
     """
     Модель пользователя
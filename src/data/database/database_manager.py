@@ -4,12 +4,19 @@
 
 import sqlite3
 import os
+import threading
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from contextlib import contextmanager
 from datetime import datetime
 
-from ...config.settings import get_settings
+from ...config.settings import APP_CONFIG, get_settings
+
+# Версия схемы базы данных: увеличивается при любом изменении таблиц или индексов
+SCHEMA_VERSION = 1
+
+# Суффикс файла-маркера, который записывается рядом с базой после полной инициализации
+SCHEMA_MARKER_SUFFIX = ".schema"
 
 
 class DatabaseManager:
@@ -29,8 +36,63 @@ class DatabaseManager:
             db_path = settings.database_path
         
         self.db_path = db_path
+        
+        # Соединение открывается один раз на поток и переиспользуется всеми
+        # запросами вместо подключения к файлу базы на каждый запрос. Поток
+        # хранит соединение, глубину вложенности get_connection и поколение,
+        # в котором соединение открыто; close() начинает новое поколение
+        self._local = threading.local()
+        self._generation = 0
+        
+        # Счетчик изменений данных через этот менеджер: сервисы сравнивают его,
+        # чтобы понять, не устарели ли их кэши
+        self.data_version = 0
+        
         self._ensure_database_directory()
-        self._initialize_database()
+        
+        # Если маркер схемы актуален, таблицы и индексы уже созданы.
+        # Иначе устаревший маркер удаляется до создания таблиц: его заново
+        # запишет DatabaseInitializer после создания данных по умолчанию
+        if not self.is_schema_current():
+            self.invalidate_schema_marker()
+            self._initialize_database()
+    
+    @property
+    def schema_marker_path(self) -> str:
+        """Путь к файлу-маркеру версии схемы"""
+        return f"{self.db_path}{SCHEMA_MARKER_SUFFIX}"
+    
+    @staticmethod
+    def get_schema_marker() -> str:
+        """Содержимое маркера: версия схемы и версия приложения"""
+        return f"{SCHEMA_VERSION}:{APP_CONFIG['version']}"
+    
+    def is_schema_current(self) -> bool:
+        """
+        Проверяет, что база данных уже полностью инициализирована текущей версией
+        
+        Returns:
+            True если файл базы существует и маркер схемы совпадает с текущим
+        """
+        if not os.path.exists(self.db_path):
+            return False
+        try:
+            with open(self.schema_marker_path, encoding='utf-8') as f:
+                return f.read().strip() == self.get_schema_marker()
+        except OSError:
+            return False
+    
+    def write_schema_marker(self) -> None:
+        """Записывает маркер текущей версии схемы"""
+        with open(self.schema_marker_path, 'w', encoding='utf-8') as f:
+            f.write(self.get_schema_marker())
+    
+    def invalidate_schema_marker(self) -> None:
+        """Удаляет маркер схемы, чтобы при следующем запуске инициализация выполнилась заново"""
+        try:
+            os.remove(self.schema_marker_path)
+        except FileNotFoundError:
+            pass
     
     def _ensure_database_directory(self) -> None:
         """Создает директорию для базы данных если она не существует"""
@@ -43,20 +105,63 @@ class DatabaseManager:
             self._create_tables(conn)
             self._create_indexes(conn)
     
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает новое соединение с базой данных"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row  # Для доступа к колонкам по имени
+        # WAL: запись не блокирует чтение из других соединений и процессов
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+    
     @contextmanager
     def get_connection(self):
         """
         Контекстный менеджер для получения соединения с базой данных
         
+        Соединение текущего потока открывается при первом обращении и
+        переиспользуется. Незафиксированные изменения откатываются при выходе
+        из внешнего блока, как это происходило бы при закрытии соединения;
+        вложенный вызов (например, один сервис внутри записи другого) не
+        откатывает работу внешнего.
+        
         Yields:
             sqlite3.Connection: Соединение с базой данных
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Для доступа к колонкам по имени
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        conn = getattr(local, 'conn', None)
+        if depth == 0:
+            # После close() соединение закрывает и открывает заново его же поток
+            if conn is not None and local.generation != self._generation:
+                conn.close()
+                conn = None
+            if conn is None:
+                conn = local.conn = self._connect()
+                local.generation = self._generation
+        
+        local.depth = depth + 1
         try:
             yield conn
         finally:
+            local.depth = depth
+            if depth == 0 and conn.in_transaction:
+                conn.rollback()
+    
+    def close(self) -> None:
+        """
+        Закрывает соединения с базой данных
+        
+        Соединение текущего потока закрывается сразу, если оно не используется.
+        Соединения других потоков закрываются ими самими при следующем
+        обращении (или вместе с потоком): соединение SQLite нельзя закрывать
+        из чужого потока.
+        """
+        self._generation += 1
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is not None and getattr(local, 'depth', 0) == 0:
             conn.close()
+            local.conn = None
     
     def _create_tables(self, conn: sqlite3.Connection) -> None:
         """Создает таблицы в базе данных"""
@@ -181,6 +286,33 @@ class DatabaseManager:
             cursor = conn.execute(query, params)
             return cursor.fetchall()
     
+    def iter_query(self, query: str, params: tuple = (),
+                   batch_size: int = 1000) -> Iterator[sqlite3.Row]:
+        """
+        Выполняет SELECT запрос и отдает строки по мере чтения
+        
+        Строки выбираются из курсора пачками по batch_size, поэтому в памяти
+        одновременно находится не больше одной пачки.
+        
+        Args:
+            query: SQL запрос
+            params: Параметры запроса
+            batch_size: Количество строк, читаемых из курсора за раз
+        
+        Yields:
+            Строки результата
+        """
+        with self.get_connection() as conn:
+            cursor = conn.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                cursor.close()
+    
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """
         Выполняет INSERT/UPDATE/DELETE запрос
@@ -195,6 +327,7 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.execute(query, params)
             conn.commit()
+            self.data_version += 1
             return cursor.lastrowid or cursor.rowcount
     
     def execute_many(self, query: str, params_list: List[tuple]) -> int:
@@ -211,6 +344,7 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.executemany(query, params_list)
             conn.commit()
+            self.data_version += 1
             return cursor.rowcount
     
     def get_table_info(self, table_name: str) -> List[sqlite3.Row]:
@@ -249,8 +383,13 @@ class DatabaseManager:
             True если резервная копия создана успешно
         """
         try:
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
+            # Backup API копирует и изменения, еще не перенесенные из WAL в файл базы
+            backup_conn = sqlite3.connect(backup_path)
+            try:
+                with self.get_connection() as conn:
+                    conn.backup(backup_conn)
+            finally:
+                backup_conn.close()
             return True
         except Exception as e:
             print(f"Ошибка при создании резервной копии: {e}")
@@ -267,8 +406,20 @@ class DatabaseManager:
             True если восстановление прошло успешно
         """
         try:
-            import shutil
-            shutil.copy2(backup_path, self.db_path)
+            # Резервная копия записывается в базу через Backup API, а не копированием
+            # файла: файлы -wal и -shm остаются согласованными с базой, а открытые
+            # соединения других потоков сразу видят восстановленные данные
+            source_conn = sqlite3.connect(backup_path)
+            try:
+                with self.get_connection() as conn:
+                    source_conn.backup(conn)
+                    # Переносим WAL в файл базы и обрезаем его
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                source_conn.close()
+            self.data_version += 1
+            # Резервная копия может быть создана другой версией схемы
+            self.invalidate_schema_marker()
             return True
         except Exception as e:
             print(f"Ошибка при восстановлении базы данных: {e}")
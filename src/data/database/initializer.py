@@ -2,6 +2,7 @@
 Инициализатор базы данных
 """
 
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 from .database_manager import DatabaseManager
@@ -21,10 +22,29 @@ class DatabaseInitializer:
             db_path: Путь к файлу базы данных
         """
         self.db_manager = DatabaseManager(db_path)
-        self.transaction_service = TransactionService(self.db_manager)
-        self.category_service = CategoryService(self.db_manager)
-        self.budget_service = BudgetService(self.db_manager)
-        self.user_service = UserService(self.db_manager)
+    
+    # Сервисы создаются при первом обращении, чтобы команды, которым
+    # нужен один сервис, не создавали остальные
+    
+    @cached_property
+    def transaction_service(self) -> TransactionService:
+        """Сервис транзакций"""
+        return TransactionService(self.db_manager)
+    
+    @cached_property
+    def category_service(self) -> CategoryService:
+        """Сервис категорий"""
+        return CategoryService(self.db_manager)
+    
+    @cached_property
+    def budget_service(self) -> BudgetService:
+        """Сервис бюджетов"""
+        return BudgetService(self.db_manager)
+    
+    @cached_property
+    def user_service(self) -> UserService:
+        """Сервис пользователей"""
+        return UserService(self.db_manager)
     
     def initialize_database(self, create_default_data: bool = True) -> bool:
         """
@@ -39,8 +59,13 @@ class DatabaseInitializer:
         try:
             # База данных уже создана в DatabaseManager.__init__
             
+            # Маркер схемы совпадает: таблицы и данные по умолчанию уже созданы
+            if self.db_manager.is_schema_current():
+                return True
+            
             if create_default_data:
                 self._create_default_data()
+                self.db_manager.write_schema_marker()
             
             return True
         
@@ -141,8 +166,10 @@ class DatabaseInitializer:
                 conn.execute("DROP TABLE IF EXISTS users")
                 conn.commit()
             
-            # Пересоздаем таблицы
+            # Пересоздаем таблицы; данные по умолчанию создадутся при следующей инициализации
+            self.db_manager.invalidate_schema_marker()
             self.db_manager._initialize_database()
+            self.db_manager.data_version += 1
             
             print("✅ База данных сброшена")
             return True
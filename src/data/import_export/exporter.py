@@ -21,6 +21,12 @@ from ...core.models.budget import Budget
 from ...core.calculators import StatisticsCalculator, BalanceCalculator
 
 
+# Колонки CSV экспорта до форматирования дат ('_ts' заменяется на 'Дата' и 'Время')
+CSV_EXPORT_COLUMNS = (
+    'ID', '_ts', 'Тип', 'Сумма', 'Категория', 'Описание', 'Теги', 'Создано', 'Обновлено'
+)
+
+
 class DataExporter:
     """
     Класс для экспорта данных в различные форматы
@@ -58,31 +64,39 @@ class DataExporter:
         if categories:
             category_dict = {cat.id: cat for cat in categories}
         
-        # Подготавливаем данные
-        data = []
-        for transaction in transactions:
-            category_name = "Без категории"
-            if transaction.category_id and transaction.category_id in category_dict:
-                category_name = category_dict[transaction.category_id].name
-            
-            data.append({
-                'ID': transaction.id,
-                'Дата': transaction.date.strftime('%d.%m.%Y'),
-                'Время': transaction.date.strftime('%H:%M:%S'),
-                'Тип': transaction.transaction_type.value,
-                'Сумма': float(transaction.amount),
-                'Категория': category_name,
-                'Описание': transaction.description or '',
-                'Теги': ', '.join(transaction.tags) if transaction.tags else '',
-                'Создано': transaction.created_at.strftime('%d.%m.%Y %H:%M:%S'),
-                'Обновлено': transaction.updated_at.strftime('%d.%m.%Y %H:%M:%S')
-            })
+        # Подготавливаем записи кортежами; даты остаются datetime
+        # и форматируются ниже одним векторным вызовом
+        records = (
+            (
+                transaction.id,
+                transaction.date,
+                transaction.transaction_type.value,
+                float(transaction.amount),
+                category_dict[transaction.category_id].name
+                if transaction.category_id and transaction.category_id in category_dict
+                else "Без категории",
+                transaction.description or '',
+                ', '.join(transaction.tags) if transaction.tags else '',
+                transaction.created_at,
+                transaction.updated_at
+            )
+            for transaction in transactions
+        )
         
         # Создаем DataFrame
-        df = pd.DataFrame(data)
+        df = pd.DataFrame.from_records(records, columns=CSV_EXPORT_COLUMNS, nrows=len(transactions))
+        for column in ('_ts', 'Создано', 'Обновлено'):
+            df[column] = pd.to_datetime(df[column], cache=True)
+        
+        # Сортируем по дате (новые сначала) по исходному datetime, а не по строке
+        df = df.sort_values('_ts', ascending=False, kind='stable')
         
-        # Сортируем по дате (новые сначала)
-        df = df.sort_values('Дата', ascending=False)
+        # Форматируем даты в C-коде pandas вместо strftime на каждую строку
+        df.insert(1, 'Дата', df['_ts'].dt.strftime('%d.%m.%Y'))
+        df.insert(2, 'Время', df['_ts'].dt.strftime('%H:%M:%S'))
+        df['Создано'] = df['Создано'].dt.strftime('%d.%m.%Y %H:%M:%S')
+        df['Обновлено'] = df['Обновлено'].dt.strftime('%d.%m.%Y %H:%M:%S')
+        df = df.drop(columns='_ts')
         
         # Генерируем имя файла
         if not filename:
@@ -427,19 +441,18 @@ class DataExporter:
             # Группируем транзакции по категориям
             category_stats = {}
             for transaction in transactions:
-                category_name = "Без категории"
-                if transaction.category_id and transaction.category_id in category_dict:
-                    category_name = category_dict[transaction.category_id].name
+                category = category_dict.get(transaction.category_id) if transaction.category_id else None
+                category_name = category.name if category else "Без категории"
                 
-                if category_name not in category_stats:
-                    category_stats[category_name] = {'income': 0, 'expenses': 0, 'count': 0}
+                # Один поиск по словарю на транзакцию
+                stats = category_stats.setdefault(category_name, {'income': 0, 'expenses': 0, 'count': 0})
                 
                 if transaction.transaction_type == TransactionType.INCOME:
-                    category_stats[category_name]['income'] += float(transaction.amount)
+                    stats['income'] += float(transaction.amount)
                 else:
-                    category_stats[category_name]['expenses'] += float(transaction.amount)
+                    stats['expenses'] += float(transaction.amount)
                 
-                category_stats[category_name]['count'] += 1
+                stats['count'] += 1
             
             # Создаем таблицу по категориям
             category_data = [['Категория', 'Доходы', 'Расходы', 'Чистый результат', 'Количество']]
@@ -15,6 +15,10 @@ from ...core.models.category import Category, CategoryType
 from ...services import TransactionService, CategoryService
 
 
+# Количество транзакций, сохраняемых одним пакетом (одной транзакцией базы)
+IMPORT_BATCH_SIZE = 1000
+
+
 class DataImporter:
     """
     Класс для импорта данных из различных форматов
@@ -73,6 +77,11 @@ class DataImporter:
             categories = category_service.get_categories()
             category_dict = {cat.name.lower(): cat.id for cat in categories}
             
+            # Новые транзакции сохраняются пакетно после обработки всех строк;
+            # для каждой запоминается номер строки файла
+            new_transactions = []
+            new_rows = []
+            
             # Обрабатываем каждую строку
             for index, row in df.iterrows():
                 try:
@@ -151,14 +160,16 @@ class DataImporter:
                         date=transaction_date
                     )
                     
-                    # Сохраняем транзакцию
-                    transaction_service.create_transaction(transaction)
-                    results['imported'] += 1
+                    new_transactions.append(transaction)
+                    new_rows.append(index + 2)
                     
                 except Exception as e:
                     results['errors'] += 1
                     results['error_details'].append(f"Строка {index + 2}: {str(e)}")
                     continue
+            
+            # Сохраняем транзакции пакетами вместо вставки и коммита на каждую строку
+            self._save_transactions(new_transactions, new_rows, transaction_service, results)
         
         except Exception as e:
             raise Exception(f"Ошибка при чтении файла: {str(e)}")
@@ -212,6 +223,11 @@ class DataImporter:
             categories = category_service.get_categories()
             category_dict = {cat.name.lower(): cat.id for cat in categories}
             
+            # Новые транзакции сохраняются пакетно после обработки всех строк;
+            # для каждой запоминается номер строки файла
+            new_transactions = []
+            new_rows = []
+            
             # Обрабатываем каждую строку
             for index, row in df.iterrows():
                 try:
@@ -289,14 +305,16 @@ class DataImporter:
                         date=transaction_date
                     )
                     
-                    # Сохраняем транзакцию
-                    transaction_service.create_transaction(transaction)
-                    results['imported'] += 1
+                    new_transactions.append(transaction)
+                    new_rows.append(index + 2)
                     
                 except Exception as e:
                     results['errors'] += 1
                     results['error_details'].append(f"Строка {index + 2}: {str(e)}")
                     continue
+            
+            # Сохраняем транзакции пакетами вместо вставки и коммита на каждую строку
+            self._save_transactions(new_transactions, new_rows, transaction_service, results)
         
         except Exception as e:
             raise Exception(f"Ошибка при чтении файла: {str(e)}")
@@ -373,6 +391,11 @@ class DataImporter:
             categories = category_service.get_categories()
             category_dict = {cat.name.lower(): cat.id for cat in categories}
             
+            # Новые транзакции сохраняются пакетно после обработки всех строк;
+            # для каждой запоминается номер строки файла
+            new_transactions = []
+            new_rows = []
+            
             # Обрабатываем каждую строку
             for index, row in df.iterrows():
                 try:
@@ -429,20 +452,49 @@ class DataImporter:
                         date=transaction_date
                     )
                     
-                    # Сохраняем транзакцию
-                    transaction_service.create_transaction(transaction)
-                    results['imported'] += 1
+                    new_transactions.append(transaction)
+                    new_rows.append(index + 2)
                     
                 except Exception as e:
                     results['errors'] += 1
                     results['error_details'].append(f"Строка {index + 2}: {str(e)}")
                     continue
+            
+            # Сохраняем транзакции пакетами вместо вставки и коммита на каждую строку
+            self._save_transactions(new_transactions, new_rows, transaction_service, results)
         
         except Exception as e:
             raise Exception(f"Ошибка при чтении файла: {str(e)}")
         
         return results
     
+    def _save_transactions(self, transactions: List[Transaction], rows: List[int],
+                           transaction_service: TransactionService,
+                           results: Dict[str, Any]) -> None:
+        """
+        Сохраняет транзакции пакетами по IMPORT_BATCH_SIZE
+        
+        Пакет сохраняется целиком или не сохраняется вовсе. Ошибка пакета
+        учитывается в results как ошибки его строк, а уже сохраненные пакеты
+        остаются в results['imported'], поэтому частичный импорт виден.
+        
+        Args:
+            transactions: Транзакции для сохранения
+            rows: Номера строк файла для каждой транзакции
+            transaction_service: Сервис транзакций
+            results: Словарь с результатами импорта
+        """
+        for start in range(0, len(transactions), IMPORT_BATCH_SIZE):
+            batch = transactions[start:start + IMPORT_BATCH_SIZE]
+            batch_rows = rows[start:start + IMPORT_BATCH_SIZE]
+            try:
+                results['imported'] += transaction_service.bulk_create_transactions(batch)
+            except Exception as e:
+                results['errors'] += len(batch)
+                results['error_details'].append(
+                    f"Строки {batch_rows[0]}-{batch_rows[-1]}: транзакции не сохранены: {str(e)}"
+                )
+    
     def _auto_categorize(self, description: str, category_dict: Dict[str, int], 
                         transaction_type: TransactionType) -> Optional[int]:
         """
@@ -2,15 +2,19 @@
 Сервис для работы с бюджетами
 """
 
+import time
 from datetime import datetime, date
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from ..core.models.budget import Budget, BudgetPeriod
 from ..core.models.transaction import TransactionType
 from ..data.database.database_manager import DatabaseManager
 from ..data.database.models import BudgetModel
 from ..core.calculators.budget_calculator import BudgetCalculator
 
+# Время жизни кэша статусов бюджетов в секундах
+BUDGET_STATUS_CACHE_TTL = 10
+
 
 class BudgetService:
     """
@@ -27,6 +31,10 @@ class BudgetService:
         self.db = db_manager
         self.model = BudgetModel()
         self.calculator = BudgetCalculator()
+        
+        # Кэш статусов бюджетов: end_date -> (версия данных, время истечения, статусы).
+        # Запись устаревает по TTL или после любого изменения данных через db_manager
+        self._status_cache: Dict[Optional[date], Tuple[int, float, List[Dict[str, Any]]]] = {}
     
     def create_budget(self, budget: Budget) -> Budget:
         """
@@ -208,6 +216,10 @@ class BudgetService:
         Returns:
             Список статусов бюджетов
         """
+        cached = self._status_cache.get(end_date)
+        if cached and cached[0] == self.db.data_version and cached[1] > time.monotonic():
+            return [dict(status) for status in cached[2]]
+        
         active_budgets = self.get_active_budgets()
         if not active_budgets:
             return []
@@ -219,7 +231,12 @@ class BudgetService:
         self.calculator.budgets = active_budgets
         self.calculator.transactions = all_transactions
         
-        return self.calculator.get_all_budgets_status(end_date)
+        budgets_status = self.calculator.get_all_budgets_status(end_date)
+        self._status_cache[end_date] = (
+            self.db.data_version, time.monotonic() + BUDGET_STATUS_CACHE_TTL, budgets_status
+        )
+        # Вызывающий код получает свои копии статусов, а не общие словари кэша
+        return [dict(status) for status in budgets_status]
     
     def get_budget_alerts(self, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
         """
@@ -231,18 +248,25 @@ class BudgetService:
         Returns:
             Список предупреждений
         """
-        active_budgets = self.get_active_budgets()
-        if not active_budgets:
-            return []
+        # Предупреждения строятся из (возможно, закэшированных) статусов бюджетов
+        return self.calculator.get_alerts_from_status(self.get_all_budgets_status(end_date))
+    
+    def get_budgets_status_with_alerts(self, end_date: Optional[date] = None
+                                       ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Получает статус активных бюджетов и предупреждения по ним за один проход
         
-        # Получаем все транзакции для расчета
-        all_transactions = self._get_all_transactions()
+        Бюджеты и транзакции загружаются и обсчитываются один раз, а
+        предупреждения строятся из уже рассчитанных статусов.
         
-        # Настраиваем калькулятор
-        self.calculator.budgets = active_budgets
-        self.calculator.transactions = all_transactions
+        Args:
+            end_date: Дата окончания расчета
         
-        return self.calculator.get_budget_alerts(end_date)
+        Returns:
+            Кортеж (список статусов бюджетов, список предупреждений)
+        """
+        budgets_status = self.get_all_budgets_status(end_date)
+        return budgets_status, self.calculator.get_alerts_from_status(budgets_status)
     
     def suggest_budget_amount(self, category_id: int, period: BudgetPeriod,
                              historical_months: int = 3) -> Decimal:
@@ -3,11 +3,15 @@
 """
 
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Tuple
 from ..core.models.category import Category, CategoryType
+from ..core.models.transaction import Transaction
 from ..data.database.database_manager import DatabaseManager
 from ..data.database.models import CategoryModel
 
+# Максимальное количество параметров в одном IN (...) с запасом до лимита SQLite
+MAX_IN_PARAMS = 500
+
 
 class CategoryService:
     """
@@ -23,6 +27,11 @@ class CategoryService:
         """
         self.db = db_manager
         self.model = CategoryModel()
+        
+        # Кэш результатов поиска по строке запроса: {запрос: (версия данных, категории)}.
+        # Версия данных базы меняется при любой записи, в том числе через другие
+        # сервисы, а также при сбросе и восстановлении базы
+        self._search_cache: Dict[str, Tuple[int, List[Category]]] = {}
     
     def create_category(self, category: Category) -> Category:
         """
@@ -171,6 +180,29 @@ class CategoryService:
         rows = self.db.execute_query(query, tuple(params))
         return [self.model.from_db_row(dict(row)) for row in rows]
     
+    def get_categories_for_transactions(self, transactions: Iterable[Transaction]) -> List[Category]:
+        """
+        Получает только категории, на которые ссылаются транзакции
+        
+        Args:
+            transactions: Транзакции
+        
+        Returns:
+            Список категорий, отсортированный по названию
+        """
+        category_ids = sorted({t.category_id for t in transactions if t.category_id})
+        
+        categories = []
+        for i in range(0, len(category_ids), MAX_IN_PARAMS):
+            chunk = category_ids[i:i + MAX_IN_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            query = f"{self.model.get_select_query()} WHERE id IN ({placeholders})"
+            rows = self.db.execute_query(query, tuple(chunk))
+            categories.extend(self.model.from_db_row(dict(row)) for row in rows)
+        
+        categories.sort(key=lambda category: category.name)
+        return categories
+    
     def get_child_categories(self, parent_id: int) -> List[Category]:
         """
         Получает дочерние категории
@@ -261,15 +293,21 @@ class CategoryService:
         Returns:
             Список найденных категорий
         """
-        query = f"""
-            {self.model.get_select_query()}
-            WHERE name LIKE ? OR description LIKE ?
-            ORDER BY name ASC
-        """
-        search_pattern = f"%{search_term}%"
-        rows = self.db.execute_query(query, (search_pattern, search_pattern))
-        
-        return [self.model.from_db_row(dict(row)) for row in rows]
+        cached = self._search_cache.get(search_term)
+        if cached is None or cached[0] != self.db.data_version:
+            query = f"""
+                {self.model.get_select_query()}
+                WHERE name LIKE ? OR description LIKE ?
+                ORDER BY name ASC
+            """
+            search_pattern = f"%{search_term}%"
+            rows = self.db.execute_query(query, (search_pattern, search_pattern))
+            cached = self._search_cache[search_term] = (
+                self.db.data_version, [self.model.from_db_row(dict(row)) for row in rows]
+            )
+        
+        # Возвращаем копию списка, чтобы вызывающий код не изменил кэш
+        return list(cached[1])
     
     def get_category_usage_stats(self, category_id: int) -> Dict[str, Any]:
         """
@@ -2,9 +2,10 @@
 Сервис для работы с транзакциями
 """
 
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple
 from ..core.models.transaction import Transaction, TransactionType
 from ..data.database.database_manager import DatabaseManager
 from ..data.database.models import TransactionModel
@@ -38,12 +39,54 @@ class TransactionService:
         transaction.created_at = datetime.now()
         transaction.updated_at = datetime.now()
         
-        data = self.model.to_db_dict(transaction)
-        # Убираем ID из данных для вставки
-        data.pop('id', None)
+        query = self.model.get_insert_query()
+        params = self._get_insert_params(transaction)
+        
+        transaction_id = self.db.execute_update(query, params)
+        transaction.id = transaction_id
+        
+        return transaction
+    
+    def bulk_create_transactions(self, transactions: Iterable[Transaction],
+                                 batch_size: int = 1000) -> int:
+        """
+        Создает транзакции пакетами
+        
+        Каждый пакет вставляется одним executemany с одним коммитом вместо
+        запроса и коммита на каждую транзакцию. ID созданным транзакциям
+        не присваиваются.
         
+        Args:
+            transactions: Транзакции для создания
+            batch_size: Количество транзакций в пакете
+        
+        Returns:
+            Количество созданных транзакций
+        """
         query = self.model.get_insert_query()
-        params = (
+        now = datetime.now()
+        created_count = 0
+        
+        iterator = iter(transactions)
+        while True:
+            batch = []
+            for transaction in islice(iterator, batch_size):
+                transaction.created_at = now
+                transaction.updated_at = now
+                batch.append(self._get_insert_params(transaction))
+            
+            if not batch:
+                break
+            
+            self.db.execute_many(query, batch)
+            created_count += len(batch)
+        
+        return created_count
+    
+    def _get_insert_params(self, transaction: Transaction) -> Tuple:
+        """Параметры запроса вставки транзакции (без ID)"""
+        data = self.model.to_db_dict(transaction)
+        return (
             data['amount'],
             data['transaction_type'],
             data['category_id'],
@@ -54,11 +97,6 @@ class TransactionService:
             data['created_at'],
             data['updated_at']
         )
-        
-        transaction_id = self.db.execute_update(query, params)
-        transaction.id = transaction_id
-        
-        return transaction
     
     def get_transaction(self, transaction_id: int) -> Optional[Transaction]:
         """
@@ -143,6 +181,54 @@ class TransactionService:
         Returns:
             Список транзакций
         """
+        query, params = self._build_transactions_query(
+            start_date, end_date, transaction_type, category_id, account_id, limit, offset
+        )
+        rows = self.db.execute_query(query, params)
+        return [self.model.from_db_row(dict(row)) for row in rows]
+    
+    def iter_transactions(self,
+                          start_date: Optional[date] = None,
+                          end_date: Optional[date] = None,
+                          transaction_type: Optional[TransactionType] = None,
+                          category_id: Optional[int] = None,
+                          account_id: Optional[int] = None,
+                          limit: Optional[int] = None,
+                          batch_size: int = 1000) -> Iterator[Transaction]:
+        """
+        Отдает транзакции с фильтрацией по мере чтения из базы
+        
+        В отличие от get_transactions не строит весь список: в памяти
+        находится не больше batch_size строк. Подходит для однопроходной
+        обработки.
+        
+        Args:
+            start_date: Начальная дата
+            end_date: Конечная дата
+            transaction_type: Тип транзакции
+            category_id: ID категории
+            account_id: ID счета
+            limit: Максимальное количество записей
+            batch_size: Количество строк, читаемых из базы за раз
+        
+        Yields:
+            Транзакции в порядке get_transactions
+        """
+        query, params = self._build_transactions_query(
+            start_date, end_date, transaction_type, category_id, account_id, limit
+        )
+        for row in self.db.iter_query(query, params, batch_size):
+            yield self.model.from_db_row(dict(row))
+    
+    def _build_transactions_query(self,
+                                  start_date: Optional[date] = None,
+                                  end_date: Optional[date] = None,
+                                  transaction_type: Optional[TransactionType] = None,
+                                  category_id: Optional[int] = None,
+                                  account_id: Optional[int] = None,
+                                  limit: Optional[int] = None,
+                                  offset: int = 0) -> Tuple[str, tuple]:
+        """Строит запрос выборки транзакций с фильтрами и его параметры"""
         query = self.model.get_select_query()
         conditions = []
         params = []
@@ -175,8 +261,7 @@ class TransactionService:
         if limit:
             query += f" LIMIT {limit} OFFSET {offset}"
         
-        rows = self.db.execute_query(query, tuple(params))
-        return [self.model.from_db_row(dict(row)) for row in rows]
+        return query, tuple(params)
     
     def get_transactions_by_category(self, category_id: int, 
                                    start_date: Optional[date] = None,
@@ -324,6 +409,87 @@ class TransactionService:
         expenses = self.get_total_expenses(start_date, end_date)
         return income - expenses
     
+    def sum_signed(self, end_date: Optional[date] = None) -> Decimal:
+        """
+        Получает баланс одним агрегирующим запросом: доходы минус расходы,
+        переводы не учитываются
+        
+        Суммирование идет в целых копейках, поэтому результат точный
+        и совпадает с BalanceCalculator.calculate_balance.
+        
+        Args:
+            end_date: Дата окончания расчета включительно (если None, то текущая дата)
+        
+        Returns:
+            Баланс
+        """
+        if end_date is None:
+            end_date = date.today()
+        
+        # Даты хранятся вместе со временем, поэтому граница берется по следующему дню
+        query = """
+            SELECT SUM(CASE transaction_type
+                           WHEN 'income' THEN CAST(ROUND(amount * 100) AS INTEGER)
+                           WHEN 'expense' THEN -CAST(ROUND(amount * 100) AS INTEGER)
+                           ELSE 0
+                       END) as total_cents
+            FROM transactions
+            WHERE date < ?
+        """
+        rows = self.db.execute_query(query, ((end_date + timedelta(days=1)).isoformat(),))
+        
+        total_cents = rows[0]['total_cents'] if rows and rows[0]['total_cents'] else 0
+        return Decimal('0.00') + Decimal(total_cents).scaleb(-2)
+    
+    def get_period_summary(self, start_date: date, end_date: date) -> Dict[str, Any]:
+        """
+        Получает сводку за период одним агрегирующим запросом
+        
+        Формат результата совпадает со StatisticsCalculator._get_period_summary,
+        но транзакции не загружаются в Python: суммы считаются в базе
+        в целых копейках.
+        
+        Args:
+            start_date: Начальная дата
+            end_date: Конечная дата включительно
+        
+        Returns:
+            Словарь с доходами, расходами, чистым доходом, количеством
+            транзакций и средней транзакцией
+        """
+        query = """
+            SELECT
+                SUM(CASE WHEN transaction_type = 'income'
+                         THEN CAST(ROUND(amount * 100) AS INTEGER) ELSE 0 END) as income_cents,
+                SUM(CASE WHEN transaction_type = 'expense'
+                         THEN CAST(ROUND(amount * 100) AS INTEGER) ELSE 0 END) as expense_cents,
+                COUNT(*) as transaction_count
+            FROM transactions
+            WHERE date >= ? AND date < ?
+        """
+        rows = self.db.execute_query(
+            query, (start_date.isoformat(), (end_date + timedelta(days=1)).isoformat())
+        )
+        
+        # Агрегат без GROUP BY всегда возвращает ровно одну строку
+        row = rows[0]
+        # Сложение с Decimal('0.00') нормализует ноль: '0.00', а не '0E-2'
+        total_income = Decimal('0.00') + Decimal(row['income_cents'] or 0).scaleb(-2)
+        total_expenses = Decimal('0.00') + Decimal(row['expense_cents'] or 0).scaleb(-2)
+        transaction_count = row['transaction_count']
+        
+        return {
+            'period': {
+                'start_date': start_date.isoformat(),
+                'end_date': end_date.isoformat()
+            },
+            'total_income': float(total_income),
+            'total_expenses': float(total_expenses),
+            'net_income': float(total_income - total_expenses),
+            'transaction_count': transaction_count,
+            'average_transaction': float((total_income + total_expenses) / transaction_count) if transaction_count > 0 else 0
+        }
+    
     def search_transactions(self, search_term: str, limit: int = 50) -> List[Transaction]:
         """
         Поиск транзакций по описанию
@@ -307,10 +307,13 @@ class DashboardWidget:
             month_start = today.replace(day=1)
             category_analysis = self.statistics_calculator.get_category_analysis(month_start, today)
             
+            # Загружаем все категории одним запросом вместо запроса на каждую строку
+            category_dict = {cat.id: cat for cat in self.services['category_service'].get_categories()}
+            
             # Добавляем данные в таблицу
             for category_data in category_analysis['categories']:
                 category_id = category_data['category_id']
-                category = self.services['category_service'].get_category(category_id)
+                category = category_dict.get(category_id)
                 
                 category_name = category.name if category else f"ID: {category_id}"
                 category_type = "💰" if category_data['income'] > 0 else "💸"
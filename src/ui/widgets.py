@@ -100,12 +100,15 @@ class TransactionTable:
             # Получаем транзакции
             transactions = self.services['transaction_service'].get_transactions(limit=100)
             
+            # Загружаем все категории одним запросом вместо запроса на каждую строку
+            category_dict = {cat.id: cat for cat in self.services['category_service'].get_categories()}
+            
             # Добавляем транзакции в таблицу
             for transaction in transactions:
                 # Получаем категорию
                 category_name = "Без категории"
                 if transaction.category_id:
-                    category = self.services['category_service'].get_category(transaction.category_id)
+                    category = category_dict.get(transaction.category_id)
                     if category:
                         category_name = category.name
                 
@@ -495,6 +498,9 @@ class BudgetList:
             # Получаем статус бюджетов
             budgets_status = self.services['budget_service'].get_all_budgets_status()
             
+            # Загружаем все категории одним запросом вместо запроса на каждую строку
+            category_dict = {cat.id: cat for cat in self.services['category_service'].get_categories()}
+            
             # Добавляем бюджеты в таблицу
             for budget_status in budgets_status:
                 # Определяем статус
@@ -510,7 +516,7 @@ class BudgetList:
                 if budget_status['budget_id']:
                     budget = self.services['budget_service'].get_budget(budget_status['budget_id'])
                     if budget and budget.category_id:
-                        category = self.services['category_service'].get_category(budget.category_id)
+                        category = category_dict.get(budget.category_id)
                         if category:
                             category_name = category.name
                 
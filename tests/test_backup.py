@@ -0,0 +1,145 @@
+"""
+Тесты для резервного копирования файлов данных (docker/backup/backup.py)
+"""
+
+import os
+import time
+import shutil
+import datetime
+import contextlib
+import pytest
+from pathlib import Path
+
+
+BACKUP_SCRIPT_DIR = Path(__file__).resolve().parent.parent / 'docker' / 'backup'
+
+# Возраст, после которого cleanup_old_backups считает файл устаревшим
+EXPIRED_AGE_SECONDS = 40 * 86400
+
+
+@contextlib.contextmanager
+def plain_reader(backup_file):
+    """Читает архив, записанный без сжатия"""
+    with open(backup_file, 'rb') as f:
+        yield f
+
+
+@pytest.fixture(params=['plain', 'zstd'])
+def backup(request, monkeypatch, tmp_path):
+    """
+    Модуль backup, у которого /app указывает во временную директорию
+    
+    В режиме plain вместо zstd используется cat, поэтому логика манифестов,
+    цепочек и восстановления проверяется и там, где zstd не установлен.
+    """
+    pytest.importorskip('psycopg2')
+    if request.param == 'zstd' and shutil.which('zstd') is None:
+        pytest.skip("zstd не установлен")
+    
+    monkeypatch.syspath_prepend(str(BACKUP_SCRIPT_DIR))
+    import backup as backup_module
+    
+    real_path = backup_module.Path
+    monkeypatch.setattr(backup_module, 'Path',
+                        lambda path: real_path(str(path).replace('/app', str(tmp_path), 1)))
+    if request.param == 'plain':
+        monkeypatch.setattr(backup_module, '_get_compress_command', lambda: ['cat'])
+        monkeypatch.setattr(backup_module, '_decompressed_reader', plain_reader)
+    return backup_module
+
+
+def wait_next_second():
+    """Ждет смены секунды: имя архива содержит время с точностью до секунды"""
+    time.sleep(1 - time.time() % 1 + 0.01)
+
+
+def expire(path):
+    """Делает файл старше срока хранения резервных копий"""
+    old = time.time() - EXPIRED_AGE_SECONDS
+    os.utime(path, (old, old))
+
+
+class TestDataBackupRoundTrip:
+    """Тесты цепочки: полная копия -> инкрементальная -> очистка -> восстановление"""
+    
+    def test_backup_incremental_cleanup_restore(self, backup, tmp_path):
+        """Тест восстановления из инкрементальной копии после очистки"""
+        data_dir = tmp_path / 'data'
+        (data_dir / 'nested').mkdir(parents=True)
+        (data_dir / 'unchanged.txt').write_text('без изменений')
+        (data_dir / 'nested' / 'changed.txt').write_text('версия 1')
+        backup_dir = tmp_path / 'backups'
+        
+        full = backup.backup_data_files()
+        assert full is not None
+        
+        wait_next_second()
+        (data_dir / 'nested' / 'changed.txt').write_text('версия 2')
+        (data_dir / 'added.txt').write_text('новый файл')
+        incremental = backup.backup_data_files()
+        assert incremental is not None and incremental != full
+        
+        manifest = backup._read_manifest(incremental)
+        assert manifest['files']['unchanged.txt'][2] == full.name
+        assert manifest['files'][os.path.join('nested', 'changed.txt')][2] == incremental.name
+        
+        # Полная копия устарела, но на нее ссылается инкрементальная - она остается
+        for path in backup_dir.iterdir():
+            if path.name.startswith(full.name):
+                expire(path)
+        backup.cleanup_old_backups()
+        assert full.exists()
+        assert (backup_dir / backup.MANIFEST_STATE_NAME).exists()
+        
+        restore_dir = tmp_path / 'restore'
+        backup.restore_data_files(incremental, restore_dir)
+        assert (restore_dir / 'data' / 'unchanged.txt').read_text() == 'без изменений'
+        assert (restore_dir / 'data' / 'nested' / 'changed.txt').read_text() == 'версия 2'
+        assert (restore_dir / 'data' / 'added.txt').read_text() == 'новый файл'
+    
+    def test_cleanup_removes_unreferenced_chain(self, backup, tmp_path):
+        """Тест удаления устаревшей цепочки, замененной новой полной копией"""
+        (tmp_path / 'data').mkdir()
+        (tmp_path / 'data' / 'file.txt').write_text('данные')
+        backup_dir = tmp_path / 'backups'
+        
+        old_full = backup.backup_data_files()
+        
+        # Без манифеста следующая копия будет полной и не сошлется на старую
+        (backup_dir / backup.MANIFEST_STATE_NAME).unlink()
+        wait_next_second()
+        new_full = backup.backup_data_files()
+        
+        for path in backup_dir.iterdir():
+            if path.name.startswith(old_full.name):
+                expire(path)
+        backup.cleanup_old_backups()
+        
+        assert not old_full.exists()
+        assert new_full.exists()
+        assert (backup_dir / backup.MANIFEST_STATE_NAME).exists()
+
+
+class TestNeedsFullBackup:
+    """Тесты выбора между полной и инкрементальной копией"""
+    
+    def test_full_backup_conditions(self, backup, tmp_path):
+        """Тест условий, при которых нужна полная копия"""
+        (tmp_path / 'archive.tar.zst').touch()
+        now = datetime.datetime.now()
+        fresh = {'full_backup_at': now.isoformat(),
+                 'files': {'file.txt': [1, 1, 'archive.tar.zst']}}
+        
+        assert backup._needs_full_backup(None, tmp_path)
+        assert not backup._needs_full_backup(fresh, tmp_path)
+        
+        expired = dict(fresh, full_backup_at=(
+            now - datetime.timedelta(days=backup.FULL_BACKUP_INTERVAL_DAYS + 1)).isoformat())
+        assert backup._needs_full_backup(expired, tmp_path)
+        
+        missing = dict(fresh, files={'file.txt': [1, 1, 'missing.tar.zst']})
+        assert backup._needs_full_backup(missing, tmp_path)
+        
+        legacy = dict(fresh, files={'file.txt': [1, 1, 'archive.tar.gz']})
+        (tmp_path / 'archive.tar.gz').touch()
+        assert backup._needs_full_backup(legacy, tmp_path)
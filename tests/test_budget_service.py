@@ -0,0 +1,60 @@
+"""
+Тесты для кэша статусов бюджетов в BudgetService
+"""
+
+import pytest
+from datetime import datetime, date
+from decimal import Decimal
+
+from src.core.models.budget import Budget, BudgetPeriod
+from src.core.models.transaction import Transaction, TransactionType
+from src.data.database.database_manager import DatabaseManager
+from src.services import BudgetService, TransactionService
+
+
+END_DATE = date(2024, 1, 31)
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Менеджер временной базы"""
+    db_manager = DatabaseManager(str(tmp_path / 'finance.db'))
+    yield db_manager
+    db_manager.close()
+
+
+@pytest.fixture
+def budget_service(db_manager):
+    """Сервис бюджетов с одним месячным бюджетом"""
+    service = BudgetService(db_manager)
+    service.create_budget(Budget(name="Бюджет на месяц", amount=Decimal('1000.00'),
+                                 period=BudgetPeriod.MONTHLY, start_date=date(2024, 1, 1)))
+    return service
+
+
+class TestBudgetStatusCache:
+    """Тесты кэша get_all_budgets_status"""
+    
+    def test_write_through_other_service_invalidates_cache(self, db_manager, budget_service):
+        """Тест сброса кэша после записи транзакции через другой сервис"""
+        assert budget_service.get_all_budgets_status(END_DATE)[0]['spent_amount'] == 0
+        
+        TransactionService(db_manager).create_transaction(Transaction(
+            amount=Decimal('250.00'), transaction_type=TransactionType.EXPENSE,
+            date=datetime(2024, 1, 15, 12, 0)
+        ))
+        
+        assert budget_service.get_all_budgets_status(END_DATE)[0]['spent_amount'] == 250.0
+    
+    def test_callers_get_independent_statuses(self, budget_service):
+        """Тест независимости статусов, возвращаемых разным вызывающим"""
+        first = budget_service.get_all_budgets_status(END_DATE)
+        first[0]['spent_amount'] = '0,00 ₽'
+        first.clear()
+        
+        second = budget_service.get_all_budgets_status(END_DATE)
+        second[0]['status'] = 'formatted'
+        
+        third = budget_service.get_all_budgets_status(END_DATE)
+        assert third[0]['spent_amount'] == 0
+        assert third[0]['status'] == 'normal'
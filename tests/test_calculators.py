@@ -0,0 +1,271 @@
+"""
+Тесты для калькуляторов: результаты сверяются с прямым суммированием Decimal
+"""
+
+import random
+import pytest
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+
+from src.core.models.transaction import Transaction, TransactionType
+from src.core.models.budget import Budget, BudgetPeriod
+from src.core.calculators.balance_calculator import BalanceCalculator
+from src.core.calculators import budget_calculator
+from src.core.calculators.budget_calculator import BudgetCalculator
+from src.core.calculators import statistics_calculator
+from src.core.calculators.statistics_calculator import StatisticsCalculator
+
+
+START_DATE = date(2024, 1, 1)
+END_DATE = date(2024, 3, 31)
+CATEGORY_IDS = (None, 1, 2, 3)
+
+
+def make_transactions(count=300, seed=42, sub_cent=False):
+    """Создает воспроизводимый набор транзакций за первый квартал 2024 года"""
+    rng = random.Random(seed)
+    transactions = []
+    for index in range(count):
+        amount = Decimal(rng.randint(1, 500_000)).scaleb(-2)
+        if sub_cent and index % 7 == 0:
+            amount += Decimal('0.005')
+        transactions.append(Transaction(
+            id=index + 1,
+            amount=amount,
+            transaction_type=rng.choice(list(TransactionType)),
+            category_id=rng.choice(CATEGORY_IDS),
+            date=datetime(2024, 1, 1, rng.randint(0, 23), rng.randint(0, 59))
+                 + timedelta(days=rng.randint(0, 90)),
+            account_id=rng.choice((1, 2))
+        ))
+    return transactions
+
+
+def reference_sum(transactions, transaction_type, start_date, end_date, category_id=None):
+    """Сумма транзакций типа за период простым циклом по Decimal"""
+    total = Decimal('0.00')
+    for transaction in transactions:
+        if transaction.transaction_type != transaction_type:
+            continue
+        if not (start_date <= transaction.date.date() <= end_date):
+            continue
+        if category_id is not None and transaction.category_id != category_id:
+            continue
+        total += transaction.amount
+    return total
+
+
+def reference_balance(transactions, end_date, account_id=None):
+    """Баланс на дату простым циклом по Decimal"""
+    balance = Decimal('0.00')
+    for transaction in transactions:
+        if transaction.date.date() > end_date:
+            continue
+        if account_id is not None and transaction.account_id != account_id:
+            continue
+        if transaction.is_income:
+            balance += transaction.amount
+        elif transaction.is_expense:
+            balance -= transaction.amount
+    return balance
+
+
+@pytest.fixture(params=[False, True], ids=['cents', 'sub_cent'])
+def transactions(request):
+    """Транзакции в целых копейках и с суммами точнее копейки"""
+    return make_transactions(sub_cent=request.param)
+
+
+class TestBalanceCalculator:
+    """Тесты для BalanceCalculator"""
+    
+    def test_balance_matches_decimal_loop(self, transactions):
+        """Тест баланса на разные даты и по счетам"""
+        calculator = BalanceCalculator()
+        calculator.add_transactions(transactions)
+        
+        for end_date in (START_DATE - timedelta(days=1), START_DATE, date(2024, 2, 15), END_DATE):
+            for account_id in (None, 1, 2):
+                assert calculator.calculate_balance(account_id, end_date) == \
+                    reference_balance(transactions, end_date, account_id)
+    
+    def test_income_and_expenses_match_decimal_loop(self, transactions):
+        """Тест доходов и расходов за период по категориям"""
+        calculator = BalanceCalculator()
+        calculator.add_transactions(transactions)
+        start_date, end_date = date(2024, 1, 10), date(2024, 2, 20)
+        
+        for category_id in CATEGORY_IDS:
+            assert calculator.calculate_income(start_date, end_date, category_id) == \
+                reference_sum(transactions, TransactionType.INCOME, start_date, end_date, category_id)
+            assert calculator.calculate_expenses(start_date, end_date, category_id) == \
+                reference_sum(transactions, TransactionType.EXPENSE, start_date, end_date, category_id)
+    
+    def test_snapshot_matches_decimal_loop(self, transactions):
+        """Тест сводки баланса и показателей за период"""
+        calculator = BalanceCalculator()
+        calculator.add_transactions(transactions)
+        
+        income = reference_sum(transactions, TransactionType.INCOME, START_DATE, END_DATE)
+        expenses = reference_sum(transactions, TransactionType.EXPENSE, START_DATE, END_DATE)
+        snapshot = calculator.snapshot(START_DATE, END_DATE)
+        
+        assert snapshot['balance'] == reference_balance(transactions, END_DATE)
+        assert snapshot['income'] == income
+        assert snapshot['expenses'] == expenses
+        assert snapshot['net_income'] == income - expenses
+    
+    def test_empty_calculator(self):
+        """Тест калькулятора без транзакций"""
+        calculator = BalanceCalculator()
+        
+        assert str(calculator.calculate_balance(end_date=END_DATE)) == '0.00'
+        assert str(calculator.calculate_income(START_DATE, END_DATE)) == '0.00'
+        assert str(calculator.calculate_expenses(START_DATE, END_DATE)) == '0.00'
+
+
+class TestBudgetCalculator:
+    """Тесты для BudgetCalculator"""
+    
+    def test_spent_amount_matches_decimal_loop(self, transactions):
+        """Тест потраченной суммы по бюджетам разных периодов"""
+        calculator = BudgetCalculator()
+        calculator.add_transactions(transactions)
+        end_date = date(2024, 2, 14)
+        
+        for budget_id, (period, category_id) in enumerate(
+            [(period, category_id) for period in BudgetPeriod for category_id in (None, 1, 2)], start=1
+        ):
+            budget = Budget(id=budget_id, name=f"Бюджет {budget_id}", category_id=category_id,
+                            amount=Decimal('10000.00'), period=period)
+            usage = calculator.calculate_budget_usage(budget, end_date)
+            
+            period_start = date.fromisoformat(usage['period_start'])
+            period_end = date.fromisoformat(usage['period_end'])
+            spent = reference_sum(transactions, TransactionType.EXPENSE,
+                                  period_start, period_end, category_id)
+            
+            assert usage['spent_amount'] == float(spent)
+            assert usage['remaining_amount'] == float(budget.amount - spent)
+            assert usage['is_over_budget'] == (spent > budget.amount)
+
+    
+    def test_suggest_yearly_budget_from_29_february(self, monkeypatch):
+        """Тест годового шага окна анализа, начинающегося 29 февраля"""
+        class FixedDate(date):
+            @classmethod
+            def today(cls):
+                # 720 дней назад - 29 февраля 2024 года
+                return cls(2026, 2, 18)
+        
+        monkeypatch.setattr(budget_calculator, 'date', FixedDate)
+        calculator = BudgetCalculator()
+        calculator.add_transactions([
+            Transaction(amount=Decimal('100.00'), transaction_type=TransactionType.EXPENSE,
+                        category_id=1, date=datetime(2024, 6, 1)),
+            Transaction(amount=Decimal('300.00'), transaction_type=TransactionType.EXPENSE,
+                        category_id=1, date=datetime(2025, 2, 28)),
+        ])
+        
+        # Окно: 2024 и 2025 годы (шаг 29.02.2024 -> 28.02.2025), среднее 200 + 10%
+        suggested = calculator.suggest_budget_amount(1, BudgetPeriod.YEARLY, historical_months=24)
+        
+        assert suggested == Decimal('220.00')
+
+class TestStatisticsCalculator:
+    """Тесты для StatisticsCalculator"""
+    
+    def test_monthly_summary_matches_decimal_loop(self, transactions):
+        """Тест месячных сводок"""
+        calculator = StatisticsCalculator()
+        calculator.add_transactions(transactions)
+        
+        for month in (1, 2, 3):
+            start_date = date(2024, month, 1)
+            end_date = (start_date + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+            income = reference_sum(transactions, TransactionType.INCOME, start_date, end_date)
+            expenses = reference_sum(transactions, TransactionType.EXPENSE, start_date, end_date)
+            count = sum(1 for t in transactions if start_date <= t.date.date() <= end_date)
+            
+            summary = calculator.get_monthly_summary(2024, month)
+            
+            assert summary['total_income'] == float(income)
+            assert summary['total_expenses'] == float(expenses)
+            assert summary['net_income'] == float(income - expenses)
+            assert summary['transaction_count'] == count
+            assert summary['average_transaction'] == float((income + expenses) / count)
+    
+    def test_category_analysis_matches_decimal_loop(self, transactions):
+        """Тест анализа по категориям"""
+        calculator = StatisticsCalculator()
+        calculator.add_transactions(transactions)
+        
+        analysis = calculator.get_category_analysis(START_DATE, END_DATE)
+        categories = {item['category_id']: item for item in analysis['categories']}
+        
+        assert set(categories) == {category_id or 'Без категории' for category_id in CATEGORY_IDS}
+        for category_id in CATEGORY_IDS:
+            in_category = [t for t in transactions if t.category_id == category_id]
+            income = reference_sum(in_category, TransactionType.INCOME, START_DATE, END_DATE)
+            expense = reference_sum(in_category, TransactionType.EXPENSE, START_DATE, END_DATE)
+            item = categories[category_id or 'Без категории']
+            
+            assert item['income'] == float(income)
+            assert item['expense'] == float(expense)
+            assert item['net'] == float(income - expense)
+            assert item['transaction_count'] == len(in_category)
+    
+    def test_empty_summary(self):
+        """Тест сводки без транзакций"""
+        calculator = StatisticsCalculator()
+        
+        summary = calculator.get_monthly_summary(2024, 1)
+        
+        assert summary['total_income'] == 0
+        assert summary['total_expenses'] == 0
+        assert summary['transaction_count'] == 0
+        assert summary['average_transaction'] == 0
+    
+    def test_cached_results_are_not_shared(self, transactions):
+        """Тест независимости закэшированных результатов от изменений вызывающего кода"""
+        calculator = StatisticsCalculator()
+        calculator.add_transactions(transactions)
+        
+        first = calculator.get_category_analysis(START_DATE, END_DATE)
+        second = calculator.get_category_analysis(START_DATE, END_DATE)
+        first['total_categories'] = 'CORRUPTED'
+        first['categories'][0]['income'] = 'CORRUPTED'
+        second['period']['start_date'] = 'CORRUPTED'
+        
+        again = calculator.get_category_analysis(START_DATE, END_DATE)
+        assert again['total_categories'] == len(CATEGORY_IDS)
+        assert again['categories'][0]['income'] != 'CORRUPTED'
+        assert again['period']['start_date'] == START_DATE.isoformat()
+    
+    def test_trend_analysis_uses_whole_calendar_months(self, monkeypatch):
+        """Тест окна анализа трендов из целых календарных месяцев"""
+        class FixedDate(date):
+            @classmethod
+            def today(cls):
+                return cls(2024, 3, 15)
+        
+        monkeypatch.setattr(statistics_calculator, 'date', FixedDate)
+        calculator = StatisticsCalculator()
+        calculator.add_transactions([
+            Transaction(amount=Decimal(amount), transaction_type=transaction_type, date=when)
+            for amount, transaction_type, when in (
+                ('1.00', TransactionType.INCOME, datetime(2023, 12, 31, 23, 59)),
+                ('100.00', TransactionType.INCOME, datetime(2024, 1, 1, 0, 0)),
+                ('50.25', TransactionType.EXPENSE, datetime(2024, 2, 29, 12, 0)),
+                ('10.00', TransactionType.INCOME, datetime(2024, 3, 31, 23, 59)),
+                ('7.00', TransactionType.EXPENSE, datetime(2024, 4, 1, 0, 0)),
+            )
+        ])
+        
+        monthly_data = calculator.get_trend_analysis(months=3)['monthly_data']
+        
+        assert [(m['year'], m['month'], m['income'], m['expenses']) for m in monthly_data] == [
+            (2024, 1, 100.0, 0.0),
+            (2024, 2, 0.0, 50.25),
+            (2024, 3, 10.0, 0.0),
+        ]
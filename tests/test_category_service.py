@@ -0,0 +1,59 @@
+"""
+Тесты для кэша поиска категорий в CategoryService
+"""
+
+import pytest
+
+from src.core.models.category import Category, CategoryType
+from src.data.database.initializer import DatabaseInitializer
+from src.services import CategoryService
+
+
+@pytest.fixture
+def initializer(tmp_path):
+    """Инициализатор временной базы с данными по умолчанию"""
+    initializer = DatabaseInitializer(str(tmp_path / 'finance.db'))
+    initializer.initialize_database()
+    yield initializer
+    initializer.db_manager.close()
+
+
+def search_names(service: CategoryService, search_term: str) -> list:
+    """Имена категорий, найденных по запросу"""
+    return [category.name for category in service.search_categories(search_term)]
+
+
+class TestCategorySearchCache:
+    """Тесты сброса кэша search_categories по версии данных базы"""
+    
+    def test_write_through_other_service_invalidates_cache(self, initializer):
+        """Тест сброса кэша после создания категории другим сервисом"""
+        service = initializer.category_service
+        assert search_names(service, 'Тест') == []
+        
+        CategoryService(initializer.db_manager).create_category(
+            Category(name='Тестовая', category_type=CategoryType.EXPENSE)
+        )
+        
+        assert search_names(service, 'Тест') == ['Тестовая']
+    
+    def test_reset_and_restore_invalidate_cache(self, initializer, tmp_path):
+        """Тест сброса кэша после сброса и восстановления базы"""
+        service = initializer.category_service
+        backup_path = str(tmp_path / 'backup.db')
+        assert initializer.backup_database(backup_path)
+        found = search_names(service, 'Прод')
+        assert found
+        
+        assert initializer.reset_database()
+        assert search_names(service, 'Прод') == []
+        
+        assert initializer.restore_database(backup_path)
+        assert search_names(service, 'Прод') == found
+    
+    def test_returned_list_does_not_change_cache(self, initializer):
+        """Тест независимости кэша от изменения возвращенного списка"""
+        service = initializer.category_service
+        service.search_categories('Прод').clear()
+        
+        assert search_names(service, 'Прод')
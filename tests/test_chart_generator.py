@@ -0,0 +1,66 @@
+"""
+Тесты для генератора графиков
+"""
+
+import matplotlib
+from datetime import datetime, date
+from decimal import Decimal
+
+from src.core.models.transaction import Transaction, TransactionType
+from src.analytics.chart_generator import ChartGenerator
+from src.analytics.process_pool import create_process_pool
+
+
+# Параметры matplotlib, которые задает стиль графиков
+STYLE_PARAMS = ('axes.facecolor', 'axes.prop_cycle', 'font.family')
+
+
+def get_style_params(generator: ChartGenerator) -> dict:
+    """Возвращает параметры стиля в процессе, где распакован генератор"""
+    return {name: matplotlib.rcParams[name] for name in STYLE_PARAMS}
+
+
+def make_transaction(amount: str, when: datetime,
+                     transaction_type: TransactionType = TransactionType.EXPENSE) -> Transaction:
+    """Создает транзакцию для графиков"""
+    return Transaction(amount=Decimal(amount), transaction_type=transaction_type, date=when)
+
+
+class TestChartGeneratorProcessPool:
+    """Тесты передачи генератора в рабочий процесс пула"""
+    
+    def test_worker_uses_chart_style(self, tmp_path):
+        """Тест стиля графиков в рабочем процессе"""
+        generator = ChartGenerator(str(tmp_path))
+        expected = get_style_params(generator)
+        
+        with create_process_pool(1) as pool:
+            worker_params = pool.submit(get_style_params, generator).result()
+        
+        assert worker_params == expected
+
+
+class TestChartGeneratorCaches:
+    """Тесты кэшей генератора по списку транзакций"""
+    
+    def test_frame_cache_sees_appended_transactions(self, tmp_path):
+        """Тест сброса кэша DataFrame после добавления транзакции в тот же список"""
+        generator = ChartGenerator(str(tmp_path))
+        transactions = [make_transaction('100.00', datetime(2024, 1, 10))]
+        
+        assert len(generator._get_transactions_frame(transactions)) == 1
+        assert generator._get_transactions_frame(transactions) is generator._get_transactions_frame(transactions)
+        
+        transactions.append(make_transaction('50.00', datetime(2024, 1, 11)))
+        assert len(generator._get_transactions_frame(transactions)) == 2
+    
+    def test_monthly_cache_sees_appended_transactions(self, tmp_path):
+        """Тест сброса кэша месячных сумм после добавления транзакции в тот же список"""
+        generator = ChartGenerator(str(tmp_path))
+        transactions = [make_transaction('100.00', datetime(2024, 1, 10))]
+        start_date, end_date = date(2024, 1, 1), date(2024, 2, 29)
+        
+        assert generator._get_monthly_totals(transactions, start_date, end_date)['expense'].tolist() == [100.0, 0.0]
+        
+        transactions.append(make_transaction('50.00', datetime(2024, 2, 11)))
+        assert generator._get_monthly_totals(transactions, start_date, end_date)['expense'].tolist() == [100.0, 50.0]
@@ -0,0 +1,100 @@
+"""
+Тесты для CLI
+"""
+
+import csv
+import io
+import pytest
+from datetime import datetime, date
+from decimal import Decimal
+from click.testing import CliRunner
+
+from src.cli import main as cli
+from src.cli.main import period_bounds
+from src.core.models.transaction import Transaction, TransactionType
+from src.data.database.initializer import DatabaseInitializer
+
+
+@pytest.fixture
+def services(monkeypatch, tmp_path):
+    """Сервисы CLI поверх временной базы с данными по умолчанию"""
+    db_initializer = DatabaseInitializer(str(tmp_path / 'finance.db'))
+    db_initializer.initialize_database()
+    services = cli._ServicesProxy(db_initializer)
+    monkeypatch.setattr(cli, '_services', services)
+    yield services
+    db_initializer.db_manager.close()
+
+
+class TestPeriodBounds:
+    """Тесты для period_bounds"""
+    
+    @pytest.mark.parametrize('period, year, month, expected', [
+        ('day', None, None, (date(2024, 2, 29), date(2024, 2, 29))),
+        ('week', None, None, (date(2024, 2, 26), date(2024, 3, 3))),
+        ('month', None, None, (date(2024, 2, 1), date(2024, 2, 29))),
+        ('month', 2023, 2, (date(2023, 2, 1), date(2023, 2, 28))),
+        ('month', 2023, None, (date(2024, 2, 1), date(2024, 2, 29))),
+        ('month', None, 12, (date(2024, 2, 1), date(2024, 2, 29))),
+        ('year', None, None, (date(2024, 1, 1), date(2024, 12, 31))),
+        ('year', 2022, 5, (date(2022, 1, 1), date(2022, 12, 31))),
+    ])
+    def test_period_bounds(self, period, year, month, expected):
+        """Тест границ периодов относительно 29 февраля 2024 года (четверг)"""
+        assert period_bounds(period, year, month, date(2024, 2, 29)) == expected
+    
+    def test_week_starts_on_monday(self):
+        """Тест недели, опорная дата которой - понедельник или воскресенье"""
+        assert period_bounds('week', None, None, date(2024, 1, 1)) == (date(2024, 1, 1), date(2024, 1, 7))
+        assert period_bounds('week', None, None, date(2024, 1, 7)) == (date(2024, 1, 1), date(2024, 1, 7))
+    
+    def test_unknown_period(self):
+        """Тест неизвестного периода"""
+        with pytest.raises(ValueError):
+            period_bounds('quarter', None, None, date(2024, 2, 29))
+
+
+class TestTransactionsCommand:
+    """Тесты команды transactions вне терминала"""
+    
+    def test_writes_csv_when_not_a_terminal(self, services):
+        """Тест вывода CSV вместо таблицы Rich при перенаправлении вывода"""
+        category = services.category_service.get_categories()[0]
+        services.transaction_service.create_transaction(Transaction(
+            amount=Decimal('1234.50'), transaction_type=TransactionType.EXPENSE,
+            category_id=category.id, description='Очень длинное описание покупки, которое не обрезается',
+            date=datetime(2024, 2, 1, 10, 0)
+        ))
+        services.transaction_service.create_transaction(Transaction(
+            amount=Decimal('5000.00'), transaction_type=TransactionType.INCOME,
+            description='Зарплата', date=datetime(2024, 2, 5, 9, 0)
+        ))
+        
+        result = CliRunner().invoke(cli.main, ['transactions', '--limit', '10'])
+        
+        assert result.exit_code == 0
+        rows = list(csv.reader(io.StringIO(result.output)))
+        assert rows[0] == cli.TRANSACTIONS_CSV_HEADERS
+        assert sorted(rows[1:]) == sorted([
+            ['2', '05.02.2024', 'income', '5000.00', 'Без категории', 'Зарплата'],
+            ['1', '01.02.2024', 'expense', '-1234.50', category.name,
+             'Очень длинное описание покупки, которое не обрезается'],
+        ])
+    
+    def test_limit(self, services):
+        """Тест ограничения количества строк CSV"""
+        for day in range(1, 6):
+            services.transaction_service.create_transaction(Transaction(
+                amount=Decimal('10.00'), transaction_type=TransactionType.INCOME,
+                description=f'Доход {day}', date=datetime(2024, 2, day)
+            ))
+        
+        result = CliRunner().invoke(cli.main, ['transactions', '-l', '3'])
+        
+        assert len(list(csv.reader(io.StringIO(result.output)))) == 4
+    
+    def test_no_transactions(self, services):
+        """Тест сообщения об отсутствии транзакций"""
+        result = CliRunner().invoke(cli.main, ['transactions'])
+        
+        assert 'Нет транзакций' in result.output
@@ -0,0 +1,102 @@
+"""
+Тесты для маркера схемы и быстрой инициализации базы данных
+"""
+
+import pytest
+
+from src.data.database.database_manager import DatabaseManager
+from src.data.database.initializer import DatabaseInitializer
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Путь к временной базе, уже инициализированной с данными по умолчанию"""
+    path = str(tmp_path / 'finance.db')
+    initializer = DatabaseInitializer(path)
+    assert initializer.initialize_database()
+    initializer.db_manager.close()
+    return path
+
+
+def count_calls(monkeypatch, cls, name: str) -> list:
+    """Подменяет метод класса оберткой, записывающей вызовы"""
+    calls = []
+    original = getattr(cls, name)
+    
+    def wrapper(self, *args, **kwargs):
+        calls.append(name)
+        return original(self, *args, **kwargs)
+    
+    monkeypatch.setattr(cls, name, wrapper)
+    return calls
+
+
+class TestSchemaMarker:
+    """Тесты маркера схемы"""
+    
+    def test_marker_written_after_default_data(self, db_path):
+        """Тест записи маркера после создания данных по умолчанию"""
+        db_manager = DatabaseManager(db_path)
+        
+        assert db_manager.is_schema_current()
+        assert db_manager.get_table_count('categories') > 0
+    
+    def test_current_marker_skips_initialization(self, monkeypatch, db_path):
+        """Тест пропуска создания таблиц и данных при актуальном маркере"""
+        table_calls = count_calls(monkeypatch, DatabaseManager, '_initialize_database')
+        data_calls = count_calls(monkeypatch, DatabaseInitializer, '_create_default_data')
+        
+        assert DatabaseInitializer(db_path).initialize_database()
+        
+        assert table_calls == []
+        assert data_calls == []
+    
+    def test_stale_marker_reinitializes(self, monkeypatch, db_path):
+        """Тест повторной инициализации при маркере другой версии"""
+        with open(f"{db_path}.schema", 'w', encoding='utf-8') as f:
+            f.write('0:0.0.0')
+        table_calls = count_calls(monkeypatch, DatabaseManager, '_initialize_database')
+        
+        initializer = DatabaseInitializer(db_path)
+        
+        assert table_calls == ['_initialize_database']
+        assert not initializer.db_manager.is_schema_current()
+        assert initializer.initialize_database()
+        assert initializer.db_manager.is_schema_current()
+    
+    def test_marker_without_database_file(self, monkeypatch, tmp_path):
+        """Тест инициализации, когда маркер есть, а файла базы нет"""
+        path = str(tmp_path / 'new.db')
+        with open(f"{path}.schema", 'w', encoding='utf-8') as f:
+            f.write(DatabaseManager.get_schema_marker())
+        table_calls = count_calls(monkeypatch, DatabaseManager, '_initialize_database')
+        
+        db_manager = DatabaseManager(path)
+        
+        assert table_calls == ['_initialize_database']
+        assert not db_manager.is_schema_current()
+        db_manager.close()
+    
+    def test_restore_invalidates_marker(self, db_path, tmp_path):
+        """Тест сброса маркера при восстановлении из резервной копии"""
+        initializer = DatabaseInitializer(db_path)
+        backup_path = str(tmp_path / 'backup.db')
+        assert initializer.backup_database(backup_path)
+        
+        assert initializer.restore_database(backup_path)
+        
+        assert not initializer.db_manager.is_schema_current()
+        assert initializer.initialize_database()
+        assert initializer.db_manager.is_schema_current()
+    
+    def test_reset_invalidates_marker(self, db_path):
+        """Тест повторного создания данных по умолчанию после сброса"""
+        initializer = DatabaseInitializer(db_path)
+        
+        assert initializer.reset_database()
+        
+        assert not initializer.db_manager.is_schema_current()
+        assert initializer.db_manager.get_table_count('categories') == 0
+        assert initializer.initialize_database()
+        assert initializer.db_manager.get_table_count('categories') > 0
+        assert initializer.db_manager.is_schema_current()
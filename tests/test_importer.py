@@ -0,0 +1,76 @@
+"""
+Тесты для импорта транзакций
+"""
+
+import sqlite3
+import pytest
+
+from src.data.database.database_manager import DatabaseManager
+from src.data.import_export import importer
+from src.data.import_export.importer import DataImporter
+from src.services import TransactionService, CategoryService
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Менеджер пустой временной базы"""
+    db_manager = DatabaseManager(str(tmp_path / 'finance.db'))
+    yield db_manager
+    db_manager.close()
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """CSV файл с пятью корректными строками и одной ошибочной"""
+    lines = ['Дата,Тип,Сумма,Категория,Описание']
+    for day in range(1, 6):
+        lines.append(f'{day:02d}.01.2024,Доход,{day}00.50,Зарплата,Поступление {day}')
+    lines.insert(3, '03.01.2024,Неизвестно,10,,Ошибка')
+    path = tmp_path / 'transactions.csv'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+class TestImportFromCsv:
+    """Тесты пакетного сохранения при импорте из CSV"""
+    
+    def test_imports_in_batches(self, monkeypatch, db_manager, csv_file):
+        """Тест сохранения всех корректных строк несколькими пакетами"""
+        monkeypatch.setattr(importer, 'IMPORT_BATCH_SIZE', 2)
+        transaction_service = TransactionService(db_manager)
+        
+        results = DataImporter().import_from_csv(str(csv_file), transaction_service,
+                                                 CategoryService(db_manager))
+        
+        assert results['imported'] == 5
+        assert results['errors'] == 1
+        assert results['error_details'][0].startswith('Строка 4:')
+        assert sorted(t.description for t in transaction_service.get_transactions()) == \
+            [f'Поступление {day}' for day in range(1, 6)]
+    
+    def test_failed_batch_keeps_committed_count(self, monkeypatch, db_manager, csv_file):
+        """Тест частичного импорта: ошибка пакета не теряет уже сохраненные пакеты"""
+        monkeypatch.setattr(importer, 'IMPORT_BATCH_SIZE', 2)
+        transaction_service = TransactionService(db_manager)
+        execute_many = db_manager.execute_many
+        calls = []
+        
+        def failing_execute_many(query, params_list):
+            calls.append(len(params_list))
+            if len(calls) == 2:
+                raise sqlite3.OperationalError('database is locked')
+            return execute_many(query, params_list)
+        
+        monkeypatch.setattr(db_manager, 'execute_many', failing_execute_many)
+        
+        results = DataImporter().import_from_csv(str(csv_file), transaction_service,
+                                                 CategoryService(db_manager))
+        
+        # Пакеты: строки 2-3, 5-6 (ошибка), 7
+        assert calls == [2, 2, 1]
+        assert results['imported'] == 3
+        assert results['errors'] == 3
+        assert results['error_details'][1] == \
+            'Строки 5-6: транзакции не сохранены: database is locked'
+        assert sorted(t.description for t in transaction_service.get_transactions()) == \
+            ['Поступление 1', 'Поступление 2', 'Поступление 5']
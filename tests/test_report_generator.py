@@ -0,0 +1,89 @@
+"""
+Тесты для генератора отчетов
+"""
+
+import csv
+import pytest
+from datetime import datetime, date
+from decimal import Decimal
+
+from src.core.models.transaction import Transaction, TransactionType
+from src.analytics.report_generator import ReportGenerator, CSV_REPORT_HEADERS
+
+
+@pytest.fixture
+def transactions():
+    """Транзакции января 2024 года"""
+    return [
+        Transaction(id=1, amount=Decimal('100.00'), transaction_type=TransactionType.INCOME,
+                    description='Доход', date=datetime(2024, 1, 10, 9, 0),
+                    created_at=datetime(2024, 1, 10, 9, 0), updated_at=datetime(2024, 1, 10, 9, 0)),
+        Transaction(id=2, amount=Decimal('30.25'), transaction_type=TransactionType.EXPENSE,
+                    description='Расход', date=datetime(2024, 1, 20, 18, 30),
+                    created_at=datetime(2024, 1, 20, 18, 30), updated_at=datetime(2024, 1, 20, 18, 30)),
+    ]
+
+
+class TestReportGeneratorCaches:
+    """Тесты кэшей генератора отчетов"""
+    
+    def test_frame_cache_sees_appended_transactions(self, tmp_path):
+        """Тест сброса кэша DataFrame после добавления транзакции в тот же список"""
+        generator = ReportGenerator(str(tmp_path))
+        transactions = [Transaction(amount=Decimal('100.00'), transaction_type=TransactionType.INCOME,
+                                    date=datetime(2024, 1, 10))]
+        
+        assert len(generator._get_transactions_frame(transactions)) == 1
+        
+        transactions.append(Transaction(amount=Decimal('50.00'), transaction_type=TransactionType.EXPENSE,
+                                        date=datetime(2024, 1, 11)))
+        assert len(generator._get_transactions_frame(transactions)) == 2
+
+
+class TestEmptyPeriodReports:
+    """Тесты отчетов за период без транзакций"""
+    
+    @pytest.mark.parametrize('sorted_by_date', [False, True])
+    def test_csv_report_for_empty_period_is_empty_file(self, tmp_path, transactions, sorted_by_date):
+        """Тест пустого CSV файла для периода без транзакций"""
+        generator = ReportGenerator(str(tmp_path), sorted_by_date=sorted_by_date)
+        
+        path = generator.generate_csv_report(transactions, date(2024, 2, 1), date(2024, 2, 29))
+        
+        assert open(path, encoding='utf-8').read() == ''
+    
+    def test_csv_report_for_empty_list_is_empty_file(self, tmp_path):
+        """Тест пустого CSV файла без транзакций вообще"""
+        path = ReportGenerator(str(tmp_path)).generate_csv_report([], date(2024, 1, 1), date(2024, 1, 31))
+        
+        assert open(path, encoding='utf-8').read() == ''
+    
+    def test_csv_report_for_period_with_transactions(self, tmp_path, transactions):
+        """Тест CSV отчета за период с транзакциями: от новых к старым"""
+        path = ReportGenerator(str(tmp_path)).generate_csv_report(
+            transactions, date(2024, 1, 1), date(2024, 1, 31)
+        )
+        
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == list(CSV_REPORT_HEADERS)
+        assert [(row[0], row[4]) for row in rows[1:]] == [('2', '30.25'), ('1', '100.0')]
+    
+    def test_text_reports_for_empty_period(self, monkeypatch, tmp_path, transactions):
+        """Тест однострочных текстовых отчетов без расчета остальной статистики"""
+        generator = ReportGenerator(str(tmp_path))
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("статистика не должна считаться для пустого периода")
+        
+        calculator = generator._get_statistics_calculator(transactions)
+        monkeypatch.setattr(calculator, 'get_category_analysis', fail)
+        monkeypatch.setattr(calculator, 'get_trend_analysis', fail)
+        monkeypatch.setattr(calculator, 'get_spending_patterns', fail)
+        
+        summary_path = generator.generate_summary_report(transactions, date(2024, 2, 1), date(2024, 2, 29))
+        detailed_path = generator.generate_detailed_report(transactions, [], date(2024, 2, 1), date(2024, 2, 29))
+        
+        expected = "Нет транзакций за период 01.02.2024 - 29.02.2024\n"
+        assert open(summary_path, encoding='utf-8').read() == expected
+        assert open(detailed_path, encoding='utf-8').read() == expected
@@ -0,0 +1,83 @@
+"""
+Тесты для агрегирующих запросов TransactionService
+"""
+
+import pytest
+from datetime import datetime, date
+from decimal import Decimal
+
+from src.core.models.transaction import Transaction, TransactionType
+from src.core.calculators.balance_calculator import BalanceCalculator
+from src.core.calculators.statistics_calculator import StatisticsCalculator
+from src.data.database.database_manager import DatabaseManager
+from src.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Сервис транзакций над пустой временной базой"""
+    db_manager = DatabaseManager(str(tmp_path / 'finance.db'))
+    yield TransactionService(db_manager)
+    db_manager.close()
+
+
+@pytest.fixture
+def transactions(service):
+    """Транзакции января и начала февраля 2024 года, сохраненные в базе"""
+    transactions = [
+        Transaction(amount=Decimal('1000.10'), transaction_type=TransactionType.INCOME,
+                    date=datetime(2024, 1, 5, 10, 0)),
+        Transaction(amount=Decimal('0.30'), transaction_type=TransactionType.EXPENSE,
+                    date=datetime(2024, 1, 31, 23, 59)),
+        Transaction(amount=Decimal('250.00'), transaction_type=TransactionType.TRANSFER,
+                    date=datetime(2024, 1, 20, 12, 0)),
+        Transaction(amount=Decimal('99.99'), transaction_type=TransactionType.EXPENSE,
+                    date=datetime(2024, 2, 1, 0, 0)),
+    ]
+    for transaction in transactions:
+        service.create_transaction(transaction)
+    return transactions
+
+
+class TestSumSigned:
+    """Тесты для sum_signed"""
+    
+    def test_empty_database(self, service):
+        """Тест баланса пустой базы"""
+        balance = service.sum_signed(date(2024, 1, 31))
+        
+        assert balance == Decimal('0.00')
+        assert str(balance) == '0.00'
+    
+    def test_matches_balance_calculator(self, service, transactions):
+        """Тест совпадения с BalanceCalculator на разные даты"""
+        calculator = BalanceCalculator()
+        calculator.add_transactions(transactions)
+        
+        for end_date in (date(2024, 1, 4), date(2024, 1, 31), date(2024, 2, 1)):
+            assert service.sum_signed(end_date) == calculator.calculate_balance(end_date=end_date)
+
+
+class TestGetPeriodSummary:
+    """Тесты для get_period_summary"""
+    
+    def test_empty_database(self, service):
+        """Тест сводки за период в пустой базе"""
+        summary = service.get_period_summary(date(2024, 1, 1), date(2024, 1, 31))
+        
+        assert summary == {
+            'period': {'start_date': '2024-01-01', 'end_date': '2024-01-31'},
+            'total_income': 0.0,
+            'total_expenses': 0.0,
+            'net_income': 0.0,
+            'transaction_count': 0,
+            'average_transaction': 0
+        }
+    
+    def test_matches_statistics_calculator(self, service, transactions):
+        """Тест совпадения со StatisticsCalculator"""
+        calculator = StatisticsCalculator()
+        calculator.add_transactions(transactions)
+        
+        assert service.get_period_summary(date(2024, 1, 1), date(2024, 1, 31)) == \
+            calculator.get_monthly_summary(2024, 1)